@@ -0,0 +1,78 @@
+"""Fixtures that generate synthetic config trees for the benchmarks."""
+import json
+import os
+import tracemalloc
+from collections import namedtuple
+
+import pytest
+
+from hjsonconfig import cache
+
+# A shape of synthetic config tree:
+#   depth: number of levels of includes below the root
+#   fanout: number of files in each config-file list
+#   shared: if True, every leaf file includes the same base file (diamonds)
+#   keys: number of top-level keys in each file
+#   nesting: depth of nested dicts under each key
+#   value_size: length of each string value, which sets the file size
+Shape = namedtuple("Shape", "depth fanout shared keys nesting value_size")
+
+SHAPES = {
+    "single": Shape(depth=0, fanout=1, shared=False, keys=50, nesting=2, value_size=16),
+    "chain": Shape(depth=8, fanout=1, shared=False, keys=20, nesting=2, value_size=16),
+    "wide": Shape(depth=1, fanout=16, shared=False, keys=20, nesting=2, value_size=16),
+    "diamond": Shape(depth=3, fanout=3, shared=True, keys=20, nesting=2, value_size=16),
+    "deep-keys": Shape(depth=2, fanout=2, shared=False, keys=10, nesting=5, value_size=16),
+    "big-file": Shape(depth=0, fanout=1, shared=False, keys=2000, nesting=2, value_size=256),
+}
+
+
+def make_value(shape, level, seed):
+    if level >= shape.nesting:
+        return "v{:d}-".format(seed) + "x" * shape.value_size
+    return dict(("k{:d}".format(i), make_value(shape, level + 1, seed + i)) for i in range(3))
+
+
+def make_tree(directory, shape):
+    """Writes a tree of config files with the given shape to directory and
+    returns the path of the root file"""
+    counter = [0]
+
+    def write(level):
+        name = "f{:d}.hjson".format(counter[0])
+        counter[0] += 1
+        data = dict(("key{:d}".format(i), make_value(shape, 0, counter[0] + i)) for i in range(shape.keys))
+        if level < shape.depth:
+            children = [write(level + 1) for _ in range(shape.fanout)]
+            data["config-file"] = children if shape.fanout > 1 else children[0]
+        elif shape.shared and shape.depth > 0:
+            data["config-file"] = "base.hjson"
+        with open(os.path.join(directory, name), "w") as f:
+            json.dump(data, f, indent=2)
+        return name
+
+    if shape.shared:
+        with open(os.path.join(directory, "base.hjson"), "w") as f:
+            json.dump({"base": make_value(shape, 0, 0)}, f, indent=2)
+    return write(0)
+
+
+@pytest.fixture(params=sorted(SHAPES))
+def tree(request, tmp_path, monkeypatch):
+    """Changes to a directory holding a synthetic config tree, and returns
+    the name of its root file"""
+    root = make_tree(str(tmp_path), SHAPES[request.param])
+    monkeypatch.chdir(str(tmp_path))
+    cache.default_cache.clear()
+    return root
+
+
+def record_peak_memory(benchmark, function, *args, **kwds):
+    """Runs function once under tracemalloc and records its peak memory use
+    in the benchmark's extra_info"""
+    tracemalloc.start()
+    try:
+        function(*args, **kwds)
+        benchmark.extra_info["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,35 @@
+"""Benchmarks of the import time of the package, with jsonmerge, its
+heaviest dependency, for comparison.
+
+Each round imports the module in a fresh interpreter, so the times include
+starting the interpreter.  The cumulative import time of the module, as
+reported by ``-X importtime``, is kept in the benchmark's extra_info.
+"""
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 7), reason="needs -X importtime")
+
+
+def import_time(module):
+    """Imports module in a fresh interpreter, returning its cumulative import
+    time in microseconds as reported by -X importtime"""
+    proc = subprocess.Popen([sys.executable, "-X", "importtime", "-c", "import " + module],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    _, err = proc.communicate()
+    assert proc.returncode == 0, err
+    times = {}
+    for line in err.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return sum(times[name] for name in times if name == module or module.startswith(name + "."))
+
+
+@pytest.mark.parametrize("module", ["hjsonconfig", "hjsonconfig.hjsonconfig", "jsonmerge"])
+def test_import(benchmark, module):
+    """import of module in a fresh interpreter"""
+    benchmark.extra_info["import_us"] = benchmark.pedantic(import_time, args=(module,), rounds=10)
@@ -0,0 +1,105 @@
+"""Benchmarks of loading, include resolution and merging.
+
+Run with::
+
+    tox -e bench
+
+or ``pytest benchmarks`` with pytest-benchmark installed.
+"""
+import copy
+
+from conftest import record_peak_memory
+
+from hjsonconfig import cache
+from hjsonconfig import hjsonconfig
+
+
+def test_load(benchmark, tree):
+    """HjsonConfig(filename=...) with every file parsed"""
+    record_peak_memory(benchmark, hjsonconfig.HjsonConfig, filename=tree, cache=False)
+    benchmark(hjsonconfig.HjsonConfig, filename=tree, cache=False)
+
+
+def test_load_parse_cached(benchmark, tree):
+    """HjsonConfig(filename=...) with every file in the parse cache"""
+    hjsonconfig.HjsonConfig(filename=tree)
+    benchmark(hjsonconfig.HjsonConfig, filename=tree)
+
+
+def test_load_disk_cached(benchmark, tree, tmp_path):
+    """HjsonConfig(filename=...) from a valid disk cache file"""
+    hjsonconfig.HjsonConfig(filename=tree, cache=False, disk_cache=str(tmp_path / "cache"))
+    benchmark(hjsonconfig.HjsonConfig, filename=tree, cache=False, disk_cache=str(tmp_path / "cache"))
+
+
+def test_load_concurrent(benchmark, tree):
+    """HjsonConfig(filename=...) reading files in a pool of 4 threads"""
+    benchmark(hjsonconfig.HjsonConfig, filename=tree, cache=False, workers=4)
+
+
+def test_read_file(benchmark, tree):
+    """read_file only parsing the root file, with its includes cached"""
+    config = hjsonconfig.HjsonConfig(filename=tree)
+
+    def discard_root():
+        cache.default_cache.discard(tree)
+
+    benchmark.pedantic(config.read_file, args=(tree,), setup=discard_root, rounds=20)
+
+
+def test_parse_file(benchmark, tree):
+    """Parsing of the root file alone, which is strict JSON"""
+    record_peak_memory(benchmark, cache.parse_file, tree)
+    benchmark(cache.parse_file, tree)
+
+
+def test_parse_file_hjson(benchmark, tree):
+    """The hjson parser alone on the root file, without the JSON fast path"""
+    import hjson
+
+    with open(tree) as f:
+        text = f.read()
+    benchmark(hjson.loads, text)
+
+
+def test_import_config_files(benchmark, tree):
+    """import_config_files on an in-memory config including the root file"""
+    def setup():
+        config = hjsonconfig.HjsonConfig(cache=False)
+        config["config-file"] = tree
+        return (config,), {}
+
+    benchmark.pedantic(lambda config: config.import_config_files(), setup=setup, rounds=20)
+
+
+def merge_inputs(tree):
+    head = hjsonconfig.HjsonConfig(filename=tree)
+    base = copy.deepcopy(head)
+    base["extra"] = {"a": 1}
+    return base, head
+
+
+def test_merge_native(benchmark, tree):
+    """merge() of two resolved configs with the built-in merge"""
+    base, head = merge_inputs(tree)
+    record_peak_memory(benchmark, hjsonconfig.merge, base, head)
+    benchmark(hjsonconfig.merge, base, head)
+
+
+def test_merge_jsonmerge(benchmark, tree):
+    """merge() of two resolved configs with jsonmerge, for comparison"""
+    base, head = merge_inputs(tree)
+    record_peak_memory(benchmark, hjsonconfig.merge, base, head, schema={})
+    benchmark(hjsonconfig.merge, base, head, schema={})
+
+
+def test_dump_compact(benchmark, tree, tmp_path):
+    """dump() of a resolved config as compact JSON"""
+    config = hjsonconfig.HjsonConfig(filename=tree)
+    benchmark(config.dump, str(tmp_path / "out.json"), format="compact")
+
+
+def test_dump_hjson(benchmark, tree, tmp_path):
+    """dump() of a resolved config as hjson, for comparison"""
+    config = hjsonconfig.HjsonConfig(filename=tree)
+    benchmark(config.dump, str(tmp_path / "out.hjson"), format="hjson")
@@ -0,0 +1,72 @@
+"""Benchmarks of looking up values by key path, comparing the memoized
+accessors with the chained lookups they replace.
+
+Each benchmark does 1000 lookups of a path three dicts deep.  A chain of
+plain subscripts, with no default, is included as the baseline.
+"""
+import pytest
+
+from hjsonconfig import hjsonconfig
+
+LOOKUPS = range(1000)
+
+
+@pytest.fixture
+def config(tmp_path):
+    """A config with "server.pool.size" in plain dicts and
+    "database.pool.size" in a nested include"""
+    (tmp_path / "db.hjson").write_text('{"host": "db", "pool": {"size": 4}}')
+    (tmp_path / "root.hjson").write_text('{"server": {"pool": {"size": 8}}, "database": {"config-file": "db.hjson"}}')
+    return hjsonconfig.HjsonConfig(filename=str(tmp_path / "root.hjson"))
+
+
+def test_chained_subscripts(benchmark, config):
+    """config["server"]["pool"]["size"], which raises KeyError if missing"""
+    def run():
+        for _ in LOOKUPS:
+            config["server"]["pool"]["size"]
+    benchmark(run)
+
+
+def test_chained_get(benchmark, config):
+    """config.get("server", {}).get("pool", {}).get("size", 1)"""
+    def run():
+        for _ in LOOKUPS:
+            config.get("server", {}).get("pool", {}).get("size", 1)
+    benchmark(run)
+
+
+def test_compiled_path(benchmark, config):
+    """A compiled accessor with a default, replacing the chained get"""
+    size = config.compile_path("server.pool.size")
+
+    def run():
+        for _ in LOOKUPS:
+            size(config, 1)
+    benchmark(run)
+
+
+def test_get_path(benchmark, config):
+    """config.get_path("server.pool.size", 1)"""
+    def run():
+        for _ in LOOKUPS:
+            config.get_path("server.pool.size", 1)
+    benchmark(run)
+
+
+def test_chained_subscripts_include(benchmark, config):
+    """config["database"]["pool"]["size"] through a loaded nested include"""
+    def run():
+        for _ in LOOKUPS:
+            config["database"]["pool"]["size"]
+    benchmark(run)
+
+
+def test_compiled_path_include(benchmark, config):
+    """A compiled accessor for the same path through the nested include"""
+    size = config.compile_path("database.pool.size")
+
+    def run():
+        for _ in LOOKUPS:
+            size(config)
+    benchmark(run)
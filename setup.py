@@ -77,8 +77,7 @@ setup(
         # eg: 'aspectlib==1.1.1', 'six>=1.7',
     ],
     extras_require={
-        # eg:
-        #   'rst': ['docutils>=0.11'],
-        #   ':python_version=="2.6"': ['argparse'],
+        'toml': ['tomli; python_version<"3.11"'],
+        'yaml': ['PyYAML'],
     },
 )
@@ -1,2 +1,28 @@
+import sys
+
 __version__ = '0.0.3'
-__all__ = ["hjsonconfig"]
+__all__ = ["hjsonconfig", "HjsonConfig", "merge", "diff", "apply_patch"]
+
+# The main classes and functions are imported from their submodules when they
+# are first used, so that "import hjsonconfig" stays cheap.
+_LAZY_ATTRIBUTES = {
+    "HjsonConfig": "hjsonconfig.hjsonconfig",
+    "merge": "hjsonconfig.hjsonconfig",
+    "diff": "hjsonconfig.patch",
+    "apply_patch": "hjsonconfig.patch",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        from importlib import import_module
+
+        return getattr(import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+if sys.version_info < (3, 7):  # No module __getattr__, so import eagerly
+    from hjsonconfig.hjsonconfig import HjsonConfig  # noqa: F401
+    from hjsonconfig.hjsonconfig import merge  # noqa: F401
+    from hjsonconfig.patch import apply_patch  # noqa: F401
+    from hjsonconfig.patch import diff  # noqa: F401
@@ -0,0 +1,94 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import asyncio
+
+from hjsonconfig.graph import IncludeGraph
+from hjsonconfig.graph import config_files
+from hjsonconfig.includes import mount_includes
+from hjsonconfig.instrument import LoadReport
+from hjsonconfig.instrument import clock
+from hjsonconfig.provenance import Origins
+from hjsonconfig.provenance import origin_tree
+
+
+async def add_files(graph, filenames, executor=None, parent=None):
+    """Reads filenames and all the files they include in to graph, like
+    IncludeGraph.add, reading each file in executor.  The includes of each
+    file are submitted as soon as it has been parsed, so siblings are read
+    concurrently.
+
+    If the coroutine is cancelled, files that are already being read are left
+    to finish in the executor, but are not added to the graph.
+    """
+    loop = asyncio.get_event_loop()
+    if parent is not None:
+        parent = graph.key(parent)
+    pending = []
+    for filename in filenames:
+        key = graph.key(filename, parent)
+        if key not in graph.names and key not in pending:
+            graph.names[key] = filename
+            pending.append(key)
+
+    futures = dict((loop.run_in_executor(executor, graph._parse, key), key) for key in pending)
+    try:
+        while futures:
+            done, _ = await asyncio.wait(futures, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                key = futures.pop(future)
+                for child in graph._add_node(key, future.result()):
+                    futures[loop.run_in_executor(executor, graph._parse, child)] = child
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        # Forget files that could not be read, so that they are retried
+        for key in [k for k in graph.names if k not in graph.nodes]:
+            del graph.names[key]
+        raise
+
+
+async def _load(cls, filename, executor, kwds):
+    config = cls(**kwds)
+    config.filename = filename
+    if config.stream or config.disk_cache is not None:
+        # These read the root file their own way, so are run in the executor
+        await asyncio.get_event_loop().run_in_executor(executor, config.read_file, filename)
+        return config
+
+    start = None if config.instrument is None else clock()
+    graph = IncludeGraph(config)
+    await add_files(graph, [filename], executor)
+    config._copy_in(graph.resolve([filename])[0])
+    if config.provenance:
+        config._origins = graph.origins(filename)
+    config._finish_load()
+    if config.instrument is not None:
+        config.instrument(LoadReport(filename, graph.events, clock() - start))
+    return config
+
+
+async def aload(cls, filename, timeout=None, executor=None, kwds=None):
+    """The coroutine returned by HjsonConfig.aload"""
+    return await asyncio.wait_for(_load(cls, filename, executor, kwds or {}), timeout)
+
+
+async def _import(config, executor):
+    # The same stages as HjsonConfig.import_config_files, reading the files
+    # in executor
+    mount_includes(config, None if config.filename is None else config.resolver.resolve(config.filename), config)
+    if config.get("config-file") is not None:
+        start = None if config.instrument is None else clock()
+        graph = IncludeGraph(config)
+        await add_files(graph, config_files(config), executor, config.filename)
+        config._import_graph(graph, start)
+    elif config.provenance:
+        config._origins = Origins([config.filename], origin_tree(config, 0))
+    config._finish_load()
+
+
+async def aimport_config_files(config, timeout=None, executor=None):
+    """The coroutine returned by HjsonConfig.aimport_config_files"""
+    await asyncio.wait_for(_import(config, executor), timeout)
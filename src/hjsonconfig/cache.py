@@ -0,0 +1,174 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import threading
+from collections import OrderedDict
+
+
+def copy_tree(value):
+    """Returns a copy of a parsed config value, copying every dict and list
+    so that the copy shares no mutable containers with value.
+
+    Args:
+        value: a parsed hjson value
+
+    Returns:
+        A copy of value, with dicts converted to hjson.OrderedDict objects.
+    """
+    if isinstance(value, dict):
+        return OrderedDict((k, copy_tree(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return [copy_tree(v) for v in value]
+    return value
+
+
+def file_stamp(path):
+    """Returns the (mtime, size) of path, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return getattr(st, "st_mtime_ns", st.st_mtime), st.st_size
+
+
+def parse_file(filename):
+    """Reads and parses a config file, with the parser for its extension
+
+    Args:
+        filename: path to file to be read
+
+    Returns:
+        The hjson.OrderedDict object parsed from filename.
+    """
+    from hjsonconfig.parsers import loads
+
+    with open(filename, 'r') as f:
+        return loads(f.read(), filename)
+
+
+class ParseCache(object):
+    """A process-wide LRU cache of parsed config files.
+
+    Entries are keyed on the resolved path of each file, and are only used
+    while the modification time and size of the file match those seen when it
+    was parsed.  Every lookup returns a private copy of the cached data, so
+    that the caller is free to modify it.
+
+    Attributes:
+        enabled: A boolean indicating if the cache should be used at all.
+        max_bytes: The maximum total size of the cached files, in bytes.
+        max_entries: The maximum number of files to hold in the cache.
+        hits: The number of lookups served from the cache.
+        misses: The number of lookups that had to parse the file.
+        evictions: The number of entries dropped to stay within the limits.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_entries=1024, enabled=True):
+        """Inits ParseCache with the given limits"""
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def stamp(filename):
+        """Returns the resolved path and the (mtime, size) stamp of filename"""
+        path = os.path.realpath(filename)
+        st = os.stat(path)
+        return path, (getattr(st, "st_mtime_ns", st.st_mtime), st.st_size)
+
+    def load(self, filename, parse=parse_file):
+        """Returns a copy of the parsed contents of filename, parsing the file
+        only if it is not already cached or has changed since it was cached.
+
+        Args:
+            filename: path to file to be read
+            parse: a function taking a path and returning the parsed data
+
+        Returns:
+            The parsed data, which the caller owns.
+        """
+        if not self.enabled:
+            return parse(filename)
+
+        path, stamp = self.stamp(filename)
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None and entry[0] == stamp:
+                self._entries[path] = entry
+                self.hits += 1
+                data = entry[1]
+            else:
+                if entry is not None:
+                    self._bytes -= entry[0][1]
+                self.misses += 1
+                data = None
+
+        if data is not None:
+            return copy_tree(data)
+
+        data = parse(filename)
+        self._store(path, stamp, data)
+        return copy_tree(data)
+
+    def _store(self, path, stamp, data):
+        """Adds a parsed file to the cache, evicting the least recently used
+        entries until the cache is within its limits."""
+        size = stamp[1]
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old[0][1]
+            self._entries[path] = (stamp, data)
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                _, (old_stamp, _) = self._entries.popitem(last=False)
+                self._bytes -= old_stamp[1]
+                self.evictions += 1
+
+    def discard(self, filename):
+        """Removes the entry of filename from the cache, if it has one, so that
+        it is parsed again the next time it is loaded"""
+        path = os.path.realpath(filename)
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old[0][1]
+
+    def clear(self):
+        """Removes all entries from the cache"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def reset_stats(self):
+        """Sets the hit, miss and eviction counters back to zero"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """Returns the cache counters as a dict, suitable for exporting as metrics"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+
+# The cache shared by all HjsonConfig objects unless they are given another one.
+default_cache = ParseCache()
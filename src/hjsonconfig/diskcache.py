@@ -0,0 +1,163 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+
+from hjsonconfig.graph import IncludeGraph
+
+# Increment when the layout of cache files changes
+FORMAT_VERSION = 4
+
+
+def default_directory():
+    """Returns the per-user directory used for cache files by default"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "hjsonconfig")
+
+
+def file_hash(path):
+    """Returns the sha1 hex digest of the contents of path"""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_record(path):
+    """Returns the (path, mtime, size, hash) record of path stored in cache files"""
+    st = os.stat(path)
+    return path, getattr(st, "st_mtime_ns", st.st_mtime), st.st_size, file_hash(path)
+
+
+class DiskCache(object):
+    """An on-disk cache of fully resolved configs, so that programs that read
+    the same config every time they start can skip parsing it.
+
+    Each cache file holds a header listing the path, modification time, size
+    and sha1 hash of every file in the include set, followed by the merged
+    config, both pickled.  A cache file is used if the stat of every file
+    still matches; if only the modification time of a file has changed, its
+    hash is checked instead.  Key order and OrderedDict types are preserved.
+
+    Cache files are unpickled, so the cache directory must only be writable
+    by trusted users.
+
+    Attributes:
+        directory: The directory to store cache files in, or None to store
+            each one next to its root config file.
+        hits: The number of configs loaded from cache files.
+        misses: The number of configs that had to be read from the config files.
+    """
+    def __init__(self, directory=None):
+        """Inits DiskCache with the directory to store cache files in"""
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, filename, config):
+        """Returns the path of the cache file for filename, read with the
+        options of config.  The key covers everything that decides which
+        files the includes resolve to: the current directory and the search
+        path, as well as the root file, which the including directories
+        follow from."""
+        root = config.resolver.resolve(filename)
+        key = hashlib.sha1(root.encode("utf-8"))
+        key.update(json.dumps([os.getcwd(), list(config.resolver.directories())]).encode("utf-8"))
+        if config.merge_schema is not None:
+            key.update(json.dumps(config.merge_schema, sort_keys=True).encode("utf-8"))
+        if config.provenance:
+            key.update(b"provenance")
+        if self.directory is None:
+            directory, name = os.path.split(root)
+            return os.path.join(directory, ".{:s}.{:s}.cache".format(name, key.hexdigest()[:12]))
+        return os.path.join(self.directory, key.hexdigest() + ".cache")
+
+    def load(self, path):
+        """Returns the config stored in the cache file at path, or None if there
+        is no cache file or any of the files it was read from have changed"""
+        try:
+            with open(path, 'rb') as f:
+                version, records = pickle.load(f)
+                if version != FORMAT_VERSION:
+                    return None
+                rewrite = False
+                for i, (name, mtime, size, digest) in enumerate(records):
+                    st = os.stat(name)
+                    if st.st_size != size:
+                        return None
+                    if getattr(st, "st_mtime_ns", st.st_mtime) != mtime:
+                        if file_hash(name) != digest:
+                            return None
+                        records[i] = file_record(name)
+                        rewrite = True
+                data = pickle.load(f)
+        except (OSError, IOError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            return None
+        if rewrite:
+            self.store(path, records, data)
+        return data
+
+    def store(self, path, records, data):
+        """Writes a cache file atomically, ignoring errors since the cache is
+        only an optimisation"""
+        directory = os.path.dirname(path)
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".hjsonconfig-")
+        except (OSError, IOError):
+            return
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((FORMAT_VERSION, records), f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+            getattr(os, "replace", os.rename)(tmp, path)
+        except (OSError, IOError, pickle.PicklingError):
+            os.remove(tmp)
+
+    def resolve(self, filename, config, graph=None):
+        """Returns the merged contents of filename and its includes, from the
+        cache file if it is valid, otherwise by reading the config files and
+        writing a new cache file.
+
+        Args:
+            filename: the root config file
+            config: the HjsonConfig object whose options are used to read the files
+            graph: an empty IncludeGraph to read the files with if the cache
+                file is not valid.  It is left empty on a hit.
+
+        Returns:
+            The merged config, owned by the caller, and its Origins in a
+            tuple if config records provenance
+        """
+        path = self.path(filename, config)
+        data = self.load(path)
+        if data is not None:
+            self.hits += 1
+            if config.verbose:
+                print("DiskCache.resolve: Loaded {:s} from {:s}".format(filename, path))
+            return data
+
+        self.misses += 1
+        start = time.time()
+        if graph is None:
+            graph = IncludeGraph(config)
+        data = graph.resolve([filename])[0]
+        if config.provenance:
+            data = (data, graph.origins(filename))
+        try:
+            # Don't cache files that changed while they were being read, since
+            # the cache file could then hold their old contents with new stamps
+            if all(os.path.getmtime(key) < start for key in graph.nodes):
+                self.store(path, [file_record(key) for key in graph.nodes], data)
+        except (OSError, IOError):
+            pass
+        return data
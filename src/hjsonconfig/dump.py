@@ -0,0 +1,89 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import json
+
+FORMATS = ("json", "hjson", "compact")
+
+# Encoded text is collected and written in chunks of about this many characters
+CHUNK_SIZE = 1 << 16
+
+
+def _write_chunks(fp, chunks, size=CHUNK_SIZE):
+    """Writes an iterable of strings to fp, joining small strings so that
+    each write is about size characters"""
+    buf = []
+    length = 0
+    for chunk in chunks:
+        buf.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            fp.write(u"".join(buf))
+            buf = []
+            length = 0
+    if buf:
+        fp.write(u"".join(buf))
+
+
+def _iter_compact(config, sort_keys):
+    """Yields the compact JSON encoding of config one top-level entry at a
+    time, encoding each value in one call so that the C encoder is used"""
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+    items = sorted(config.items()) if sort_keys else config.items()
+    yield u"{"
+    for i, (k, v) in enumerate(items):
+        yield (u"," if i else u"") + encoder.encode(k) + u":" + encoder.encode(v)
+    yield u"}"
+
+
+def iter_encode(config, format="json", sort_keys=False):
+    """Yields a config encoded as text, in pieces.
+
+    Args:
+        config: a dict
+        format: "json" for JSON indented by four spaces, "hjson" for hjson,
+            or "compact" for JSON without whitespace.  "json" and "hjson"
+            are encoded by the pure Python encoders, piece by piece.
+            "compact" is several times faster because each top-level value is
+            encoded by the C json encoder, but as one string, so the largest
+            top-level value is held in memory as text.
+        sort_keys: A boolean indicating if keys should be sorted, so that
+            equal configs are always written the same way.
+
+    Raises:
+        ValueError: if format is not one of FORMATS.
+    """
+    if format == "compact":
+        return _iter_compact(config, sort_keys)
+    if format == "json":
+        return json.JSONEncoder(ensure_ascii=False, indent=4, separators=(",", ": "),
+                                sort_keys=sort_keys).iterencode(config)
+    if format == "hjson":
+        import hjson
+
+        return hjson.HjsonEncoder(ensure_ascii=False, sort_keys=sort_keys).iterencode(config)
+    raise ValueError("Unknown dump format {!r}, expected one of {!r}".format(format, FORMATS))
+
+
+def dump(config, path, format="json", sort_keys=False):
+    """Writes a config to a file in chunks, without building the whole text
+    in memory.  With format="compact" each top-level value is still encoded
+    as one string; see iter_encode.
+
+    Args:
+        config: a dict
+        path: the name of the file to write, or a text file object
+        format: "json", "hjson" or "compact", as for iter_encode
+        sort_keys: A boolean indicating if keys should be sorted
+    """
+    chunks = iter_encode(config, format, sort_keys)
+    if hasattr(path, "write"):
+        _write_chunks(path, chunks)
+        path.write(u"\n")
+        return
+    with io.open(path, "w", encoding="utf-8") as f:
+        _write_chunks(f, chunks)
+        f.write(u"\n")
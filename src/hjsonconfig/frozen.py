@@ -0,0 +1,151 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+import weakref
+from collections import OrderedDict
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+try:
+    from sys import intern
+except ImportError:  # Python 2, where intern is a builtin
+    pass
+
+
+class _KeyTable(object):
+    """An interned tuple of keys and the index of each key in it.  Key tables
+    are shared between all frozen dicts with the same keys in the same order."""
+    __slots__ = ("keys", "index", "__weakref__")
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.index = dict((k, i) for i, k in enumerate(keys))
+
+
+_key_tables = weakref.WeakValueDictionary()
+_key_tables_lock = threading.Lock()
+
+
+def _key_table(keys):
+    """Returns the shared _KeyTable for the tuple keys"""
+    keys = tuple(intern(k) if type(k) is str else k for k in keys)
+    with _key_tables_lock:
+        table = _key_tables.get(keys)
+        if table is None:
+            table = _KeyTable(keys)
+            _key_tables[keys] = table
+    return table
+
+
+def freeze(value):
+    """Returns a read-only copy of a config value.  Dicts become FrozenConfig
+    objects and lists become tuples.
+
+    Args:
+        value: a parsed hjson value, HjsonConfig or OrderedDict object
+
+    Returns:
+        The frozen value
+    """
+    if isinstance(value, FrozenConfig):
+        return value
+    if isinstance(value, dict):
+        return FrozenConfig(_key_table(value.keys()), tuple(freeze(v) for v in value.values()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """Returns a mutable copy of a frozen config value.  FrozenConfig objects
+    become hjson.OrderedDict objects and tuples become lists.
+
+    Args:
+        value: a frozen config value
+
+    Returns:
+        The thawed value
+    """
+    if isinstance(value, FrozenConfig):
+        return OrderedDict(zip(value._table.keys, (thaw(v) for v in value._values)))
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+class FrozenConfig(Mapping):
+    """An immutable, hashable snapshot of a config, built by HjsonConfig.freeze().
+
+    Values are stored in a tuple alongside a key table that is shared by
+    every FrozenConfig with the same keys, so many similar configs held in
+    memory cost little more than their values.  Nested dicts are FrozenConfig
+    objects and lists are tuples, so a FrozenConfig can be shared between
+    threads without locking.
+
+    Key order is preserved, and lookups use the standard read-only python
+    dictionary interface.
+    """
+    __slots__ = ("_table", "_values", "_hash")
+
+    def __init__(self, table, values):
+        """Inits FrozenConfig from a key table and a tuple of frozen values.
+        Use freeze() to build a FrozenConfig from a dict."""
+        self._table = table
+        self._values = values
+        self._hash = None
+
+    def __getitem__(self, key):
+        return self._values[self._table.index[key]]
+
+    def __contains__(self, key):
+        return key in self._table.index
+
+    def __iter__(self):
+        return iter(self._table.keys)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenConfig):
+            return self._table is other._table and self._values == other._values
+        if isinstance(other, dict):
+            return self == freeze(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash((self._table.keys, self._values))
+        return self._hash
+
+    def __repr__(self):
+        return "FrozenConfig({!r})".format(list(zip(self._table.keys, self._values)))
+
+    def __reduce__(self):
+        return (freeze, (thaw(self),))
+
+    def keys(self):
+        return self._table.keys
+
+    def values(self):
+        return self._values
+
+    def items(self):
+        return tuple(zip(self._table.keys, self._values))
+
+    def thaw(self):
+        """Returns a mutable HjsonConfig copy of this config"""
+        from hjsonconfig.hjsonconfig import HjsonConfig
+
+        config = HjsonConfig()
+        config._copy_in(thaw(self))
+        return config
@@ -0,0 +1,401 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import OrderedDict
+
+from hjsonconfig.cache import file_stamp
+from hjsonconfig.cache import parse_file
+from hjsonconfig.includes import mount_includes
+from hjsonconfig.instrument import FileEvent
+from hjsonconfig.instrument import clock
+from hjsonconfig.merging import copy_dicts
+from hjsonconfig.provenance import Origins
+from hjsonconfig.provenance import merge_trees
+from hjsonconfig.provenance import origin_tree
+
+
+class IncludeCycleError(ValueError):
+    """Raised when a config file includes itself, directly or through other
+    config files.
+
+    Attributes:
+        chain: the list of file names from the outermost file to the file
+            that was included a second time.
+    """
+    def __init__(self, chain):
+        self.chain = list(chain)
+        super(IncludeCycleError, self).__init__(
+            "Recursive config-file include: {:s}".format(" -> ".join(self.chain)))
+
+
+def config_files(data):
+    """Returns the list of files named by the "config-file" entry of data"""
+    try:
+        config_file = data["config-file"]
+    except KeyError:
+        return []
+    if config_file is None:
+        return []
+    if isinstance(config_file, list):
+        return config_file
+    return [config_file]
+
+
+class IncludeGraph(object):
+    """The graph of config files reachable through "config-file" entries.
+
+    Every distinct file is read and parsed once, however many times it is
+    included, and each file is merged with its includes once, in topological
+    order, so the cost of resolving a config is linear in the number of
+    unique files.
+
+    Attributes:
+        config: the HjsonConfig object whose options (verbosity, cache,
+            merge schema and workers) are used to read and merge the files.
+        nodes: an OrderedDict mapping the resolved path of each file to its
+            parsed contents, in the order the files were discovered.
+        edges: a dict mapping the resolved path of each file to the list of
+            resolved paths of the files it includes, in declared order.
+        names: a dict mapping the resolved path of each file to the name it
+            was first included by.
+        retain: A boolean indicating if the merged contents of every file
+            should be kept after resolving, so that later calls to resolve
+            only need to merge files that have been refreshed.
+        processes: A boolean indicating if files should be parsed in a pool
+            of config.workers processes rather than threads, for CPU-bound
+            loads of many files.  The parse cache is not used.
+        events: a list of the FileEvent objects of the files merged so far,
+            if the config has an instrument hook.
+        stamps: a dict mapping the resolved path of each file read to its
+            (mtime, size) stamp, taken just before it was read.
+        files: a list of the names of the files given ids in origin trees,
+            if the config records provenance.
+    """
+    def __init__(self, config, retain=False, processes=False):
+        """Inits an empty IncludeGraph using the options of config"""
+        self.config = config
+        self.retain = retain
+        self.processes = processes
+        self.nodes = OrderedDict()
+        self.edges = {}
+        self.names = {}
+        self.events = []
+        self.stamps = {}
+        self.files = []
+        self._file_ids = {}
+        self._trees = {}
+        self._resolved = {}
+        self._uses = {}
+        self._pending_events = {}
+
+    def key(self, filename, parent=None):
+        """Returns the key used to identify filename in the graph, which is
+        its resolved path
+
+        Args:
+            filename: the name of a config file
+            parent: the resolved path of the file that includes filename, if any
+        """
+        return self.config.resolver.resolve(filename, parent)
+
+    def _parse(self, key):
+        """Returns the parsed contents of the file identified by key, timing
+        it if the config has an instrument hook"""
+        self.stamps[key] = file_stamp(key)
+        if self.config.instrument is None:
+            return self.config._parse_file(key)
+        event = FileEvent(self.names[key], key)
+        data = self.config._parse_file(key, event)
+        self._pending_events[key] = event
+        return data
+
+    def add(self, filenames, parent=None):
+        """Reads filenames and all the files they include, directly or
+        indirectly, that are not already in the graph.
+
+        If the config has more than one worker, files are read and parsed in
+        a thread pool, and the includes of each file are submitted as soon as
+        it has been parsed, so that independent subtrees load concurrently.
+
+        Args:
+            filenames: a list of file names
+            parent: the name of the file that includes filenames, if any
+
+        Returns:
+            The list of keys of filenames
+        """
+        if parent is not None:
+            parent = self.key(parent)
+        keys = []
+        pending = []
+        for filename in filenames:
+            key = self.key(filename, parent)
+            keys.append(key)
+            if key not in self.names and key not in pending:
+                self.names[key] = filename
+                pending.append(key)
+        self._add_all(pending)
+        return keys
+
+    def _add_all(self, pending):
+        """Reads the files identified by pending, which are named in names,
+        and all the new files they include"""
+        try:
+            workers = self.config.workers
+            if pending and (self.processes or workers is not None and workers > 1):
+                self._add_concurrent(pending, workers)
+            else:
+                while pending:
+                    frontier = []
+                    for key in pending:
+                        frontier.extend(self._add_node(key, self._parse(key)))
+                    pending = frontier
+        except BaseException:
+            # Forget files that could not be read, so that they are retried
+            for key in [k for k in self.names if k not in self.nodes]:
+                del self.names[key]
+            raise
+
+    def _add_concurrent(self, pending, workers):
+        """Parses the files identified by pending and their includes in a
+        pool of threads or processes"""
+        from concurrent.futures import FIRST_COMPLETED
+        from concurrent.futures import wait
+
+        if self.processes:
+            from concurrent.futures import ProcessPoolExecutor as Executor
+
+            def submit(key):
+                self.stamps[key] = file_stamp(key)
+                return pool.submit(parse_file, key)
+        else:
+            from concurrent.futures import ThreadPoolExecutor as Executor
+
+            def submit(key):
+                return pool.submit(self._parse, key)
+
+        with Executor(max_workers=workers) as pool:
+            futures = dict((submit(key), key) for key in pending)
+            try:
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        key = futures.pop(future)
+                        for child in self._add_node(key, future.result()):
+                            futures[submit(child)] = child
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _add_node(self, key, data):
+        """Adds the parsed contents of a file to the graph, returning the keys
+        of the files it includes that have not been seen before.  Dicts nested
+        in data that include files of their own are mounted as LazyIncludes."""
+        self.nodes[key] = mount_includes(data, key, self.config)
+        self.edges[key] = []
+        new = []
+        for filename in config_files(data):
+            child = self.key(filename, key)
+            self.edges[key].append(child)
+            if child not in self.names:
+                self.names[child] = filename
+                new.append(child)
+        return new
+
+    def refresh(self, keys):
+        """Re-reads the files identified by keys, reads any new files they
+        include, and forgets the merged contents of those files and of every
+        file that includes them, directly or indirectly.
+
+        Args:
+            keys: a list of keys of files in the graph
+
+        Returns:
+            The set of keys of files whose merged contents were forgotten.
+        """
+        old = dict((key, (self.nodes[key], self.edges[key], self.stamps.get(key))) for key in keys)
+        try:
+            parsed = [(key, self._parse(key)) for key in keys]
+            new = []
+            for key, data in parsed:
+                new.extend(self._add_node(key, data))
+            self._add_all(new)
+        except BaseException:
+            for key, (data, edges, stamp) in old.items():
+                self.nodes[key] = data
+                self.edges[key] = edges
+                self.stamps[key] = stamp
+            raise
+
+        parents = {}
+        for key, children in self.edges.items():
+            for child in children:
+                parents.setdefault(child, set()).add(key)
+        stale = set()
+        pending = list(keys)
+        while pending:
+            key = pending.pop()
+            if key not in stale:
+                stale.add(key)
+                pending.extend(parents.get(key, ()))
+        for key in stale:
+            self._resolved.pop(key, None)
+            self._trees.pop(key, None)
+        return stale
+
+    def order(self, keys, parent=None):
+        """Returns the files reachable from keys in topological order, so that
+        every file comes after all of the files it includes.
+
+        Args:
+            keys: a list of keys of files in the graph
+            parent: the name of the file that includes keys, if any, used to
+                report include cycles.
+
+        Raises:
+            IncludeCycleError: if a file includes itself.
+        """
+        order = []
+        done = set()
+        stack = [] if parent is None else [self.key(parent)]
+
+        def visit(key):
+            if key in stack:
+                chain = stack[stack.index(key):] + [key]
+                raise IncludeCycleError([self.names.get(k, k) for k in chain])
+            if key in done:
+                return
+            stack.append(key)
+            for child in self.edges[key]:
+                visit(child)
+            stack.pop()
+            done.add(key)
+            order.append(key)
+
+        for key in keys:
+            visit(key)
+        return order
+
+    def resolve(self, filenames, parent=None):
+        """Reads filenames and their includes, and merges each of them with
+        its includes.
+
+        Args:
+            filenames: a list of file names
+            parent: the name of the file that includes filenames, if any
+
+        Returns:
+            A list of the merged contents of filenames, owned by the caller.
+        """
+        keys = self.add(filenames, parent)
+        order = [key for key in self.order(keys, parent) if key not in self._resolved]
+        if self.config.provenance:
+            # The parsed files are modified by merging, so origins are found first
+            for key in order:
+                self.origin_tree(key)
+        if not self.retain:
+            for key in order:
+                for child in self.edges[key]:
+                    self._uses[child] = self._uses.get(child, 0) + 1
+            for key in keys:
+                self._uses[key] = self._uses.get(key, 0) + 1
+
+        for key in order:
+            if self.config.verbose:
+                print("IncludeGraph.resolve: Merging {:s}".format(self.names[key]))
+            instrument = self.config.instrument
+            if instrument is not None:
+                start = clock()
+            data = OrderedDict(self.nodes[key])
+            self._resolved[key] = self.import_files(data, [self._take(c) for c in self.edges[key]])
+            if instrument is not None:
+                event = self._pending_events.pop(key, None)
+                if event is None:
+                    event = FileEvent(self.names[key], key)
+                event.merge_time = clock() - start
+                self.events.append(event)
+                instrument(event)
+        return [self._take(key) for key in keys]
+
+    def file_id(self, key, filename):
+        """Returns the id in origin trees of the file identified by key"""
+        try:
+            return self._file_ids[key]
+        except KeyError:
+            self.files.append(filename)
+            self._file_ids[key] = len(self.files) - 1
+            return self._file_ids[key]
+
+    def import_tree(self, data, key, filename, tree):
+        """Merges the origin tree of data, read from the file identified by
+        key and named filename, on to the origin tree of the files it
+        includes, as import_files merges data"""
+        head = origin_tree(data, self.file_id(key, filename))
+        if data.get("config-file") is not None:
+            head["imported-config-file"] = (head["config-file"][0], None)
+        return merge_trees(tree, head)
+
+    def origin_tree(self, key):
+        """Returns the origin tree of the merged contents of the file
+        identified by key, which must already have been ordered"""
+        try:
+            return self._trees[key]
+        except KeyError:
+            pass
+        tree = {}
+        for child in self.edges[key]:
+            merge_trees(tree, self.origin_tree(child))
+        self._trees[key] = self.import_tree(self.nodes[key], key, self.names[key], tree)
+        return self._trees[key]
+
+    def origins(self, filename):
+        """Returns the Origins of the merged contents of filename"""
+        return Origins(self.files, self.origin_tree(self.key(filename)))
+
+    def _take(self, key):
+        """Returns the merged contents of key for merging in to an including
+        file, only copying them if they are needed again later"""
+        if self.retain:
+            return copy_dicts(self._resolved[key])
+        self._uses[key] -= 1
+        if self._uses[key] == 0:
+            return self._resolved.pop(key)
+        return copy_dicts(self._resolved[key])
+
+    def import_files(self, data, file_configs):
+        """Merges data on to the merged contents of the files it includes.
+
+        The "config-file" entry of data is moved to "imported-config-file".
+
+        Args:
+            data: the contents of a config file, owned by the caller
+            file_configs: the merged contents of each file named in the
+                "config-file" entry of data, owned by the caller
+
+        Returns:
+            The merged config
+        """
+        config_file = data.get("config-file")
+        if config_file is None:
+            return data
+
+        if isinstance(config_file, list):
+            file_config = OrderedDict()
+            for f in file_configs:
+                file_config = self.config._merge_in(file_config, f)
+        else:
+            file_config = file_configs[0]
+        if self.config.verbose:
+            print("IncludeGraph.importFiles: Imported {!s}".format(config_file))
+
+        # We will move imported config-files to "imported-config-file"
+        data["config-file"] = None
+        try:
+            data["imported-config-file"] = data["imported-config-file"] + [config_file]
+        except KeyError:
+            data["imported-config-file"] = [config_file]
+
+        return self.config._merge_in(file_config, data)
@@ -3,21 +3,58 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from pprint import pprint
-
-import hjson
-import jsonmerge
-
-
-def merge(base, head):
-    """Merge two HjsonConfig objects together, using jsonmerge.merge. Keys in
-    head overwrite duplicate keys in base.
+import sys
+from collections import OrderedDict
+
+from hjsonconfig.cache import default_cache
+from hjsonconfig.cache import parse_file
+from hjsonconfig.graph import IncludeGraph
+from hjsonconfig.graph import config_files
+from hjsonconfig.includes import mount
+from hjsonconfig.includes import mount_includes
+from hjsonconfig.instrument import LoadReport
+from hjsonconfig.instrument import clock
+from hjsonconfig.instrument import print_event
+from hjsonconfig.merging import merge_into
+from hjsonconfig.merging import merge_values
+from hjsonconfig.paths import _MISSING
+from hjsonconfig.paths import compile_path
+from hjsonconfig.provenance import Origins
+from hjsonconfig.provenance import merge_trees
+from hjsonconfig.provenance import origin_tree
+from hjsonconfig.resolver import Resolver
+from hjsonconfig.resolver import default_resolver
+from hjsonconfig.streaming import LazySection
+
+# hjson, and jsonmerge which imports jsonschema, are only imported when they
+# are first needed, so that importing this module stays cheap for programs
+# that only read small or cached configs.  They are still available as
+# attributes of this module for backwards compatibility.
+_LAZY_MODULES = ("hjson", "jsonmerge")
+
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        return __import__(name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+if sys.version_info < (3, 7):  # No module __getattr__, so import eagerly
+    for _name in _LAZY_MODULES:
+        globals()[_name] = __import__(_name)
+
+
+def merge(base, head, schema=None):
+    """Merge two HjsonConfig objects together. Keys in head overwrite
+    duplicate keys in base, and dicts present in both are merged recursively.
 
     Args:
         base: an HjsonConfig or OrderedDict object that represents the
             base of the output.
         head: an HjsonConfig or OrderedDict object to be merged on to the base,
             with duplicated entries overwriting entries in base.
+        schema: an optional jsonmerge merge schema.  If given, the merge is
+            done by jsonmerge.merge using the strategies in schema.
 
     Returns:
         An HjsonConfig object containing the merged key:value pairs
@@ -30,7 +67,12 @@ def merge(base, head):
     except AttributeError:
         verbose = False
 
-    merged = jsonmerge.merge(base, head)
+    if schema is None:
+        merged = merge_values(base, head)
+    else:
+        import jsonmerge
+
+        merged = jsonmerge.merge(base, head, schema)
 
     # We copy merged into out, to ensure that the returned value is an
     # HjsonConfig obect rather than an OrderedDict object.
@@ -39,13 +81,16 @@ def merge(base, head):
     return out
 
 
-class HjsonConfig(hjson.OrderedDict):
+class HjsonConfig(OrderedDict):
     """A class to handle reading configurations in hjson files, which
     may include references to other hjson files via "config-file" entries.
 
     On reading the hjson file with readFile, the class looks for "config-file"
     entries and imports their contents as well.  Entries duplicated in the top
-    level file override the entries in an included file.
+    level file override the entries in an included file.  A dict nested at
+    any depth may have a "config-file" entry too, such as
+    "database: {config-file: db.hjson}"; its files are merged under it the
+    first time it is accessed (see includes.LazyInclude).
 
     The key:value pairs read from the config files are made available via the
     standard python dictionary interface.  The order the keys are read from the
@@ -54,24 +99,159 @@ class HjsonConfig(hjson.OrderedDict):
 
     Attributes:
         verbose: A boolean indicating if extra output should be given. Very
-                helpful for tracking down errors in the imports.
+                helpful for tracking down errors in the imports.  Unless
+                another instrument hook is given, the timings of each file
+                are printed too.
         filename: The name of the config file last imported. Helps provide a
                 basic check for recursive loops of config files
+        cache: The ParseCache used to avoid re-parsing files shared between
+                configs, or None if files should always be parsed.  Pass
+                cache=False to disable caching, or a ParseCache object to use
+                instead of the process-wide cache.
+        disk_cache: A DiskCache used to store fully merged configs on disk, so
+                that later programs reading the same file can skip parsing
+                it, or None (the default) to disable it.  Pass disk_cache=True
+                to use the per-user cache directory, or a directory name.
+        generation: A number that is incremented every time the config is
+                modified through the dictionary interface, set_path or
+                invalidate.  Values looked up by get_path are memoized until
+                the generation changes.
+        stream: A boolean indicating if filename should be read one top-level
+                section at a time, building this object in place.
+        lazy_sections: A list of top-level keys of filename whose values
+                should not be parsed until they are first accessed.  Implies
+                stream=True, and makes the object a LazySectionConfig.  Until
+                then items() and values() return LazySection placeholders
+                for them; call materialize() to parse them all.
+        merge_schema: An optional jsonmerge merge schema used when merging
+                included config files.  By default included files are merged
+                with the built-in merge, which has the same semantics as
+                jsonmerge.merge without a schema.
+        workers: The number of threads used to read and parse included config
+                files concurrently.  None (the default) or 1 reads the files
+                one after another.  The merge order does not depend on workers.
+        instrument: A function called with a FileEvent for each file read,
+                once it has been merged with its includes, and then with a
+                LoadReport summarizing the whole load, or None (the default)
+                to not time loading at all.  See instrument.LoggingHook.
+        provenance: A boolean indicating if the file that set each value
+                should be recorded while loading, for origin() to look up.
+        schema: An optional JSON schema that the config is checked against
+                once it has been loaded.  Missing properties with defaults
+                are filled in, and strings are converted to the types the
+                schema requires, in the same pass.  ConfigValidationError is
+                raised, listing the key path of every error, if the config
+                does not match.
+        resolver: The Resolver used to find included config files, which
+                are looked for relative to the including file, then the
+                current directory, then the search path.  Pass search_path
+                as a list of directories, or a Resolver object, to use
+                instead of the HJSONCONFIG_PATH environment variable.
+        overrides: A list of overrides.Override tuples, merged in to the
+                config in order once its files have been merged, before it is
+                checked against its schema.  Only the key paths they set are
+                touched.  A dict mapping dotted key paths to values may be
+                given instead.  See overrides.from_environ and
+                overrides.from_args.
+        interpolate: True to expand ${dotted.path} references in string
+                values once the config has been loaded, after the overrides
+                and before validation, or "lazy" to leave the strings as they
+                are and expand only the values looked up by get_path.  False
+                (the default) leaves references alone.  The config is expanded
+                once each time it is read, not on later calls to
+                import_config_files.  See interpolation.Interpolator.
     """
     def __init__(self, *args, **kwds):
         """Inits HjsonConfig class, sets filename and verbosity and
         reads in config key:value pairs from filename if present."""
+        self.generation = 0
+        self._paths = {}
+        self._origins = None
         # Use try and except to parse **kwds, so that python 2.7 should work like python 3
         try:
-            self.verbose = kwds["verbose"]
+            self.verbose = kwds.pop("verbose")
         except KeyError:
             self.verbose = False
         try:
-            self.filename = kwds["filename"]
+            self.filename = kwds.pop("filename")
         except KeyError:
             self.filename = None
+        try:
+            cache = kwds.pop("cache")
+        except KeyError:
+            cache = True
+        if cache is True:
+            cache = default_cache
+        elif cache is False:
+            cache = None
+        self.cache = cache
+        try:
+            disk_cache = kwds.pop("disk_cache")
+        except KeyError:
+            disk_cache = None
+        if disk_cache is True or isinstance(disk_cache, str):
+            from hjsonconfig.diskcache import DiskCache
+            from hjsonconfig.diskcache import default_directory
+
+            disk_cache = DiskCache(default_directory() if disk_cache is True else disk_cache)
+        elif disk_cache is False:
+            disk_cache = None
+        self.disk_cache = disk_cache
+        try:
+            self.merge_schema = kwds.pop("merge_schema")
+        except KeyError:
+            self.merge_schema = None
+        try:
+            self.workers = kwds.pop("workers")
+        except KeyError:
+            self.workers = None
+        try:
+            self.instrument = kwds.pop("instrument")
+        except KeyError:
+            self.instrument = print_event if self.verbose else None
+        try:
+            self.provenance = kwds.pop("provenance")
+        except KeyError:
+            self.provenance = False
+        try:
+            self.schema = kwds.pop("schema")
+        except KeyError:
+            self.schema = None
+        try:
+            search_path = kwds.pop("search_path")
+        except KeyError:
+            search_path = None
+        if search_path is None:
+            self.resolver = default_resolver
+        elif isinstance(search_path, Resolver):
+            self.resolver = search_path
+        else:
+            self.resolver = Resolver(search_path)
+        try:
+            overrides = kwds.pop("overrides")
+        except KeyError:
+            overrides = None
+        if overrides:
+            from hjsonconfig.overrides import as_overrides
 
-        super(hjson.OrderedDict, self).__init__(*args, **kwds)
+            overrides = as_overrides(overrides)
+        self.overrides = overrides or []
+        try:
+            self.interpolate = kwds.pop("interpolate")
+        except KeyError:
+            self.interpolate = False
+        self._interpolator = None
+        self._expanded = False
+        try:
+            self.lazy_sections = kwds.pop("lazy_sections")
+        except KeyError:
+            self.lazy_sections = ()
+        try:
+            self.stream = kwds.pop("stream") or bool(self.lazy_sections)
+        except KeyError:
+            self.stream = bool(self.lazy_sections)
+
+        super(HjsonConfig, self).__init__(*args, **kwds)
 
         if self.filename is not None:
             if self.verbose:
@@ -92,23 +272,249 @@ class HjsonConfig(hjson.OrderedDict):
         if self.verbose:
             print("HjsonConfig._readFile: Reading file: ", filename)
 
-        f = open(filename, 'r')
-        newConfig = HjsonConfig(verbose=self.verbose)
-        newConfig._copy_in(hjson.load(f))
-        f.close()
-        if self.verbose:
-            print("HjsonConfig._readFile: Got config:")
-            pprint(newConfig)
-        newConfig.import_config_files()
+        instrument = self.instrument
+        if instrument is not None:
+            start = clock()
+        newConfig = self._new_config()
+        graph = IncludeGraph(self)
+        if self.disk_cache is None:
+            newConfig._copy_in(graph.resolve([filename])[0])
+            if self.provenance:
+                newConfig._origins = graph.origins(filename)
+        elif self.provenance:
+            data, newConfig._origins = self.disk_cache.resolve(filename, self, graph)
+            newConfig._copy_in(data)
+        else:
+            newConfig._copy_in(self.disk_cache.resolve(filename, self, graph))
+        if instrument is not None:
+            disk_cache = None if self.disk_cache is None else "miss" if graph.nodes else "hit"
+            instrument(LoadReport(filename, graph.events, clock() - start, disk_cache))
 
         return newConfig
 
+    def invalidate(self):
+        """Forgets the values memoized by get_path.  This is done automatically
+        when the config is modified, but must be called after modifying one of
+        the nested dicts in the config directly."""
+        self.generation += 1
+        if self._paths:
+            self._paths.clear()
+
+    def __new__(cls, *args, **kwds):
+        # Only configs with lazy sections need the slower __getitem__ that
+        # parses them, so other configs keep the one of OrderedDict
+        if cls is HjsonConfig and kwds.get("lazy_sections"):
+            cls = LazySectionConfig
+        return super(HjsonConfig, cls).__new__(cls)
+
+    def __reduce__(self):
+        # The parse cache holds a lock, so it is replaced by a flag saying if
+        # the config uses the process-wide cache
+        state = self.__dict__.copy()
+        state["cache"] = state["cache"] is default_cache
+        del state["_paths"]
+        state["_interpolator"] = None
+        return (self.__class__, (), state, None, iter(OrderedDict.items(self)))
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cache = default_cache if state["cache"] else None
+        self._paths = {}
+
+    def materialize(self):
+        """Parses all the lazy sections that have not been accessed yet"""
+        for key, value in list(OrderedDict.items(self)):
+            if isinstance(value, LazySection):
+                self[key]
+
+    def __setitem__(self, key, value):
+        self.invalidate()
+        super(HjsonConfig, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.invalidate()
+        super(HjsonConfig, self).__delitem__(key)
+
+    def clear(self):
+        self.invalidate()
+        super(HjsonConfig, self).clear()
+
+    def pop(self, *args):
+        self.invalidate()
+        return super(HjsonConfig, self).pop(*args)
+
+    def popitem(self, *args, **kwds):
+        self.invalidate()
+        return super(HjsonConfig, self).popitem(*args, **kwds)
+
+    def setdefault(self, *args):
+        self.invalidate()
+        return super(HjsonConfig, self).setdefault(*args)
+
+    def get_path(self, path, default=_MISSING):
+        """Returns the value at a dotted key path such as "server.pool.size".
+
+        Values are memoized under the path given, as well as under its keys
+        for compiled accessors, so repeated lookups of the same path cost a
+        single dict lookup until the config is modified.  If interpolate is
+        "lazy", the references the value depends on are expanded.
+
+        Args:
+            path: a dotted path, or a tuple of keys
+            default: the value to return if the path is not present.  If not
+                given, a KeyError is raised instead.
+
+        Raises:
+            InterpolationError: if a reference cannot be expanded.
+        """
+        if self.interpolate == "lazy":
+            return self._get_interpolator().get(path, default)
+        try:
+            return self._paths[path]
+        except (KeyError, TypeError):
+            pass
+        compiled = compile_path(path)
+        generation = self.generation
+        value = compiled.get(self, default)
+        if isinstance(path, str) and self.generation == generation and compiled.keys in self._paths:
+            self._paths[path] = value
+        return value
+
+    def _get_interpolator(self):
+        """Returns the Interpolator of this config, scanning it again if it
+        has been modified"""
+        interpolator = self._interpolator
+        if interpolator is None or interpolator[0] != self.generation:
+            from hjsonconfig.interpolation import Interpolator
+
+            self.materialize()
+            interpolator = self._interpolator = (self.generation, Interpolator(self))
+        return interpolator[1]
+
+    def set_path(self, path, value):
+        """Sets the value at a dotted key path, creating any missing dicts
+
+        Args:
+            path: a dotted path, or a tuple of keys
+            value: the value to set
+        """
+        keys = compile_path(path).keys
+        d = self
+        for key in keys[:-1]:
+            if key not in d:
+                d[key] = OrderedDict()
+            d = d[key]
+        d[keys[-1]] = value
+        self.invalidate()
+
+    def origin(self, path):
+        """Returns the name of the config file that set the value at a dotted
+        key path, as it was when the config was loaded.  Requires the config
+        to have been read with provenance=True.
+
+        Args:
+            path: a dotted path, or a tuple of keys
+
+        Returns:
+            The file name, as it was included, or None for values set in an
+            in-memory config whose includes were imported.
+
+        Raises:
+            KeyError: if the path was not present when the config was loaded.
+            ValueError: if provenance was not recorded, for the config or for
+                the nested include the path is in.
+        """
+        if self._origins is None:
+            raise ValueError("Provenance was not recorded; load the config with provenance=True")
+        return self._origins.origin(path, self)
+
+    def validate(self):
+        """Checks this config against its schema, if it has one, filling in
+        defaults and converting values to the types in the schema.  This is
+        done automatically when a config is loaded.
+
+        Raises:
+            ConfigValidationError: if the config does not match the schema.
+        """
+        if self.schema is None:
+            return
+        from hjsonconfig.schema import validate
+
+        try:
+            validate(self, self.schema)
+        finally:
+            self.invalidate()
+
+    def _finish_load(self):
+        """Merges in the overrides and then validates the config, which is
+        the last stage of every load"""
+        if self.overrides:
+            from hjsonconfig.overrides import apply_overrides
+
+            apply_overrides(self, self.overrides, self._origins)
+            self.invalidate()
+        # An expanded config is only expanded again once it is read again,
+        # or "$${" escapes would be expanded twice
+        if self.interpolate is True and not self._expanded:
+            from hjsonconfig.interpolation import interpolate
+
+            self.materialize()
+            interpolate(self)
+            self.invalidate()
+            self._expanded = True
+        self.validate()
+
+    @staticmethod
+    def compile_path(path):
+        """Returns a reusable CompiledPath accessor for a dotted key path.
+        Calling it with a config returns the value at path in that config."""
+        return compile_path(path)
+
+    def _options(self):
+        """Returns the options of this object as a dict of keyword arguments"""
+        return dict(verbose=self.verbose, cache=self.cache, disk_cache=self.disk_cache,
+                    merge_schema=self.merge_schema, workers=self.workers, instrument=self.instrument,
+                    provenance=self.provenance, search_path=self.resolver, schema=self.schema,
+                    overrides=self.overrides, interpolate=self.interpolate)
+
+    def _new_config(self, **kwds):
+        """Returns an empty HjsonConfig object with the same options as this one"""
+        options = self._options()
+        options.update(kwds)
+        return HjsonConfig(**options)
+
+    def _merge_in(self, base, head):
+        """Merges head in to base, which must be owned by the caller, and
+        returns the merged value"""
+        if self.merge_schema is None:
+            return merge_into(base, head)
+        import jsonmerge
+
+        return jsonmerge.merge(base, head, self.merge_schema)
+
+    def _parse_file(self, filename, event=None):
+        """Parses a configuration file, using the parse cache if enabled
+
+        Args:
+            filename: path to file to be read
+            event: an optional FileEvent in which to record how long reading
+                and parsing the file took
+
+        Returns:
+            An hjson.OrderedDict object owned by the caller.
+        """
+        if event is not None:
+            return event.load(self.cache)
+        if self.cache is None:
+            return parse_file(filename)
+        return self.cache.load(filename)
+
     def _copy_in(self, odict):
         """Deletes all this objects data and copies in data from odict
 
         Args:
             odict: an OrderedDict or HjsonConfig object"""
-        if odict is not None:
+        if odict is not None and odict is not self:
             self.clear()
             for k in odict.keys():
                 self[k] = odict[k]
@@ -125,23 +531,180 @@ class HjsonConfig(hjson.OrderedDict):
             if self.verbose:
                 print("HjsonConfig.readFile: setting filename: ", filename)
             self.filename = filename
-        self._copy_in(self._read_file(filename))
+        self._expanded = False
+        if self.stream:
+            self._stream_in(filename)
+        else:
+            config = self._read_file(filename)
+            self._copy_in(config)
+            self._origins = config._origins
+            self._finish_load()
+
+    def _stream_in(self, filename):
+        """Reads a config file in to this object one top-level section at a
+        time, leaving the sections in lazy_sections unparsed, and then
+        imports the files it includes.
+
+        Args:
+            filename: a filename to read the config file from"""
+        from hjsonconfig.streaming import iter_sections
+
+        if self.verbose:
+            print("HjsonConfig._streamIn: Streaming file: ", filename)
+        self.clear()
+        for key, value in iter_sections(self.resolver.resolve(filename), self.lazy_sections):
+            self[key] = value
+        self.import_config_files()
+
+    @classmethod
+    def load_many(cls, paths, workers=None, processes=False, **kwds):
+        """Reads many root config files that share included files.
+
+        The include graph of all the files is read at once, so each distinct
+        file is read and parsed once, and merged with its includes once,
+        however many of the roots include it.
+
+        Args:
+            paths: a list of root config file names
+            workers: the number of threads, or processes, used to read and
+                parse the files.  None reads them one after another, unless
+                processes is set.
+            processes: A boolean indicating if the files should be parsed in a
+                pool of processes, for large files where parsing is CPU-bound.
+                The parse cache is not used.
+            Other keyword arguments set the options of the configs returned.
+
+        Returns:
+            An OrderedDict mapping each path to its HjsonConfig object.
+
+        Raises:
+            IncludeCycleError: if a config file includes itself.
+        """
+        options = cls(workers=workers, **kwds)
+        instrument = options.instrument
+        if instrument is not None:
+            start = clock()
+        graph = IncludeGraph(options, processes=processes)
+        configs = OrderedDict()
+        for path, data in zip(paths, graph.resolve(paths)):
+            config = options._new_config()
+            config._copy_in(data)
+            config.filename = path
+            if options.provenance:
+                config._origins = graph.origins(path)
+            config._finish_load()
+            configs[path] = config
+        if instrument is not None:
+            instrument(LoadReport(None, graph.events, clock() - start))
+        return configs
+
+    @classmethod
+    def aload(cls, filename, timeout=None, executor=None, **kwds):
+        """Reads a config file and its includes without blocking the asyncio
+        event loop.  The files are read and parsed in an executor, and the
+        includes of each file are read concurrently.
+
+        Args:
+            filename: path to file to be read
+            timeout: an optional time limit in seconds, after which
+                asyncio.TimeoutError is raised
+            executor: the concurrent.futures executor to read files in, by
+                default the event loop's default executor
+            Other keyword arguments set the options of the config.
+
+        Returns:
+            A coroutine returning the HjsonConfig object, which is the same as
+            HjsonConfig(filename=filename, **kwds).
+        """
+        from hjsonconfig.aio import aload
+
+        return aload(cls, filename, timeout, executor, kwds)
+
+    def aimport_config_files(self, timeout=None, executor=None):
+        """Returns a coroutine that does import_config_files without blocking
+        the asyncio event loop.  See aload for the arguments."""
+        from hjsonconfig.aio import aimport_config_files
+
+        return aimport_config_files(self, timeout, executor)
+
+    def dump(self, path, format="json", sort_keys=False):
+        """Writes the config, including the imported-config-file entries, to
+        a file that reads back as the same config.  The text is written in
+        chunks rather than built in memory, and lazy sections are parsed
+        first.
+
+        Args:
+            path: the name of the file to write, or a text file object
+            format: "json" for indented JSON, "hjson" for hjson, or
+                "compact" for JSON without whitespace.  "json" and "hjson"
+                are encoded in pure Python; "compact" is encoded by the C
+                json encoder and is the fastest, but builds the text of each
+                top-level value in memory.
+            sort_keys: A boolean indicating if keys should be sorted, so that
+                equal configs are always written the same way.
+
+        Raises:
+            ValueError: if format is not one of the formats above.
+        """
+        from hjsonconfig.dump import dump
+
+        self.materialize()
+        dump(self, path, format, sort_keys)
+
+    def freeze(self):
+        """Returns an immutable, hashable and compact snapshot of this config,
+        for sharing between threads once loading is done.
+
+        Returns:
+            A FrozenConfig object, in which nested dicts are FrozenConfig
+            objects and lists are tuples.
+        """
+        from hjsonconfig.frozen import freeze
+
+        self.materialize()
+        return freeze(self)
+
+    def watch(self, callback=None, interval=1.0):
+        """Returns a ConfigWatcher that keeps a copy of this config up to date
+        as the file it was read from, and the files it includes, change.
+
+        Args:
+            callback: an optional function called as callback(config, changed)
+                when the config is reloaded.
+            interval: the time in seconds between polls for changes once the
+                watcher's background thread is started.
+
+        Returns:
+            A ConfigWatcher object, whose config attribute holds the current config.
+        """
+        from hjsonconfig.watch import ConfigWatcher
+
+        if self.filename is None:
+            raise ValueError("Only configs read from a file can be watched")
+        return ConfigWatcher(self.filename, callback=callback, interval=interval, **self._options())
 
     def import_config_files(self):
         """Merges in referenced config files if present.
 
         Entries in the current config overwrite any entries read from the file.
-        This allows this function to be called recursively to build up a complete
-        config that refers to default settings stored in default configs.
+        The complete graph of included files is read first, so that each file
+        is only read and merged once, however many times it is included.
+        Nested dicts with "config-file" entries are mounted as LazyIncludes,
+        which are not read until they are accessed.
+
+        Raises:
+            IncludeCycleError: if a config file includes itself, directly or
+                through other config files.
         """
-        # If a config json OrderedDict is passed, merge it with the existing configuration
+        mount_includes(self, None if self.filename is None else self.resolver.resolve(self.filename), self)
+
         # Try and parse a config-file if it is passed to us
         config_file = None
         try:
             if self["config-file"] is not None:
                 config_file = self["config-file"]
                 if self.verbose:
-                    print("HjsonConfig.importConfigFiles: Import from {:s}".format(config_file))
+                    print("HjsonConfig.importConfigFiles: Import from {!s}".format(config_file))
 
         except KeyError:
             if self.verbose:
@@ -149,30 +712,63 @@ class HjsonConfig(hjson.OrderedDict):
             config_file = None
 
         if config_file is not None:
-            # Might be a list of fileNames or a single filename
-            if isinstance(config_file, list):
-                if self.verbose:
-                    print("HjsonConfig.importConfigFiles: Importing config-files {:s}".format(config_file))
-                file_config = HjsonConfig(verbose=self.verbose)
-                for c in config_file:
-                    f = self._read_file(c)
-                    file_config._copy_in(jsonmerge.merge(file_config, f))
-            else:
-                if self.verbose:
-                    print("HjsonConfig.importConfigFiles: Importing config-file {:s}".format(config_file))
-                file_config = HjsonConfig(filename=config_file, verbose=self.verbose)
-            if self.verbose:
-                pprint(file_config)
+            self._import_graph(IncludeGraph(self), None if self.instrument is None else clock())
+        elif self.provenance:
+            self._origins = Origins([self.filename], origin_tree(self, 0))
+        self._finish_load()
 
-            # We will move imported config-files to "imported-config-file"
-            self["config-file"] = None
-            try:
-                self["imported-config-file"].append(config_file)
-            except KeyError:
-                self["imported-config-file"] = [config_file]
+    def _import_graph(self, graph, start=None):
+        """Merges in the files named by the "config-file" entry, reading any
+        that are not already in graph
 
-            # clear self and copy the merged ODict from jsonmerge in
-            self._copy_in(jsonmerge.merge(file_config, self))
+        Args:
+            graph: an IncludeGraph using the options of this object
+            start: the clock() time loading started, for the load report
+        """
+        keys = graph.add(config_files(self), self.filename)
+        file_configs = graph.resolve(config_files(self), parent=self.filename)
+
+        # Lazy sections that are also in an included file have to be
+        # parsed to be merged with it
+        for key, value in list(OrderedDict.items(self)):
+            if isinstance(value, LazySection) and any(key in f for f in file_configs):
+                self[key]
+
+        if self.provenance:
+            tree = {}
+            for key in keys:
+                merge_trees(tree, graph.origin_tree(key))
+            key = None if self.filename is None else graph.key(self.filename)
+            origins = Origins(graph.files, graph.import_tree(self, key, self.filename, tree))
+
+        # clear self and copy the merged ODict in
+        self._copy_in(graph.import_files(self, file_configs))
+        if self.provenance:
+            self._origins = origins
+        if self.instrument is not None:
+            self.instrument(LoadReport(self.filename, graph.events, clock() - start))
+
+
+class LazySectionConfig(HjsonConfig):
+    """An HjsonConfig with lazy_sections, which parses each lazy section the
+    first time it is looked up.  HjsonConfig(lazy_sections=...) returns one
+    of these; subclasses of HjsonConfig that use lazy sections should derive
+    from it instead."""
+
+    def __getitem__(self, key):
+        value = OrderedDict.__getitem__(self, key)
+        if isinstance(value, LazySection):
+            # Parsing a lazy section doesn't change the config, so the
+            # generation is left alone
+            value = mount(value.load(), value.filename, self)
+            OrderedDict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
 
 
 def main():
@@ -0,0 +1,238 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+from collections import OrderedDict
+
+# Serializes loading, so that each include is read once however many threads
+# access it.  Loading an include can load the includes nested in it, so the
+# lock is reentrant.
+_load_lock = threading.RLock()
+
+
+class LazyInclude(OrderedDict):
+    """A dict nested in a config that has a "config-file" entry, such as
+    "database: {config-file: db.hjson}".  The files it names are read and
+    merged under its own entries the first time any of its items are
+    accessed, with the same semantics as "config-file" at the top level of a
+    config, and the merged items replace its own in place.
+
+    Attributes:
+        parent: the resolved path of the file the dict was read from, which
+            relative names are looked for next to, or None.
+        pending: A boolean indicating if the included files have not been
+            merged in yet.
+        files: an OrderedDict mapping the resolved path of each file read
+            when it was loaded to its (mtime, size) stamp, taken just before
+            it was read, or None while it is pending.  Includes nested in
+            them are loaded separately and list their own files.
+        origins: the provenance.Origins of the entries of the include once it
+            is loaded, if it was read with provenance=True, or None.  Its own
+            entries are attributed to the file name None.
+    """
+    def __init__(self, data=(), parent=None, config=None):
+        """Inits LazyInclude with the entries of the dict it replaces
+
+        Args:
+            data: the entries of the dict, including "config-file"
+            parent: the resolved path of the file the dict was read from
+            config: the HjsonConfig object whose options are used to read
+                the included files, or None for the default options
+        """
+        OrderedDict.__init__(self)
+        self.parent = parent
+        self.pending = True
+        self.files = None
+        self.origins = None
+        self._config = config
+        for k, v in (data.items() if isinstance(data, dict) else data):
+            OrderedDict.__setitem__(self, k, v)
+
+    def load(self):
+        """Reads the included files and merges them in, if that has not been
+        done yet.  This is called by every other method."""
+        if not self.pending:
+            return
+        with _load_lock:
+            if not self.pending:
+                return
+            from hjsonconfig.graph import IncludeGraph
+            from hjsonconfig.graph import config_files
+            from hjsonconfig.provenance import Origins
+            from hjsonconfig.provenance import merge_trees
+
+            config = self._config
+            if config is None:
+                from hjsonconfig.hjsonconfig import HjsonConfig
+
+                config = HjsonConfig()
+            data = OrderedDict(OrderedDict.items(self))
+            if config.verbose:
+                print("LazyInclude.load: Import from {!s}".format(data["config-file"]))
+            graph = IncludeGraph(config)
+            file_configs = graph.resolve(config_files(data), parent=self.parent)
+            if config.provenance:
+                # data is modified by merging, so its origins are found first
+                tree = {}
+                for key in graph.add(config_files(data), self.parent):
+                    merge_trees(tree, graph.origin_tree(key))
+                self.origins = Origins(graph.files, graph.import_tree(data, None, None, tree))
+            merged = graph.import_files(data, file_configs)
+            OrderedDict.clear(self)
+            for k, v in merged.items():
+                OrderedDict.__setitem__(self, k, v)
+            self.files = OrderedDict((k, graph.stamps[k]) for k in graph.nodes)
+            self.pending = False
+            self._config = None
+
+    def copy_pending(self):
+        """Returns a new LazyInclude for the same files, sharing no dicts with
+        this one, without loading it"""
+        from hjsonconfig.merging import copy_dicts
+
+        return LazyInclude(copy_dicts(OrderedDict(OrderedDict.items(self))), self.parent, self._config)
+
+    def copy_loaded(self, items):
+        """Returns a new loaded LazyInclude holding items, which records the
+        same files and origins as this one"""
+        return _loaded(items, self.parent, self.files, self.origins)
+
+    def __reduce__(self):
+        # A pending include keeps the options used to read files, such as the
+        # search path, so that it is read the same way once unpickled.  The
+        # instrument hook is left out, as it may not be picklable.
+        if self.pending:
+            config = self._config
+            if config is not None:
+                from hjsonconfig.hjsonconfig import HjsonConfig
+
+                config = HjsonConfig(verbose=config.verbose, cache=config.cache, merge_schema=config.merge_schema,
+                                     workers=config.workers, provenance=config.provenance,
+                                     search_path=config.resolver, instrument=None)
+            return (LazyInclude, (OrderedDict(OrderedDict.items(self)), self.parent, config))
+        return (_loaded, (OrderedDict(OrderedDict.items(self)), self.parent, self.files, self.origins))
+
+    def __repr__(self):
+        self.load()
+        return OrderedDict.__repr__(self)
+
+    def __getitem__(self, key):
+        self.load()
+        return OrderedDict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        self.load()
+        OrderedDict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self.load()
+        OrderedDict.__delitem__(self, key)
+
+    def __contains__(self, key):
+        self.load()
+        return OrderedDict.__contains__(self, key)
+
+    def __iter__(self):
+        self.load()
+        return OrderedDict.__iter__(self)
+
+    def __reversed__(self):
+        self.load()
+        return OrderedDict.__reversed__(self)
+
+    def __len__(self):
+        self.load()
+        return OrderedDict.__len__(self)
+
+    def __eq__(self, other):
+        self.load()
+        if isinstance(other, LazyInclude):
+            other.load()
+        return OrderedDict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def keys(self):
+        self.load()
+        return OrderedDict.keys(self)
+
+    def values(self):
+        self.load()
+        return OrderedDict.values(self)
+
+    def items(self):
+        self.load()
+        return OrderedDict.items(self)
+
+    def get(self, key, default=None):
+        self.load()
+        return OrderedDict.get(self, key, default)
+
+    def pop(self, *args):
+        self.load()
+        return OrderedDict.pop(self, *args)
+
+    def popitem(self, *args, **kwds):
+        self.load()
+        return OrderedDict.popitem(self, *args, **kwds)
+
+    def setdefault(self, *args):
+        self.load()
+        return OrderedDict.setdefault(self, *args)
+
+    def update(self, *args, **kwds):
+        self.load()
+        OrderedDict.update(self, *args, **kwds)
+
+    def clear(self):
+        self.load()
+        OrderedDict.clear(self)
+
+    def copy(self):
+        self.load()
+        return OrderedDict(OrderedDict.items(self))
+
+
+def _loaded(items, parent, files, origins):
+    """Returns a LazyInclude that has already been loaded"""
+    include = LazyInclude(items, parent)
+    include.pending = False
+    include.files = files
+    include.origins = origins
+    return include
+
+
+def mount(value, parent, config):
+    """Returns value with every dict in it that has a "config-file" entry,
+    including value itself, replaced by a LazyInclude.  Dicts are modified
+    in place.
+
+    Args:
+        value: a parsed hjson value
+        parent: the resolved path of the file value was read from, or None
+        config: the HjsonConfig object whose options are used to read the
+            included files
+    """
+    if not isinstance(value, dict) or isinstance(value, LazyInclude):
+        return value
+    mount_includes(value, parent, config)
+    if value.get("config-file") is not None:
+        return LazyInclude(value, parent, config)
+    return value
+
+
+def mount_includes(data, parent, config):
+    """Replaces every dict nested in data that has a "config-file" entry
+    with a LazyInclude, and returns data.  The "config-file" entry of data
+    itself is left for IncludeGraph to resolve."""
+    for k, v in data.items():
+        if isinstance(v, dict):
+            mounted = mount(v, parent, config)
+            if mounted is not v:
+                data[k] = mounted
+    return data
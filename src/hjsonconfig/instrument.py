@@ -0,0 +1,201 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import time
+
+# The clock used for all timings
+clock = getattr(time, "perf_counter", time.time)
+
+
+def count_keys(value):
+    """Returns the number of keys in value and all the dicts nested in it"""
+    if isinstance(value, dict):
+        return len(value) + sum(count_keys(v) for v in value.values())
+    if isinstance(value, list):
+        return sum(count_keys(v) for v in value)
+    return 0
+
+
+class FileEvent(object):
+    """Timings and statistics for one config file, passed to the instrument
+    hook of an HjsonConfig once the file has been merged with its includes.
+
+    Attributes:
+        filename: the name the file was included by
+        path: the resolved path of the file
+        bytes: the size of the file
+        keys: the number of keys in the file, counting nested dicts
+        cache: "hit" or "miss" if the file was looked up in a parse cache,
+            otherwise None
+        read_time: the time in seconds taken to read the file, or to copy it
+            out of the parse cache on a hit
+        parse_time: the time in seconds taken to parse the file, or None if
+            it was not parsed
+        merge_time: the time in seconds taken to merge the file with its
+            includes
+    """
+    kind = "file"
+
+    def __init__(self, filename, path):
+        """Inits FileEvent for the file at path, included as filename"""
+        self.filename = filename
+        self.path = path
+        self.bytes = 0
+        self.keys = 0
+        self.cache = None
+        self.read_time = 0.0
+        self.parse_time = None
+        self.merge_time = 0.0
+
+    def __str__(self):
+        return "{:s}: {:d} bytes, {:d} keys, cache {!s}, read {:.6f}s, parse {:.6f}s, merge {:.6f}s".format(
+            self.filename, self.bytes, self.keys, self.cache, self.read_time,
+            self.parse_time or 0.0, self.merge_time)
+
+    def _parse(self, filename):
+        """Reads and parses filename like cache.parse_file, timing each step"""
+        from hjsonconfig.parsers import loads
+
+        start = clock()
+        with open(filename, 'r') as f:
+            self.bytes = os.fstat(f.fileno()).st_size
+            text = f.read()
+        parsed = clock()
+        data = loads(text, filename)
+        self.read_time = parsed - start
+        self.parse_time = clock() - parsed
+        return data
+
+    def load(self, cache):
+        """Returns the parsed contents of the file, read through cache if it
+        is not None, and records how long that took"""
+        if cache is None:
+            data = self._parse(self.path)
+        else:
+            start = clock()
+            data = cache.load(self.path, parse=self._parse)
+            if self.parse_time is None:
+                self.cache = "hit"
+                self.read_time = clock() - start
+                self.bytes = os.path.getsize(self.path)
+            else:
+                self.cache = "miss"
+        self.keys = count_keys(data)
+        return data
+
+
+class LoadReport(object):
+    """A summary of loading a config and the files it includes, passed to the
+    instrument hook of an HjsonConfig after the FileEvent of each file.
+
+    Attributes:
+        filename: the root config file, or None if there is none or
+            several root files were read by load_many
+        events: the list of FileEvent objects of the files read
+        total_time: the time in seconds taken to load the whole config
+        disk_cache: "hit" or "miss" if a disk cache was used, otherwise None
+    """
+    kind = "report"
+
+    def __init__(self, filename, events, total_time, disk_cache=None):
+        self.filename = filename
+        self.events = events
+        self.total_time = total_time
+        self.disk_cache = disk_cache
+
+    @property
+    def files(self):
+        """The number of files read"""
+        return len(self.events)
+
+    @property
+    def bytes(self):
+        """The total size of the files read"""
+        return sum(e.bytes for e in self.events)
+
+    @property
+    def keys(self):
+        """The total number of keys in the files read"""
+        return sum(e.keys for e in self.events)
+
+    @property
+    def read_time(self):
+        """The total time spent reading files"""
+        return sum(e.read_time for e in self.events)
+
+    @property
+    def parse_time(self):
+        """The total time spent parsing files"""
+        return sum(e.parse_time or 0.0 for e in self.events)
+
+    @property
+    def merge_time(self):
+        """The total time spent merging files"""
+        return sum(e.merge_time for e in self.events)
+
+    @property
+    def cache_hits(self):
+        """The number of files served by the parse cache"""
+        return sum(1 for e in self.events if e.cache == "hit")
+
+    @property
+    def cache_misses(self):
+        """The number of files that missed the parse cache"""
+        return sum(1 for e in self.events if e.cache == "miss")
+
+    def as_dict(self):
+        """Returns the totals of the report as a dict, suitable for exporting
+        as metrics"""
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "keys": self.keys,
+            "read_time": self.read_time,
+            "parse_time": self.parse_time,
+            "merge_time": self.merge_time,
+            "total_time": self.total_time,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "disk_cache": self.disk_cache,
+        }
+
+    def __str__(self):
+        return ("{!s}: {:d} files, {:d} bytes, {:d} keys, parse cache {:d} hits {:d} misses, disk cache {!s}, "
+                "read {:.6f}s, parse {:.6f}s, merge {:.6f}s, total {:.6f}s").format(
+                    self.filename, self.files, self.bytes, self.keys, self.cache_hits, self.cache_misses,
+                    self.disk_cache, self.read_time, self.parse_time, self.merge_time, self.total_time)
+
+
+def print_event(event):
+    """An instrument hook that prints each event, used when verbose is set"""
+    if event.kind == "file":
+        print("HjsonConfig.instrument: Loaded {!s}".format(event))
+    else:
+        print("HjsonConfig.instrument: Load report {!s}".format(event))
+
+
+class LoggingHook(object):
+    """An instrument hook that logs each event to a logging.Logger.
+
+    Messages are only formatted if the logger is enabled for the level, so
+    the hook costs little while the logger is disabled.
+
+    Attributes:
+        logger: the logger to log to, by default the "hjsonconfig" logger
+        level: the level to log events at, by default logging.DEBUG
+    """
+    def __init__(self, logger=None, level=None):
+        import logging
+
+        self.logger = logging.getLogger("hjsonconfig") if logger is None else logger
+        self.level = logging.DEBUG if level is None else level
+
+    def __call__(self, event):
+        if self.logger.isEnabledFor(self.level):
+            if event.kind == "file":
+                self.logger.log(self.level, "Loaded %s", event)
+            else:
+                self.logger.log(self.level, "Load report %s", event)
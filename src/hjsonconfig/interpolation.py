@@ -0,0 +1,220 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import re
+
+from hjsonconfig.cache import copy_tree
+from hjsonconfig.paths import _MISSING
+from hjsonconfig.paths import compile_path
+
+# Unicode strings are a separate type on Python 2
+string_types = (str, type(u""))
+
+# A reference such as ${server.host}, or an escaped $${ that stands for ${
+_REFERENCE = re.compile(r"\$(\$?)\{([^}]*)\}")
+
+
+class InterpolationError(ValueError):
+    """Raised when a reference cannot be expanded, because the path it
+    refers to is not in the config or refers back to itself.
+
+    Attributes:
+        chain: the list of dotted paths of the values being expanded, from
+            the first to the one that failed.
+    """
+    def __init__(self, message, chain):
+        self.chain = list(chain)
+        super(InterpolationError, self).__init__("{:s}: {:s}".format(message, " -> ".join(self.chain)))
+
+
+def _parse(text):
+    """Returns the parts of a string holding references, as a list of
+    literal strings and tuples of keys"""
+    parts = []
+    end = 0
+    for match in _REFERENCE.finditer(text):
+        if match.start() > end:
+            parts.append(text[end:match.start()])
+        if match.group(1):
+            parts.append(match.group(0)[1:])
+        else:
+            parts.append(compile_path(match.group(2).strip()).keys)
+        end = match.end()
+    if end < len(text):
+        parts.append(text[end:])
+    return parts
+
+
+def _format(value):
+    """Returns the text a value is expanded to inside a longer string"""
+    if isinstance(value, string_types):
+        return value
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _child(value, key):
+    if isinstance(value, list):
+        return value[int(key)]
+    return value[key]
+
+
+class Interpolator(object):
+    """Expands ${dotted.path} references in the string values of a config.
+
+    The config is scanned once for strings holding references, and each of
+    them is expanded at most once, after the values it refers to.  Cycles of
+    references are reported.  A string that is just one reference expands to
+    the value referred to, keeping its type; references inside longer strings
+    are replaced by the text of the value.  "$${" stands for a literal "${".
+
+    Attributes:
+        config: the dict being expanded, which must not be modified while
+            the Interpolator is in use
+        templates: a dict mapping the keys of each string holding
+            references, with list indices as strings, to its parsed parts
+    """
+    def __init__(self, config):
+        """Inits Interpolator by scanning config for references"""
+        self.config = config
+        self.templates = {}
+        self._order = []
+        self._values = {}
+        self._stack = []
+        self._scan(config, ())
+
+    def _scan(self, value, prefix):
+        """Records the strings holding references in the dict or list value"""
+        items = value.items() if isinstance(value, dict) else ((str(i), v) for i, v in enumerate(value))
+        for k, v in items:
+            if isinstance(v, string_types):
+                if "${" in v:
+                    parts = _parse(v)
+                    if parts != [v]:
+                        self.templates[prefix + (k,)] = parts
+                        self._order.append(prefix + (k,))
+            elif isinstance(v, (dict, list)):
+                self._scan(v, prefix + (k,))
+
+    def _error(self, message, keys):
+        return InterpolationError(message, [".".join(k) for k in self._stack] + [".".join(keys)])
+
+    def _missing(self, keys):
+        """Returns the error for a path that is not in the config, which is a
+        KeyError unless it was referred to"""
+        if not self._stack:
+            return KeyError(".".join(keys))
+        return self._error("Reference to a missing value", keys)
+
+    def _expand(self, keys):
+        """Returns the expanded value of the string at keys"""
+        try:
+            return self._values[keys]
+        except KeyError:
+            pass
+        if keys in self._stack:
+            raise self._error("Reference cycle", keys)
+        self._stack.append(keys)
+        try:
+            parts = self.templates[keys]
+            if len(parts) == 1 and isinstance(parts[0], tuple):
+                value = self.resolve(parts[0])
+            else:
+                value = u"".join(_format(self.resolve(p)) if isinstance(p, tuple) else p for p in parts)
+        finally:
+            self._stack.pop()
+        self._values[keys] = value
+        return value
+
+    def resolve(self, keys):
+        """Returns the expanded value at the path keys.  Dicts and lists are
+        returned as expanded copies, which must not be modified.
+
+        Raises:
+            KeyError: if the path is not in the config.
+            InterpolationError: if a reference it depends on is to a missing
+                value, or refers to itself.
+        """
+        keys = tuple(str(k) for k in keys)
+        try:
+            return self._values[keys]
+        except KeyError:
+            pass
+        if keys in self.templates:
+            return self._expand(keys)
+        value = self.config
+        for i, key in enumerate(keys):
+            if keys[:i] in self.templates:
+                # The path goes through a reference to a dict or list
+                return self._lookup(self._expand(keys[:i]), keys[i:], keys)
+            try:
+                value = _child(value, key)
+            except (KeyError, IndexError, ValueError, TypeError):
+                raise self._missing(keys)
+        if isinstance(value, (dict, list)):
+            value = self._expanded_copy(value, keys)
+        self._values[keys] = value
+        return value
+
+    def _lookup(self, value, keys, path):
+        try:
+            for key in keys:
+                value = _child(value, key)
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise self._missing(path)
+        return value
+
+    def _expanded_copy(self, value, keys):
+        """Returns a copy of the dict or list value at keys, with the strings
+        in it expanded"""
+        value = copy_tree(value)
+        n = len(keys)
+        for path in self._order:
+            if len(path) > n and path[:n] == keys:
+                self._set(value, path[n:], copy_tree(self._expand(path)))
+        return value
+
+    @staticmethod
+    def _set(value, keys, item):
+        for key in keys[:-1]:
+            value = _child(value, key)
+        if isinstance(value, list):
+            value[int(keys[-1])] = item
+        else:
+            value[keys[-1]] = item
+
+    def get(self, path, default=_MISSING):
+        """Returns the expanded value at a dotted key path, expanding only the
+        references it depends on
+
+        Args:
+            path: a dotted path, or a tuple of keys
+            default: the value to return if the path is not present.  If not
+                given, a KeyError is raised instead.
+        """
+        try:
+            return self.resolve(compile_path(path).keys)
+        except KeyError:
+            if default is _MISSING:
+                raise
+            return default
+
+    def expand(self):
+        """Replaces every string holding references in the config with its
+        expanded value, and returns the config"""
+        values = [(keys, self._expand(keys)) for keys in self._order]
+        for keys, value in values:
+            self._set(self.config, keys, copy_tree(value))
+        return self.config
+
+
+def interpolate(config):
+    """Expands every reference in config in place, and returns config
+
+    Raises:
+        InterpolationError: if a reference is to a missing value, or refers
+            to itself.
+    """
+    return Interpolator(config).expand()
@@ -0,0 +1,299 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import OrderedDict
+
+from hjsonconfig.graph import IncludeGraph
+from hjsonconfig.hjsonconfig import HjsonConfig
+from hjsonconfig.merging import MergeError
+from hjsonconfig.merging import copy_dicts
+from hjsonconfig.merging import merge_into
+from hjsonconfig.paths import _MISSING
+from hjsonconfig.paths import compile_path
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:  # Python 2
+    from collections import MutableMapping
+
+# Marks a key deleted from a view, hiding it in the layers below
+_DELETED = object()
+
+
+class _Group(object):
+    """Layers that are merged together before being merged with the layers
+    below them, such as a file and its includes.  Merging is not associative
+    where None or a non-dict value is overwritten by a dict, so the grouping
+    of the files in the include tree has to be kept."""
+    __slots__ = ("layers",)
+
+    def __init__(self, layers):
+        self.layers = layers
+
+
+def leaves(layers):
+    """Yields the dicts in layers, lowest priority first"""
+    for layer in layers:
+        if isinstance(layer, _Group):
+            for leaf in leaves(layer.layers):
+                yield leaf
+        else:
+            yield layer
+
+
+def resolve(layers, key, path=""):
+    """Returns the merged value at key of layers, without merging any dicts.
+
+    Args:
+        layers: a list of dicts and groups of layers, lowest priority first
+        key: the key to look up
+        path: the path of layers, used in errors
+
+    Returns:
+        _MISSING if key is not in layers, a _Group of the layers to merge if
+        the value is a dict, otherwise the value.
+
+    Raises:
+        MergeError: if a dict is merged on to a value that is not a dict.
+    """
+    found = []
+    for layer in reversed(layers):
+        if isinstance(layer, _Group):
+            value = resolve(layer.layers, key, path)
+            if value is _MISSING:
+                continue
+        elif key in layer:
+            value = layer[key]
+        else:
+            continue
+        if isinstance(value, (dict, _Group)):
+            found.append(value)
+        elif not found:
+            return value
+        elif value is None:
+            break
+        else:
+            raise MergeError(path + "/" + key, value)
+    if not found:
+        return _MISSING
+    found.reverse()
+    return _Group(found)
+
+
+def merge_layers(layers, path=""):
+    """Returns the merged contents of layers as a new OrderedDict"""
+    out = OrderedDict()
+    for layer in layers:
+        if isinstance(layer, _Group):
+            layer = merge_layers(layer.layers, path)
+        else:
+            layer = copy_dicts(layer)
+        merge_into(out, layer, path)
+    return out
+
+
+def file_layers(graph, key, memo=None):
+    """Returns the layers that merge to the contents of a file and its
+    includes, lowest priority first.
+
+    The last layer is the parsed contents of the file, with its "config-file"
+    entry moved to "imported-config-file" as import_config_files does, and the
+    layers before it are a group for each file it includes.
+
+    Args:
+        graph: an IncludeGraph holding the file and its includes
+        key: the key of the file in graph
+    """
+    if memo is None:
+        memo = {}
+    layers = []
+    for child in graph.edges[key]:
+        if child not in memo:
+            memo[child] = _Group(file_layers(graph, child, memo))
+        layers.append(memo[child])
+    data = graph.nodes[key]
+    config_file = data.get("config-file")
+    if config_file is not None:
+        data = OrderedDict(data)
+        data["config-file"] = None
+        try:
+            data["imported-config-file"] = data["imported-config-file"] + [config_file]
+        except KeyError:
+            data["imported-config-file"] = [config_file]
+    layers.append(data)
+    return layers
+
+
+class LayeredConfig(MutableMapping):
+    """A read-mostly view of a config file and its includes, which keeps the
+    parsed contents of each file as a separate layer instead of merging them.
+
+    Looking up a key searches the layers from the top down, and a dict that
+    is present in several layers is returned as a LayeredConfig over just
+    those dicts, so nothing is merged until it is needed.  The includes of
+    each file are kept as a group of layers below it.  The values seen
+    are the same as in an HjsonConfig read from the same file, and keys are
+    in the same order.  As the layers are merged lazily, an error merging a
+    dict on to a value that is not a dict is raised when the key is looked
+    up rather than when the file is read.
+
+    Setting or deleting a key in a nested view first merges that view in to
+    a plain dict in its parent, so writes behave as they do on an
+    HjsonConfig.  Call flatten() to merge everything in to an HjsonConfig.
+
+    Attributes:
+        filename: the config file the view was read from
+        layers: the list of dicts, and groups of layers, being viewed,
+            lowest priority first
+    """
+    def __init__(self, filename, **kwds):
+        """Inits LayeredConfig by reading filename and the files it includes.
+        Other keyword arguments are passed on to HjsonConfig, and set the
+        options used to read the files.
+
+        Raises:
+            IncludeCycleError: if a config file includes itself.
+            ValueError: if a merge_schema is given, as jsonmerge strategies
+                cannot be applied lazily, or a schema, interpolate or
+                provenance, which need the merged config.
+        """
+        options = HjsonConfig(**kwds)
+        if options.merge_schema is not None:
+            raise ValueError("LayeredConfig does not support merge schemas")
+        if options.schema is not None:
+            raise ValueError("LayeredConfig does not support schemas")
+        if options.interpolate:
+            raise ValueError("LayeredConfig does not support interpolation")
+        if options.provenance:
+            raise ValueError("LayeredConfig does not support provenance")
+        graph = IncludeGraph(options)
+        keys = graph.add([filename])
+        graph.order(keys)
+        layers = file_layers(graph, keys[0])
+        if options.overrides:
+            # The overrides are a sparse layer on top of the files
+            from hjsonconfig.overrides import apply_overrides
+
+            layers.append(apply_overrides(OrderedDict(), options.overrides))
+        self._init(layers, options, "")
+        self.filename = filename
+
+    def _init(self, layers, options, path, parent=None, key=None):
+        self.filename = None
+        self.layers = layers
+        self._options = options
+        self._path = path
+        self._parent = parent
+        self._key = key
+        self._local = OrderedDict()
+        self._children = {}
+
+    def _child(self, key, layers):
+        """Returns the view of the dicts at key in layers"""
+        try:
+            return self._children[key]
+        except KeyError:
+            pass
+        child = LayeredConfig.__new__(LayeredConfig)
+        child._init(layers, self._options, self._path + "/" + key, self, key)
+        self._children[key] = child
+        return child
+
+    def __repr__(self):
+        return "LayeredConfig({!r}, {:d} layers)".format(self.filename or self._path, len(self.layers))
+
+    def __getitem__(self, key):
+        try:
+            value = self._local[key]
+        except KeyError:
+            pass
+        else:
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+
+        value = resolve(self.layers, key, self._path)
+        if value is _MISSING:
+            raise KeyError(key)
+        if isinstance(value, _Group):
+            return self._child(key, value.layers)
+        return value
+
+    def __contains__(self, key):
+        try:
+            return self._local[key] is not _DELETED
+        except KeyError:
+            return any(key in layer for layer in leaves(self.layers))
+
+    def __iter__(self):
+        local = self._local
+        seen = set()
+        for layer in leaves(self.layers):
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    if local.get(key) is not _DELETED:
+                        yield key
+        for key, value in local.items():
+            if key not in seen and value is not _DELETED:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def _merged(self):
+        """Returns the merged contents of this view as a new OrderedDict"""
+        out = merge_layers(self.layers, self._path)
+        for key, value in self._local.items():
+            if value is _DELETED:
+                out.pop(key, None)
+            else:
+                out[key] = value
+        return out
+
+    def _materialize(self):
+        """Replaces the layers of a nested view by a plain dict, stored in
+        its parent, so that it can be modified"""
+        if self._parent is not None and self.layers:
+            merged = self._merged()
+            self._parent[self._key] = merged
+            self.layers = []
+            self._local = merged
+
+    def __setitem__(self, key, value):
+        self._materialize()
+        self._children.pop(key, None)
+        self._local[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._materialize()
+        self._children.pop(key, None)
+        if any(key in layer for layer in leaves(self.layers)):
+            self._local[key] = _DELETED
+        else:
+            del self._local[key]
+
+    def get_path(self, path, default=_MISSING):
+        """Returns the value at a dotted key path such as "server.pool.size"
+
+        Args:
+            path: a dotted path, or a tuple of keys
+            default: the value to return if the path is not present.  If not
+                given, a KeyError is raised instead.
+        """
+        return compile_path(path).get(self, default)
+
+    def flatten(self):
+        """Merges the layers of this view
+
+        Returns:
+            An HjsonConfig object with the same contents as this view.
+        """
+        config = self._options._new_config()
+        config._copy_in(self._merged())
+        config.filename = self.filename
+        return config
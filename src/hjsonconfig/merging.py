@@ -0,0 +1,98 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import OrderedDict
+
+from hjsonconfig.includes import LazyInclude
+
+
+class MergeError(ValueError):
+    """Raised when a dict in head is merged on to a value in base that is not
+    a dict.  This matches the behaviour of jsonmerge's objectMerge strategy."""
+    def __init__(self, path, base):
+        self.path = path
+        self.base = base
+        super(MergeError, self).__init__(
+            "Cannot merge a dict on to a non-dict value at {:s}: {!r}".format(path or "<root>", base))
+
+
+def copy_dicts(value):
+    """Returns value with every dict in it replaced by a new hjson.OrderedDict.
+    Lists and scalar values are shared with value, as they are by jsonmerge.
+    Includes that have not been loaded yet are copied without loading them,
+    and loaded includes are copied as loaded LazyIncludes, so that the files
+    they were read from are still known.
+
+    Args:
+        value: a parsed hjson value
+
+    Returns:
+        A copy of value that shares no dicts with value.
+    """
+    if isinstance(value, dict):
+        if isinstance(value, LazyInclude):
+            if value.pending:
+                return value.copy_pending()
+            return value.copy_loaded((k, copy_dicts(v)) for k, v in value.items())
+        return OrderedDict((k, copy_dicts(v)) for k, v in value.items())
+    return value
+
+
+def merge_values(base, head, _path=""):
+    """Merges head on to base, without modifying either of them.
+
+    Dicts are merged recursively and every other value in head, including
+    lists and None, overwrites the value in base.  Keys from base come first
+    in the output, followed by keys that are only in head.
+
+    Args:
+        base: the value to merge on to
+        head: the value to merge on to base
+
+    Returns:
+        The merged value, which shares no dicts with base or head.
+    """
+    if not isinstance(head, dict):
+        return head
+    if base is None:
+        return copy_dicts(head)
+    if not isinstance(base, dict):
+        raise MergeError(_path, base)
+
+    out = OrderedDict()
+    for k, v in base.items():
+        if k in head:
+            out[k] = merge_values(v, head[k], _path + "/" + k)
+        else:
+            out[k] = copy_dicts(v)
+    for k, v in head.items():
+        if k not in out:
+            out[k] = copy_dicts(v)
+    return out
+
+
+def merge_into(base, head, _path=""):
+    """Merges head in to base in place, with the same semantics as merge_values.
+
+    This avoids copying anything, so base must be owned by the caller, and
+    dicts from head may end up shared with base.
+
+    Args:
+        base: a dict to merge on to, which will be modified
+        head: a dict to merge on to base
+
+    Returns:
+        base
+    """
+    for k, v in head.items():
+        if isinstance(v, dict):
+            b = base.get(k)
+            if isinstance(b, dict):
+                merge_into(b, v, _path + "/" + k)
+                continue
+            if b is not None:
+                raise MergeError(_path + "/" + k, b)
+        base[k] = v
+    return base
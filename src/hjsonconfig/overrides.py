@@ -0,0 +1,139 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+from collections import OrderedDict
+from collections import namedtuple
+
+from hjsonconfig.merging import MergeError
+from hjsonconfig.merging import copy_dicts
+from hjsonconfig.merging import merge_into
+from hjsonconfig.paths import compile_path
+
+# Environment variables starting with this prefix override config values.
+# The rest of the name is the key path, with keys separated by "__".
+ENV_PREFIX = "HJSONCONFIG__"
+
+# A value to merge in at a key path, after the config files have been merged.
+#   keys: a tuple of the keys of the path
+#   value: the value, merged on to the value at keys as by merge()
+#   source: a description of where the override came from, such as the
+#       name of an environment variable, which origin() reports
+Override = namedtuple("Override", "keys value source")
+
+
+def parse_value(text):
+    """Returns the typed value of an override given as text.  Text that is
+    valid JSON, such as 64, true, null or [1, 2], is decoded, and anything
+    else is used as a string.  Quote a string that looks like another type,
+    such as "64", to keep it a string."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def from_environ(environ=None, prefix=ENV_PREFIX):
+    """Returns the overrides set by environment variables such as
+    HJSONCONFIG__server__pool__size=64, sorted by name
+
+    Args:
+        environ: a dict of environment variables, or None for os.environ
+        prefix: the prefix of the names of the variables to use
+    """
+    if environ is None:
+        environ = os.environ
+    return [Override(tuple(name[len(prefix):].split("__")), parse_value(value), "$" + name)
+            for name, value in sorted(environ.items()) if name.startswith(prefix) and len(name) > len(prefix)]
+
+
+def parse_assignment(text, source=None):
+    """Returns the override given by an assignment such as
+    "server.pool.size=64"
+
+    Raises:
+        ValueError: if text does not contain "=".
+    """
+    path, sep, value = text.partition("=")
+    if not sep or not path.strip():
+        raise ValueError("Expected an override of the form path=value: {!r}".format(text))
+    path = path.strip()
+    return Override(compile_path(path).keys, parse_value(value), source or "--set " + path)
+
+
+def from_args(args):
+    """Returns the overrides given by "--set path=value" and
+    "--set=path=value" arguments in a list of command line arguments.
+    Other arguments are ignored."""
+    overrides = []
+    args = list(args)
+    for i, arg in enumerate(args):
+        if arg == "--set" and i + 1 < len(args):
+            overrides.append(parse_assignment(args[i + 1]))
+        elif arg.startswith("--set="):
+            overrides.append(parse_assignment(arg[len("--set="):]))
+    return overrides
+
+
+def as_overrides(overrides):
+    """Returns a list of Override tuples from a dict mapping key paths to
+    values, or a list of Override tuples or (path, value) pairs"""
+    if not overrides:
+        return []
+    if isinstance(overrides, dict):
+        overrides = overrides.items()
+    out = []
+    for override in overrides:
+        if not isinstance(override, Override):
+            path, value = override
+            override = Override(compile_path(path).keys, value, "overrides")
+        out.append(override)
+    return out
+
+
+def _path(keys):
+    return "".join("/" + str(k) for k in keys)
+
+
+def apply_overrides(config, overrides, origins=None):
+    """Merges overrides in to config in place, in order, walking only the
+    key paths they set.  Each value is merged as merge() would merge a dict
+    holding just that path: missing or None dicts along the path are
+    created, and a dict value is merged on to a dict already there.
+
+    Args:
+        config: a dict owned by the caller
+        overrides: a list of Override tuples
+        origins: the Origins of config, to record the sources of the
+            overrides in, or None
+
+    Returns:
+        config
+
+    Raises:
+        MergeError: if a key along a path, or a dict value, is set on a
+            value that is not a dict.
+    """
+    for keys, value, source in overrides:
+        d = config
+        for i, key in enumerate(keys[:-1]):
+            v = d.get(key)
+            if v is None:
+                v = d[key] = OrderedDict()
+            elif not isinstance(v, dict):
+                raise MergeError(_path(keys[:i + 1]), v)
+            d = v
+        key = keys[-1]
+        base = d.get(key)
+        if isinstance(value, dict) and base is not None:
+            if not isinstance(base, dict):
+                raise MergeError(_path(keys), base)
+            merge_into(base, copy_dicts(value), _path(keys))
+        else:
+            d[key] = copy_dicts(value)
+        if origins is not None:
+            origins.override(keys, value, source)
+    return config
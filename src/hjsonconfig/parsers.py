@@ -0,0 +1,140 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+from collections import OrderedDict
+
+from hjsonconfig.cache import copy_tree
+
+DEFAULT_PARSER = "hjson"
+
+# The loads function of each parser, by name, and the parser of each file
+# extension.  Files with other extensions are parsed by DEFAULT_PARSER.
+_PARSERS = {}
+_EXTENSIONS = {}
+
+
+def _reject_constant(name):
+    raise ValueError("{:s} is not valid JSON".format(name))
+
+
+def _parse_float(text):
+    """Parses a JSON number with a fraction or exponent as hjson does, which
+    returns whole numbers below 1e10 as ints"""
+    value = float(text)
+    if int(value) == value and abs(value) < 1e10:
+        return int(value)
+    return value
+
+
+def _loads_strict_json(text):
+    """Parses strict JSON with the C decoder of the json module, giving the
+    same values as hjson.  NaN and Infinity, which hjson reads as strings,
+    are rejected."""
+    return json.loads(text, object_pairs_hook=OrderedDict, parse_float=_parse_float, parse_constant=_reject_constant)
+
+
+def loads_hjson(text):
+    """Parses hjson text.  Text that looks like a JSON object is parsed as
+    strict JSON first, which is many times faster, and falls back to the
+    hjson parser if it is not strict JSON."""
+    if text.lstrip()[:1] == "{":
+        try:
+            return _loads_strict_json(text)
+        except (ValueError, OverflowError):
+            pass
+    import hjson
+
+    return hjson.loads(text)
+
+
+def loads_json(text):
+    """Parses JSON text, falling back to the hjson parser for files that use
+    hjson syntax, such as comments, despite their extension"""
+    try:
+        return _loads_strict_json(text)
+    except (ValueError, OverflowError):
+        import hjson
+
+        return hjson.loads(text)
+
+
+def loads_toml(text):
+    """Parses TOML text with tomllib, or the tomli package before Python 3.11
+
+    Raises:
+        ImportError: if neither is available.
+    """
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ImportError("Parsing .toml config files needs the tomli package before Python 3.11")
+    return copy_tree(tomllib.loads(text))
+
+
+def loads_yaml(text):
+    """Parses YAML text with the safe loader of PyYAML, using its C version
+    if it was built
+
+    Raises:
+        ImportError: if PyYAML is not installed.
+    """
+    try:
+        import yaml
+    except ImportError:
+        raise ImportError("Parsing .yaml config files needs the PyYAML package")
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return copy_tree(yaml.load(text, Loader=loader))
+
+
+def register_parser(name, loads, extensions=()):
+    """Registers a parser for config files, replacing any parser of the same
+    name, and makes it the parser of files with the given extensions.
+
+    Files are parsed in threads when a config has more than one worker, so
+    loads may be called concurrently.  Only HjsonConfig.load_many with
+    processes=True parses files in worker processes.  Only then must loads
+    be a picklable function defined at module level, registered on import
+    of a module the workers import, as worker processes that are spawned
+    rather than forked do not see parsers registered at run time.
+
+    Args:
+        name: the name of the parser
+        loads: a function taking the text of a file and returning its parsed
+            contents, with dicts as OrderedDict objects
+        extensions: the file extensions, such as ".ini", of files to parse
+            with it
+    """
+    _PARSERS[name] = loads
+    for extension in extensions:
+        _EXTENSIONS[extension.lower()] = name
+
+
+def parser_for(filename):
+    """Returns the name of the parser for a file, chosen by its extension"""
+    return _EXTENSIONS.get(os.path.splitext(filename)[1].lower(), DEFAULT_PARSER)
+
+
+def loads(text, filename=""):
+    """Parses the text of a config file with the parser for its extension
+
+    Args:
+        text: the contents of the file
+        filename: the name of the file
+
+    Returns:
+        The parsed contents, with dicts as OrderedDict objects.
+    """
+    return _PARSERS[parser_for(filename)](text)
+
+
+register_parser("hjson", loads_hjson, (".hjson",))
+register_parser("json", loads_json, (".json",))
+register_parser("toml", loads_toml, (".toml",))
+register_parser("yaml", loads_yaml, (".yaml", ".yml"))
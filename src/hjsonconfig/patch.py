@@ -0,0 +1,188 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from collections import OrderedDict
+from collections import namedtuple
+
+from hjsonconfig.frozen import FrozenConfig
+from hjsonconfig.frozen import thaw
+from hjsonconfig.merging import copy_dicts
+
+_MAPPINGS = (dict, FrozenConfig)
+_CONTAINERS = _MAPPINGS + (list, tuple)
+# The types of parsed values that are not containers, which are checked
+# first as isinstance checks against FrozenConfig are slow
+_SCALARS = frozenset(type(v) for v in (u"", "", 0, 1 << 64, 0.0, True, None))
+_UNKNOWN = object()
+
+
+class Change(namedtuple("Change", "op keys value")):
+    """One change between two configs.
+
+    Attributes:
+        op: "set" if the value at keys was added or replaced by value,
+            "delete" if it was removed, or "order" if the keys of the dict at
+            keys were reordered to the tuple value.
+        keys: a tuple of the keys of the path, which is () for the whole config
+        value: the new value for "set", the new key order for "order", or
+            None for "delete"
+    """
+    __slots__ = ()
+
+    @property
+    def path(self):
+        """The dotted key path of the change"""
+        return ".".join(str(k) for k in self.keys)
+
+
+def _digest(value, digests):
+    """Returns a hash of a dict or list built from the hashes and types of
+    its items, or None if it holds values that can't be hashed.  Hashes are
+    memoized in digests by id, so each subtree is only hashed once however
+    deep the diff goes.  Key order is part of the hash of a dict, and the
+    types of scalars are too, as 1, 1.0 and True hash alike."""
+    digest = digests.get(id(value), _UNKNOWN)
+    if digest is not _UNKNOWN:
+        return digest
+    if isinstance(value, _MAPPINGS):
+        keys = tuple(value.keys())
+        values = tuple(value.values())
+    else:
+        keys = None
+        values = tuple(value)
+    types = tuple(map(type, values))
+    if not _SCALARS.issuperset(types):
+        # Nested dicts and lists are replaced by their own hashes
+        types = tuple(t if t in _SCALARS else None for t in types)
+        values = tuple(v if t is not None or not isinstance(v, _CONTAINERS) else _digest(v, digests)
+                       for v, t in zip(values, types))
+    try:
+        digest = hash((keys, values, types))
+    except TypeError:
+        digest = None
+    digests[id(value)] = digest
+    return digest
+
+
+def _same(a, b, digests):
+    """Returns True if a and b are equal and their scalars have the same
+    types.  Dicts and lists with different hashes are known to differ
+    without being walked, so only equal subtrees are compared, once each.
+    Frozen configs with different cached hashes are known to differ too."""
+    if a is b:
+        return True
+    if isinstance(a, _CONTAINERS) and isinstance(b, _CONTAINERS):
+        if isinstance(a, FrozenConfig) and isinstance(b, FrozenConfig) and hash(a) != hash(b):
+            return False
+        digest = _digest(a, digests)
+        other = _digest(b, digests)
+        if digest is not None and other is not None and digest != other:
+            return False
+        return a == b
+    return type(a) is type(b) and a == b
+
+
+def _diff(a, b, prefix, changes, digests):
+    for k, v in a.items():
+        if k not in b:
+            changes.append(Change("delete", prefix + (k,), None))
+            continue
+        w = b[k]
+        if _same(v, w, digests):
+            continue
+        if isinstance(v, _MAPPINGS) and isinstance(w, _MAPPINGS):
+            _diff(v, w, prefix + (k,), changes, digests)
+        else:
+            changes.append(Change("set", prefix + (k,), w))
+    added = [k for k in b if k not in a]
+    for k in added:
+        changes.append(Change("set", prefix + (k,), b[k]))
+    # Patching leaves kept keys in their old order, with added keys after them
+    order = tuple(b.keys())
+    if [k for k in a if k in b] + added != list(order):
+        changes.append(Change("order", prefix, order))
+
+
+def diff(a, b):
+    """Returns the changes that turn config a in to config b.
+
+    The hash of each subtree is computed once per call, and subtrees with
+    different hashes are known to differ, so only subtrees that are equal
+    are compared in full, and each only once.  Frozen configs cache their
+    hashes, so diffing two frozen configs mostly compares hashes.  Dicts in
+    both configs are compared key by key, so only the innermost changed
+    paths are listed.
+
+    Args:
+        a: an HjsonConfig, OrderedDict or FrozenConfig object
+        b: an HjsonConfig, OrderedDict or FrozenConfig object
+
+    Returns:
+        A list of Change tuples, which apply_patch applies to a copy of a to
+        make it equal to b.
+    """
+    if not (isinstance(a, _MAPPINGS) and isinstance(b, _MAPPINGS)):
+        return [] if _same(a, b, {}) else [Change("set", (), b)]
+    changes = []
+    digests = {}
+    if not _same(a, b, digests):
+        _diff(a, b, (), changes, digests)
+    return changes
+
+
+def _copy(value):
+    if isinstance(value, (FrozenConfig, tuple)):
+        return thaw(value)
+    return copy_dicts(value)
+
+
+def _reorder(d, keys):
+    """Moves the keys of d in to the order of keys"""
+    if hasattr(d, "move_to_end"):
+        for k in keys:
+            d.move_to_end(k)
+    else:
+        items = [(k, d.pop(k)) for k in keys]
+        for k, v in items:
+            d[k] = v
+
+
+def apply_patch(config, changes):
+    """Applies the changes returned by diff to config in place, touching only
+    the paths that changed.  Missing dicts along a path are created.  The
+    values set are copies, so config shares no dicts with the changes.
+
+    Args:
+        config: a mutable dict, such as an HjsonConfig object
+        changes: a list of Change tuples
+
+    Returns:
+        config
+
+    Raises:
+        ValueError: if a change has an unknown op.
+    """
+    for op, keys, value in changes:
+        if op not in ("set", "delete", "order"):
+            raise ValueError("Unknown patch operation {!r}".format(op))
+        parent = keys if op == "order" else keys[:-1]
+        d = config
+        for key in parent:
+            if key not in d:
+                d[key] = OrderedDict()
+            d = d[key]
+        if op == "order":
+            _reorder(d, value)
+        elif not keys:
+            config.clear()
+            config.update(_copy(value))
+        elif op == "set":
+            d[keys[-1]] = _copy(value)
+        else:
+            del d[keys[-1]]
+    invalidate = getattr(config, "invalidate", None)
+    if invalidate is not None:
+        invalidate()
+    return config
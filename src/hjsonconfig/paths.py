@@ -0,0 +1,113 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+
+_MISSING = object()
+
+
+class CompiledPath(object):
+    """A dotted key path such as "server.pool.size", split in to its keys
+    once so that it can be looked up quickly in many configs.
+
+    When the config is an HjsonConfig object, the values found are memoized
+    in the config until it is next modified.  Integer keys index in to lists.
+
+    Attributes:
+        path: the dotted path
+        keys: a tuple of the keys in path
+    """
+    __slots__ = ("path", "keys")
+
+    def __init__(self, path):
+        """Inits CompiledPath from a dotted path, or a list or tuple of keys"""
+        if isinstance(path, (list, tuple)):
+            self.keys = tuple(path)
+            self.path = ".".join(str(k) for k in self.keys)
+        else:
+            self.keys = tuple(path.split("."))
+            self.path = path
+
+    def __repr__(self):
+        return "CompiledPath({!r})".format(self.path)
+
+    def lookup(self, config):
+        """Returns the value at this path in config, without memoizing it
+
+        Raises:
+            KeyError: if the path is not present in config.
+        """
+        value = config
+        try:
+            for key in self.keys:
+                if isinstance(value, (list, tuple)):
+                    value = value[int(key)]
+                else:
+                    value = value[key]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise KeyError(self.path)
+        return value
+
+    def get(self, config, default=_MISSING):
+        """Returns the value at this path in config
+
+        Args:
+            config: an HjsonConfig or other mapping
+            default: the value to return if the path is not present.  If not
+                given, a KeyError is raised instead.
+        """
+        # A memoized value costs one attribute and one dict lookup
+        try:
+            return config._paths[self.keys]
+        except (AttributeError, KeyError):
+            pass
+        memo = getattr(config, "_paths", None)
+        if memo is None:
+            try:
+                return self.lookup(config)
+            except KeyError:
+                if default is _MISSING:
+                    raise
+                return default
+
+        generation = config.generation
+        try:
+            value = self.lookup(config)
+        except KeyError:
+            if default is _MISSING:
+                raise
+            return default
+        # Don't memoize a value read while the config was being modified
+        if config.generation == generation:
+            memo[self.keys] = value
+        return value
+
+    __call__ = get
+
+
+# Compiled paths are kept for reuse by get_path, up to _MAX_COMPILED paths
+_MAX_COMPILED = 4096
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def compile_path(path):
+    """Returns the CompiledPath for path, reusing it if path has been
+    compiled before.
+
+    Args:
+        path: a dotted path, or a tuple of keys
+    """
+    try:
+        return _compiled[path]
+    except (KeyError, TypeError):
+        pass
+    compiled = CompiledPath(path)
+    if isinstance(path, (str, tuple)):
+        with _compiled_lock:
+            if len(_compiled) >= _MAX_COMPILED:
+                _compiled.clear()
+            _compiled[path] = compiled
+    return compiled
@@ -0,0 +1,184 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from hjsonconfig.includes import LazyInclude
+from hjsonconfig.paths import compile_path
+
+try:
+    from sys import intern
+except ImportError:  # Python 2, where intern is a builtin
+    pass
+
+
+class IncludeTree(dict):
+    """The origin tree of a nested include.  The values read by the include
+    are looked up in the Origins it records when it is loaded, so the tree
+    only holds the entries merged on to it from other files.
+
+    Attributes:
+        file_id: the id of the file containing the include, or None if the
+            include was merged with another one, so its origins are unknown.
+    """
+    def __init__(self, file_id, entries=()):
+        dict.__init__(self, entries)
+        self.file_id = file_id
+
+
+def origin_tree(data, file_id):
+    """Returns the origin tree of data, read from the file with id file_id.
+
+    An origin tree maps each key of a dict to a (file_id, children) tuple,
+    where children is the origin tree of the value if it is a dict and
+    otherwise None.  Includes are not loaded; their children are an empty
+    IncludeTree.
+    """
+    tree = {}
+    for k, v in data.items():
+        if isinstance(v, LazyInclude):
+            tree[k] = (file_id, IncludeTree(file_id))
+        elif isinstance(v, dict):
+            tree[k] = (file_id, origin_tree(v, file_id))
+        else:
+            tree[k] = (file_id, None)
+    return tree
+
+
+def _merged_children(base, head):
+    """Returns a copy of the children base, to merge the children head on
+    to.  A dict merged on to an include is merged in to the include, but an
+    include merged on to a dict is copied in to the dict, so the origins of
+    its values are lost."""
+    if isinstance(base, IncludeTree):
+        return IncludeTree(None if isinstance(head, IncludeTree) else base.file_id, base)
+    if isinstance(head, IncludeTree):
+        return IncludeTree(None, base)
+    return dict(base)
+
+
+def merge_trees(base, head):
+    """Merges the origin tree head in to base, following the merge of the
+    dicts they describe, and returns base.  Nested trees are shared between
+    trees, so they are copied before being modified."""
+    for k, node in head.items():
+        b = base.get(k)
+        if node[1] is not None and b is not None and b[1] is not None:
+            base[k] = (node[0], merge_trees(_merged_children(b[1], node[1]), node[1]))
+        else:
+            base[k] = node
+    return base
+
+
+class Origins(object):
+    """A table of the config file that set each value in a config.
+
+    Attributes:
+        files: a tuple of the names of the config files, indexed by file id.
+            The name of an in-memory config is None.
+        table: a dict mapping each key path, as a tuple of interned keys, to
+            the id of the file that set it, shifted left by one bit, with the
+            low bit set if the value is a dict.
+        includes: a dict mapping the key path of each nested include to the
+            id of the file containing it, or None if that is not known.  The
+            values read by an include are looked up in its own origins.
+    """
+    __slots__ = ("files", "table", "includes")
+
+    def __init__(self, files, tree):
+        """Inits Origins from a list of file names and an origin tree"""
+        self.files = tuple(files)
+        self.table = {}
+        self.includes = {}
+        self._add(tree, ())
+
+    def _add(self, tree, prefix):
+        for k, (file_id, children) in tree.items():
+            path = prefix + (intern(k) if isinstance(k, str) else k,)
+            if children is None:
+                self.table[path] = file_id << 1
+            else:
+                self.table[path] = file_id << 1 | 1
+                if isinstance(children, IncludeTree):
+                    self.includes[path] = children.file_id
+                self._add(children, path)
+
+    def _in_include(self, keys):
+        """Returns True if keys is a path below a nested include"""
+        return any(keys[:i] in self.includes for i in range(1, len(keys)))
+
+    def override(self, keys, value, name):
+        """Records that value was merged in at the key path keys from name,
+        as apply_overrides does"""
+        self.files += (name,)
+        file_id = len(self.files) - 1
+        keys = tuple(intern(k) if isinstance(k, str) else k for k in keys)
+        # Dicts below a nested include are attributed by its own origins
+        for i in range(1, len(keys)):
+            if keys[:i] in self.includes:
+                break
+            entry = self.table.get(keys[:i])
+            if entry is None or not entry & 1:
+                self.table[keys[:i]] = file_id << 1 | 1
+        entry = self.table.get(keys)
+        if isinstance(value, dict):
+            if (entry is None or not entry & 1) and not self._in_include(keys):
+                self.table[keys] = file_id << 1 | 1
+            self._add(origin_tree(value, file_id), keys)
+        else:
+            n = len(keys)
+            if entry is not None and entry & 1:
+                for path in [p for p in self.table if len(p) > n and p[:n] == keys]:
+                    del self.table[path]
+            for path in [p for p in self.includes if p[:n] == keys]:
+                del self.includes[path]
+            self.table[keys] = file_id << 1
+
+    def __len__(self):
+        return len(self.table)
+
+    def origin(self, path, config=None):
+        """Returns the name of the file that set the value at path.  Paths in
+        to lists are attributed to the file that set the list.
+
+        Args:
+            path: a dotted path, or a tuple of keys
+            config: the config these are the origins of, in which nested
+                includes are looked up, and loaded if they are pending
+
+        Raises:
+            KeyError: if path is not present in the config.
+            ValueError: if path is below a nested include whose origins were
+                not recorded.
+        """
+        keys = compile_path(path).keys
+        entry = self.table.get(keys)
+        if entry is not None:
+            return self.files[entry >> 1]
+        for i in range(len(keys) - 1, 0, -1):
+            if keys[:i] in self.includes:
+                return self._include_origin(keys[:i], keys[i:], config)
+            # Look for a list that the path indexes in to
+            entry = self.table.get(keys[:i])
+            if entry is not None and not entry & 1:
+                return self.files[entry >> 1]
+        raise KeyError(compile_path(path).path)
+
+    def _include_origin(self, prefix, keys, config):
+        """Returns the name of the file that set the value at keys in the
+        nested include at prefix"""
+        include = config
+        try:
+            for key in prefix:
+                include = include[key]
+        except (KeyError, IndexError, TypeError):
+            include = None
+        file_id = self.includes[prefix]
+        if isinstance(include, LazyInclude):
+            include.load()
+            if include.origins is not None and file_id is not None:
+                name = include.origins.origin(keys, include)
+                # The entries of the include itself are set by the file containing it
+                return self.files[file_id] if name is None else name
+        raise ValueError("The origin of {:s} is not known, as it was read by a nested include "
+                         "whose origins were not recorded".format(compile_path(prefix + keys).path))
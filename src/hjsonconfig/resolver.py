@@ -0,0 +1,102 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+# The environment variable holding the default search path
+SEARCH_PATH_VARIABLE = "HJSONCONFIG_PATH"
+
+
+class Resolver(object):
+    """Finds the config files named by "config-file" entries.
+
+    A relative name is looked for in the directory of the file that includes
+    it, then in the current directory, then in each directory of the search
+    path.  An absolute name is used as it is.  The resolved path of each file
+    found is memoized, so that resolving a large include graph again only
+    costs a dict lookup per include, until clear() is called.
+
+    Attributes:
+        search_path: a list of directories to look for config files in, or
+            None to use the directories in the HJSONCONFIG_PATH environment
+            variable, separated by os.pathsep.
+    """
+    # Resolved paths are memoized, up to _MAX_MEMO names
+    _MAX_MEMO = 4096
+
+    def __init__(self, search_path=None):
+        """Inits Resolver with a list of directories to search"""
+        self.search_path = None if search_path is None else list(search_path)
+        self._memo = {}
+
+    def __reduce__(self):
+        # The shared resolver stays shared, and memoized paths are not pickled
+        if self is default_resolver:
+            return "default_resolver"
+        return (Resolver, (self.search_path,))
+
+    def directories(self):
+        """Returns the list of directories in the search path"""
+        if self.search_path is not None:
+            return self.search_path
+        return [d for d in os.environ.get(SEARCH_PATH_VARIABLE, "").split(os.pathsep) if d]
+
+    def candidates(self, name, parent=None):
+        """Returns the list of paths that name could refer to, in the order
+        they are tried
+
+        Args:
+            name: the name of a config file
+            parent: the path of the file that includes name, if any
+        """
+        if os.path.isabs(name):
+            return [name]
+        paths = []
+        if parent is not None:
+            paths.append(os.path.join(os.path.dirname(parent), name))
+        paths.append(name)
+        paths.extend(os.path.join(d, name) for d in self.directories())
+        return paths
+
+    def resolve(self, name, parent=None):
+        """Returns the resolved path of the config file name
+
+        Args:
+            name: the name of a config file
+            parent: the path of the file that includes name, if any
+
+        Returns:
+            The real path of the first candidate that exists.  If none of them
+            exist, the real path of the first candidate is returned, so that
+            reading it raises the usual error.
+        """
+        if os.path.isabs(name):
+            key = (name,)
+        else:
+            directory = None if parent is None else os.path.dirname(parent)
+            key = (name, directory, os.getcwd(), tuple(self.directories()))
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+
+        candidates = self.candidates(name, parent)
+        for path in candidates:
+            if os.path.isfile(path):
+                path = os.path.realpath(path)
+                if len(self._memo) >= self._MAX_MEMO:
+                    self._memo.clear()
+                self._memo[key] = path
+                return path
+        return os.path.realpath(candidates[0])
+
+    def clear(self):
+        """Forgets the memoized paths, for when config files are created,
+        moved or deleted"""
+        self._memo.clear()
+
+
+# The resolver shared by all HjsonConfig objects unless they are given a search path.
+default_resolver = Resolver()
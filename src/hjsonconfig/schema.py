@@ -0,0 +1,253 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import re
+import threading
+
+from hjsonconfig.cache import copy_tree
+
+# Unicode strings are a separate type on Python 2
+string_types = (str, type(u""))
+
+# The keywords handled by compiled schemas.  Any other keywords are checked
+# with jsonschema.
+_KEYWORDS = frozenset([
+    "type", "properties", "required", "additionalProperties", "items", "default", "enum", "const",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "minLength", "maxLength", "pattern",
+    "minItems", "maxItems", "title", "description", "$schema", "$id", "id", "definitions", "$defs",
+])
+
+
+class ConfigValidationError(ValueError):
+    """Raised when a config does not match its schema.
+
+    Attributes:
+        errors: a list of (path, message) tuples, where path is the dotted key
+            path of the value that failed, or "" for the whole config.
+    """
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super(ConfigValidationError, self).__init__("Config does not match schema:\n" + "\n".join(
+            "  {:s}: {:s}".format(path or "<root>", message) for path, message in self.errors))
+
+
+def _is_type(value, name):
+    if name == "object":
+        return isinstance(value, dict)
+    if name == "array":
+        return isinstance(value, list)
+    if name == "string":
+        return isinstance(value, string_types)
+    if name == "boolean":
+        return isinstance(value, bool)
+    if name == "null":
+        return value is None
+    if isinstance(value, bool):
+        return False
+    if name == "integer":
+        return isinstance(value, int) or isinstance(value, float) and value.is_integer()
+    if name == "number":
+        return isinstance(value, (int, float))
+    return True
+
+
+_INVALID = object()
+
+
+def _coerce(value, types):
+    """Returns value converted from a string to the first of types it can
+    be converted to, or _INVALID"""
+    if not isinstance(value, string_types):
+        return _INVALID
+    text = value.strip()
+    for name in types:
+        if name in ("integer", "number"):
+            try:
+                return int(text)
+            except ValueError:
+                pass
+        if name == "number":
+            try:
+                return float(text)
+            except ValueError:
+                pass
+        if name == "boolean" and text.lower() in ("true", "false"):
+            return text.lower() == "true"
+        if name == "null" and text.lower() == "null":
+            return None
+    return _INVALID
+
+
+class CompiledSchema(object):
+    """A JSON schema compiled to a tree of checks, which validates a config,
+    fills in defaults and coerces strings to the types in the schema in one
+    traversal.
+
+    Strings are converted to integers, numbers, booleans or null where the
+    schema requires one of those types.  The keywords in _KEYWORDS are
+    checked natively; other keywords, such as anyOf or format, are checked
+    with jsonschema.
+
+    Attributes:
+        schema: the subschema this node was compiled from
+    """
+    def __init__(self, schema, root=None):
+        """Inits CompiledSchema from a JSON schema dict"""
+        root = schema if root is None else root
+        self.schema = schema
+        types = schema.get("type")
+        self.types = [types] if isinstance(types, string_types) else types
+        self.properties = dict((k, CompiledSchema(v, root)) for k, v in schema.get("properties", {}).items())
+        self.defaults = [(k, v["default"]) for k, v in schema.get("properties", {}).items() if "default" in v]
+        self.required = schema.get("required", [])
+        additional = schema.get("additionalProperties", True)
+        self.additional = additional if isinstance(additional, bool) else CompiledSchema(additional, root)
+        items = schema.get("items")
+        self.items = CompiledSchema(items, root) if isinstance(items, dict) else None
+        self.pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+        self.fallback = None
+        if any(k not in _KEYWORDS for k in schema):
+            import jsonschema
+
+            subschema = dict((k, v) for k, v in schema.items() if k not in _KEYWORDS)
+            for k in ("definitions", "$defs"):
+                if k in root:
+                    subschema[k] = root[k]
+            cls = jsonschema.validators.validator_for(root)
+            self.fallback = cls(subschema)
+
+    def apply(self, value, path, errors):
+        """Checks value, appending (path, message) tuples to errors.  Missing
+        properties with defaults are added to dicts in place.
+
+        Returns:
+            value, or the value it was coerced to.
+        """
+        schema = self.schema
+        if self.types is not None and not any(_is_type(value, t) for t in self.types):
+            coerced = _coerce(value, self.types)
+            if coerced is _INVALID:
+                errors.append((path, "{!r} is not of type {:s}".format(value, " or ".join(self.types))))
+                return value
+            value = coerced
+
+        if "enum" in schema and value not in schema["enum"]:
+            errors.append((path, "{!r} is not one of {!r}".format(value, schema["enum"])))
+        if "const" in schema and value != schema["const"]:
+            errors.append((path, "{!r} is not {!r}".format(value, schema["const"])))
+
+        if isinstance(value, dict):
+            self._apply_object(value, path, errors)
+        elif isinstance(value, list):
+            self._apply_array(value, path, errors)
+        elif isinstance(value, string_types):
+            if "minLength" in schema and len(value) < schema["minLength"]:
+                errors.append((path, "{!r} is shorter than {:d}".format(value, schema["minLength"])))
+            if "maxLength" in schema and len(value) > schema["maxLength"]:
+                errors.append((path, "{!r} is longer than {:d}".format(value, schema["maxLength"])))
+            if self.pattern is not None and not self.pattern.search(value):
+                errors.append((path, "{!r} does not match {!r}".format(value, schema["pattern"])))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            self._apply_number(value, path, errors)
+
+        if self.fallback is not None:
+            for error in self.fallback.iter_errors(value):
+                sub = ".".join(str(p) for p in error.absolute_path)
+                errors.append((path + "." + sub if path and sub else path or sub, error.message))
+        return value
+
+    def _apply_object(self, value, path, errors):
+        prefix = path + "." if path else ""
+        for k, default in self.defaults:
+            if k not in value:
+                value[k] = copy_tree(default)
+        for k in self.required:
+            if k not in value:
+                errors.append((path, "{!r} is a required property".format(k)))
+        for k in list(value.keys()):
+            node = self.properties.get(k)
+            if node is None:
+                if self.additional is True:
+                    continue
+                if self.additional is False:
+                    errors.append((prefix + k, "additional property is not allowed"))
+                    continue
+                node = self.additional
+            item = value[k]
+            coerced = node.apply(item, prefix + k, errors)
+            if coerced is not item:
+                value[k] = coerced
+
+    def _apply_array(self, value, path, errors):
+        schema = self.schema
+        if "minItems" in schema and len(value) < schema["minItems"]:
+            errors.append((path, "has fewer than {:d} items".format(schema["minItems"])))
+        if "maxItems" in schema and len(value) > schema["maxItems"]:
+            errors.append((path, "has more than {:d} items".format(schema["maxItems"])))
+        if self.items is not None:
+            prefix = path + "." if path else ""
+            for i, item in enumerate(value):
+                coerced = self.items.apply(item, prefix + str(i), errors)
+                if coerced is not item:
+                    value[i] = coerced
+
+    def _apply_number(self, value, path, errors):
+        schema = self.schema
+        if "minimum" in schema:
+            exclusive = schema.get("exclusiveMinimum") is True
+            if value < schema["minimum"] or exclusive and value == schema["minimum"]:
+                errors.append((path, "{!r} is less than the minimum of {!r}".format(value, schema["minimum"])))
+        if "maximum" in schema:
+            exclusive = schema.get("exclusiveMaximum") is True
+            if value > schema["maximum"] or exclusive and value == schema["maximum"]:
+                errors.append((path, "{!r} is more than the maximum of {!r}".format(value, schema["maximum"])))
+        minimum = schema.get("exclusiveMinimum")
+        if not isinstance(minimum, bool) and minimum is not None and value <= minimum:
+            errors.append((path, "{!r} is not more than {!r}".format(value, minimum)))
+        maximum = schema.get("exclusiveMaximum")
+        if not isinstance(maximum, bool) and maximum is not None and value >= maximum:
+            errors.append((path, "{!r} is not less than {!r}".format(value, maximum)))
+
+
+# Compiled schemas are cached by the id of the schema, holding a reference to
+# the schema so that its id is not reused, up to _MAX_COMPILED schemas
+_MAX_COMPILED = 64
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def compile_schema(schema):
+    """Returns the CompiledSchema for a JSON schema dict, reusing it if the
+    same schema object has been compiled before.  Schemas must not be
+    modified once they have been used."""
+    try:
+        cached, compiled = _compiled[id(schema)]
+        if cached is schema:
+            return compiled
+    except KeyError:
+        pass
+    compiled = CompiledSchema(schema)
+    with _compiled_lock:
+        if len(_compiled) >= _MAX_COMPILED:
+            _compiled.clear()
+        _compiled[id(schema)] = (schema, compiled)
+    return compiled
+
+
+def validate(config, schema):
+    """Validates config against schema, filling in defaults and coercing
+    values in place.
+
+    Args:
+        config: a dict
+        schema: a JSON schema dict
+
+    Raises:
+        ConfigValidationError: listing every value that does not match.
+    """
+    errors = []
+    compile_schema(schema).apply(config, "", errors)
+    if errors:
+        raise ConfigValidationError(errors)
@@ -0,0 +1,230 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections import OrderedDict
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+from hjsonconfig.cache import copy_tree
+from hjsonconfig.paths import _MISSING
+from hjsonconfig.paths import compile_path
+
+FORMAT_VERSION = 1
+
+# A published file starts with a header of the magic bytes, the format
+# version, the generation and the length of the encoded config.
+_HEADER = struct.Struct("<4sIQQ")
+_MAGIC = b"HJCS"
+
+# A dict is encoded as b"D", its number of entries, and a table with the
+# offsets and lengths of the key and value of each entry, followed by the keys
+# and values.  Offsets are from the start of the encoded config.  Any other
+# value is encoded as b"J" and its compact JSON.
+_COUNT = struct.Struct("<I")
+_ENTRY = struct.Struct("<IIII")
+
+
+def _encode(value, out):
+    """Appends the encoding of value to the bytearray out"""
+    if isinstance(value, Mapping):
+        items = list(value.items())
+        out += b"D" + _COUNT.pack(len(items))
+        table = len(out)
+        out += b"\0" * (_ENTRY.size * len(items))
+        for i, (k, v) in enumerate(items):
+            key = k.encode("utf-8")
+            key_offset = len(out)
+            out += key
+            value_offset = len(out)
+            _encode(v, out)
+            _ENTRY.pack_into(out, table + i * _ENTRY.size, key_offset, len(key), value_offset, len(out) - value_offset)
+    else:
+        out += b"J" + json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode(config):
+    """Returns the encoding of a config, as published by publish()"""
+    out = bytearray()
+    _encode(config, out)
+    return out
+
+
+def read_generation(path):
+    """Returns the generation of the config published at path, or 0 if there
+    is none"""
+    try:
+        with open(path, 'rb') as f:
+            magic, version, generation, _ = _HEADER.unpack(f.read(_HEADER.size))
+    except (OSError, IOError, struct.error):
+        return 0
+    if magic != _MAGIC or version != FORMAT_VERSION:
+        return 0
+    return generation
+
+
+def publish(config, path):
+    """Writes a resolved config to path for SharedConfigReader objects in
+    other processes to map.  The file is replaced atomically, so readers of
+    the previous generation keep their mapping of it.
+
+    Args:
+        config: an HjsonConfig, OrderedDict or FrozenConfig object
+        path: the file to publish to
+
+    Returns:
+        The generation of the published config, one more than the generation
+        previously published at path.
+    """
+    materialize = getattr(config, "materialize", None)
+    if materialize is not None:
+        materialize()
+    data = encode(config)
+    generation = read_generation(path) + 1
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".hjsonconfig-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, generation, len(data)))
+            f.write(data)
+        getattr(os, "replace", os.rename)(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return generation
+
+
+class SharedConfig(Mapping):
+    """A read-only view of a dict in a published config, decoded from the
+    mapped file as it is used.
+
+    The keys of a dict are decoded the first time it is looked in to, and
+    each value the first time it is accessed.  Nested dicts are SharedConfig
+    views of the same mapping, and lists and scalars are decoded from JSON.
+    Decoded values are shared by every access, so they must not be modified.
+    """
+    __slots__ = ("_buffer", "_offset", "_index", "_values")
+
+    def __init__(self, buffer, offset=0):
+        """Inits SharedConfig from a buffer holding an encoded config and the
+        offset of the dict in it.  Use SharedConfigReader to map a file."""
+        self._buffer = buffer
+        self._offset = offset
+        self._index = None
+        self._values = {}
+
+    def _entries(self):
+        if self._index is None:
+            buffer = self._buffer
+            count = _COUNT.unpack_from(buffer, self._offset + 1)[0]
+            table = self._offset + 1 + _COUNT.size
+            index = {}
+            keys = []
+            for i in range(count):
+                key_offset, key_length, value_offset, value_length = _ENTRY.unpack_from(buffer, table + i * _ENTRY.size)
+                key = bytes(buffer[key_offset:key_offset + key_length]).decode("utf-8")
+                index[key] = (value_offset, value_length)
+                keys.append(key)
+            self._index = (index, keys)
+        return self._index
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        offset, length = self._entries()[0][key]
+        if self._buffer[offset:offset + 1] == b"D":
+            value = SharedConfig(self._buffer, offset)
+        else:
+            value = json.loads(bytes(self._buffer[offset + 1:offset + length]).decode("utf-8"))
+        self._values[key] = value
+        return value
+
+    def __contains__(self, key):
+        return key in self._entries()[0]
+
+    def __iter__(self):
+        return iter(self._entries()[1])
+
+    def __len__(self):
+        return len(self._entries()[1])
+
+    def __repr__(self):
+        return "SharedConfig({!r})".format(list(self.items()))
+
+    def get_path(self, path, default=_MISSING):
+        """Returns the value at a dotted key path such as "server.pool.size".
+
+        Raises:
+            KeyError: if the path is not present and no default is given.
+        """
+        return compile_path(path).get(self, default)
+
+    def thaw(self):
+        """Returns a mutable HjsonConfig copy of this view"""
+        from hjsonconfig.hjsonconfig import HjsonConfig
+
+        config = HjsonConfig()
+        config._copy_in(_thaw(self))
+        return config
+
+
+def _thaw(value):
+    """Returns a mutable copy of a value decoded from a published config"""
+    if isinstance(value, SharedConfig):
+        return OrderedDict((k, _thaw(v)) for k, v in value.items())
+    return copy_tree(value)
+
+
+class SharedConfigReader(object):
+    """Maps a config published by publish(), so that many processes share one
+    copy of it in memory and none of them has to read the config files.
+
+    Attributes:
+        path: the published file
+        config: a SharedConfig view of the current generation
+        generation: the generation of config
+    """
+    def __init__(self, path):
+        """Inits SharedConfigReader by mapping the config published at path
+
+        Raises:
+            ValueError: if path does not hold a published config.
+        """
+        self.path = path
+        self.config = None
+        self.generation = 0
+        self._map()
+
+    def _map(self):
+        with open(self.path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapping) < _HEADER.size:
+            raise ValueError("{:s} is not a published config".format(self.path))
+        magic, version, generation, length = _HEADER.unpack_from(mapping, 0)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            raise ValueError("{:s} is not a published config".format(self.path))
+        self.config = SharedConfig(memoryview(mapping)[_HEADER.size:_HEADER.size + length])
+        self.generation = generation
+
+    def check(self):
+        """Maps the published config again if a new generation has been
+        published since it was last mapped.  Views of the previous generation
+        stay valid while they are referenced.
+
+        Returns:
+            True if a new generation was mapped
+        """
+        if read_generation(self.path) == self.generation:
+            return False
+        self._map()
+        return True
@@ -0,0 +1,160 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+from collections import OrderedDict
+
+
+class SectionChangedError(RuntimeError):
+    """Raised when a lazy section is loaded after its file has changed"""
+
+
+def _decoder():
+    import hjson
+
+    return hjson.HjsonDecoder(object_pairs_hook=OrderedDict)
+
+
+def _stamp(filename):
+    st = os.stat(filename)
+    return getattr(st, "st_mtime_ns", st.st_mtime), st.st_size
+
+
+class LazySection(object):
+    """A placeholder for a top-level section of a config file that has not
+    been parsed yet.  It records the byte range of the section's value in the
+    file, and HjsonConfig replaces it with the parsed value the first time
+    the section is accessed.
+
+    Attributes:
+        filename: the file the section is in
+        key: the key of the section
+        start: the offset in bytes of the start of the section's value
+        end: the offset in bytes of the end of the section's value
+    """
+    __slots__ = ("filename", "key", "start", "end", "_stamp")
+
+    def __init__(self, filename, key, start, end, stamp):
+        self.filename = filename
+        self.key = key
+        self.start = start
+        self.end = end
+        self._stamp = stamp
+
+    def __repr__(self):
+        return "LazySection({!r}, {!r}, bytes {:d}-{:d})".format(self.filename, self.key, self.start, self.end)
+
+    def load(self):
+        """Reads and parses the section
+
+        Raises:
+            SectionChangedError: if the file has changed since the section was found.
+        """
+        with open(self.filename, 'rb') as f:
+            if _stamp(self.filename) != self._stamp:
+                raise SectionChangedError("{:s} has changed since section {:s} was found".format(
+                    self.filename, self.key))
+            f.seek(self.start)
+            text = f.read(self.end - self.start).decode("utf-8")
+        return _decoder().scan_once(text, 0)[0]
+
+
+def _skip_value(decoder, s, idx):
+    """Returns the index of the end of the hjson value starting at idx in s,
+    without building any containers"""
+    from hjson.decoder import getNext
+    from hjson.decoder import scanKeyName
+    from hjson.scanner import HjsonDecodeError
+
+    ch = s[idx:idx + 1]
+    if ch == '{':
+        ch, idx = getNext(s, idx + 1)
+        while ch != '}':
+            if ch == '':
+                raise HjsonDecodeError("End of input while parsing an object", s, idx)
+            _, idx = scanKeyName(s, idx)
+            ch, idx = getNext(s, idx)
+            if ch != ':':
+                raise HjsonDecodeError("Expecting ':' delimiter", s, idx)
+            ch, idx = getNext(s, idx + 1)
+            idx = _skip_value(decoder, s, idx)
+            ch, idx = getNext(s, idx)
+            if ch == ',':
+                ch, idx = getNext(s, idx + 1)
+        return idx + 1
+    if ch == '[':
+        ch, idx = getNext(s, idx + 1)
+        while ch != ']':
+            if ch == '':
+                raise HjsonDecodeError("End of input while parsing an array", s, idx)
+            idx = _skip_value(decoder, s, idx)
+            ch, idx = getNext(s, idx)
+            if ch == ',':
+                ch, idx = getNext(s, idx + 1)
+        return idx + 1
+    # Scalars are cheap to parse, and parsing them handles every form of string
+    return decoder.scan_once(s, idx)[1]
+
+
+def iter_sections(filename, lazy=()):
+    """Parses the top-level sections of an .hjson file one at a time.
+
+    Args:
+        filename: path to file to be read
+        lazy: keys of sections that should not be parsed.  They are yielded
+            as LazySection objects, which HjsonConfig parses on first access.
+
+    Yields:
+        (key, value) tuples, in the order the keys appear in the file.
+    """
+    from hjson.decoder import getNext
+    from hjson.decoder import scanKeyName
+    from hjson.scanner import HjsonDecodeError
+
+    decoder = _decoder()
+    lazy = frozenset(lazy)
+    stamp = _stamp(filename)
+    with open(filename, 'rb') as f:
+        data = f.read()
+    s = data.decode("utf-8")
+    del data
+    ascii_only = len(s) == stamp[1]
+    # Converts offsets in s to offsets in the file, counting incrementally
+    position = [0, 0]
+
+    def offset(idx):
+        if ascii_only:
+            return idx
+        position[1] += len(s[position[0]:idx].encode("utf-8"))
+        position[0] = idx
+        return position[1]
+
+    idx = 1 if s[:1] == u"\ufeff" else 0
+    ch, idx = getNext(s, idx)
+    braces = ch == '{'
+    if braces:
+        ch, idx = getNext(s, idx + 1)
+    while True:
+        if braces and ch == '}':
+            break
+        if ch == '':
+            if braces:
+                raise HjsonDecodeError("End of input while parsing an object", s, idx)
+            break
+        key, idx = scanKeyName(s, idx)
+        ch, idx = getNext(s, idx)
+        if ch != ':':
+            raise HjsonDecodeError("Expecting ':' delimiter", s, idx)
+        ch, idx = getNext(s, idx + 1)
+        if key in lazy:
+            start = idx
+            idx = _skip_value(decoder, s, idx)
+            value = LazySection(filename, key, offset(start), offset(idx), stamp)
+        else:
+            value, idx = decoder.scan_once(s, idx)
+        yield key, value
+        ch, idx = getNext(s, idx)
+        if ch == ',':
+            ch, idx = getNext(s, idx + 1)
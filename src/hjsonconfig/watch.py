@@ -0,0 +1,187 @@
+#! /usr/bin/env python
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+
+from hjsonconfig.cache import file_stamp
+from hjsonconfig.graph import IncludeGraph
+from hjsonconfig.hjsonconfig import HjsonConfig
+from hjsonconfig.includes import LazyInclude
+from hjsonconfig.patch import diff
+
+
+def changed_keys(old, new, prefix=""):
+    """Returns the dotted paths of the keys whose values differ between old
+    and new.  Dicts present in both are compared key by key, so only the
+    innermost changed keys are listed.  Keys that only moved are not listed.
+
+    Args:
+        old: an OrderedDict or HjsonConfig object
+        new: an OrderedDict or HjsonConfig object
+
+    Returns:
+        A list of dotted key paths
+    """
+    return [prefix + change.path for change in diff(old, new) if change.op != "order"]
+
+
+class ConfigWatcher(object):
+    """Keeps a config read from a file up to date as the file, and the files
+    it includes, change.
+
+    The files are polled for changes to their modification times.  When some
+    have changed, only those files are read again, and only they and the files
+    that include them are merged again.  Includes nested in dicts are loaded
+    before a config is published, so that the files they read are watched
+    too; when one of those changes, the file that mounted the include is read
+    again.  The new config is then published by
+    replacing the config attribute, so a reader that takes a reference to
+    watcher.config always sees one complete, consistent config.  Published
+    configs are shared between readers and should not be modified.
+
+    Attributes:
+        config: The current HjsonConfig object.
+        filename: The name of the config file being watched.
+        interval: The time in seconds between polls of the background thread.
+        generation: The number of times config has been replaced.
+        callbacks: A list of functions called as callback(config, changed)
+                after config is replaced, where changed is a list of the dotted
+                paths of the keys that changed.
+        error: The exception raised by the last failed poll of the background
+                thread, or None.
+    """
+    def __init__(self, filename, callback=None, interval=1.0, **kwds):
+        """Inits ConfigWatcher and reads filename.  Other keyword arguments
+        are passed on to HjsonConfig, and set the options used to read the
+        files."""
+        self.filename = filename
+        self.interval = interval
+        self.generation = 0
+        self.callbacks = [] if callback is None else [callback]
+        self.error = None
+        self._options = HjsonConfig(**kwds)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._graph = None
+        self._stamps = {}
+        self._mounts = {}
+        self.config = None
+        self.reload()
+
+    def _load_includes(self, config, stamps):
+        """Loads every include nested in config, and returns a dict mapping
+        each file they read to the set of keys of the files in the graph
+        that mounted them, directly or through other nested includes.  The
+        stamps of the files are added to stamps."""
+        mounts = {}
+        pending = [config]
+        while pending:
+            value = pending.pop()
+            for v in (value.values() if isinstance(value, dict) else value):
+                if isinstance(v, LazyInclude):
+                    v.load()
+                    # An include is always reached before the includes nested in it
+                    owners = set([v.parent]) if v.parent in self._graph.nodes else mounts.get(v.parent, set())
+                    for f, stamp in v.files.items():
+                        mounts.setdefault(f, set()).update(owners)
+                        stamps[f] = stamp
+                if isinstance(v, (dict, list)):
+                    pending.append(v)
+        return mounts
+
+    def _publish(self, result):
+        """Replaces config with a new config built from result, and calls the
+        callbacks with the changed keys"""
+        config = self._options._new_config()
+        config._copy_in(result)
+        config.filename = self.filename
+        if config.provenance:
+            config._origins = self._graph.origins(self.filename)
+        stamps = {}
+        mounts = self._load_includes(config, stamps)
+        config._finish_load()
+
+        # Watch every file that is still included, with the stamp it had
+        # before it was read, so that a write made while it was being read
+        # is seen by the next check
+        for k in self._graph.order([self._graph.key(self.filename)]):
+            stamps[k] = self._graph.stamps[k]
+        self._stamps = stamps
+        self._mounts = mounts
+
+        old = self.config
+        changed = changed_keys(old, config) if old is not None else list(config.keys())
+        self.config = config
+        self.generation += 1
+        if old is not None and changed:
+            for callback in self.callbacks:
+                callback(config, changed)
+        return changed
+
+    def reload(self):
+        """Reads the config file and all its includes again
+
+        Returns:
+            The list of dotted paths of keys that changed
+        """
+        with self._lock:
+            graph = IncludeGraph(self._options, retain=True)
+            result = graph.resolve([self.filename])[0]
+            self._graph = graph
+            return self._publish(result)
+
+    def check(self):
+        """Checks the watched files for changes once, reading and merging
+        again only the files that changed and the files that include them.
+
+        Returns:
+            The list of dotted paths of keys that changed
+        """
+        with self._lock:
+            stamps = dict((k, file_stamp(k)) for k in self._stamps)
+            changed = [k for k in stamps if stamps[k] != self._stamps[k]]
+            if not changed:
+                return []
+            if self._options.verbose:
+                print("ConfigWatcher.check: Changed files: {!s}".format(changed))
+            # Files read by nested includes are read again by reading the
+            # files that mounted the includes
+            refresh = [k for k in changed if k in self._graph.nodes]
+            for k in changed:
+                refresh.extend(owner for owner in sorted(self._mounts.get(k, ())) if owner not in refresh)
+            self._graph.refresh(refresh)
+            result = self._graph.resolve([self.filename])[0]
+            return self._publish(result)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+                self.error = None
+            except Exception as e:
+                self.error = e
+
+    def start(self):
+        """Starts polling the files for changes in a background thread"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ConfigWatcher")
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the background thread"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,20 @@
+"""Fixtures shared by the tests."""
+import os
+
+import pytest
+
+
+@pytest.fixture
+def write_files():
+    """Returns a function write_files(directory, files, mtime=None), which
+    writes files, a dict mapping file names to their text, in to directory,
+    creating it if needed.  If mtime is given, the files' modification times
+    are set to it."""
+    def write(directory, files, mtime=None):
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, text in files.items():
+            path = directory / name
+            path.write_text(text)
+            if mtime is not None:
+                os.utime(str(path), (mtime, mtime))
+    return write
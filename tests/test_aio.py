@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+import pytest
+
+from hjsonconfig import hjsonconfig
+
+
+FILES = {
+    "a.hjson": '{"config-file": ["b.hjson", "c.hjson"], "a": 1}',
+    "b.hjson": '{"config-file": "d.hjson", "b": {"x": 1}}',
+    "c.hjson": '{"config-file": "d.hjson", "c": 1}',
+    "d.hjson": '{"d": 1, "b": {"y": 2}}',
+}
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_aload_matches_sync(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, FILES)
+    monkeypatch.chdir(str(tmp_path))
+    expected = hjsonconfig.HjsonConfig(filename="a.hjson")
+    config = run(hjsonconfig.HjsonConfig.aload("a.hjson", cache=False))
+    assert isinstance(config, hjsonconfig.HjsonConfig)
+    assert config == expected
+    assert list(config.keys()) == list(expected.keys())
+    assert config.filename == "a.hjson"
+    assert config.cache is None
+
+    config = hjsonconfig.HjsonConfig()
+    config["config-file"] = "a.hjson"
+    config["e"] = 1
+    run(config.aimport_config_files())
+    expected = hjsonconfig.HjsonConfig()
+    expected["config-file"] = "a.hjson"
+    expected["e"] = 1
+    expected.import_config_files()
+    assert config == expected
+
+
+class SlowCache(object):
+    """A parse cache that blocks until it is released"""
+    def __init__(self):
+        self.release = threading.Event()
+
+    def load(self, filename):
+        self.release.wait(5)
+        return hjsonconfig.parse_file(filename)
+
+
+def test_aload_timeout_and_cancel(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, FILES)
+    monkeypatch.chdir(str(tmp_path))
+    slow = SlowCache()
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            run(hjsonconfig.HjsonConfig.aload("a.hjson", timeout=0.05, cache=slow))
+
+        async def cancelled():
+            task = asyncio.ensure_future(hjsonconfig.HjsonConfig.aload("a.hjson", cache=slow))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await task
+
+        with pytest.raises(asyncio.CancelledError):
+            run(cancelled())
+    finally:
+        slow.release.set()
+
+
+def test_aimport_matches_sync_with_schema(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, FILES)
+    monkeypatch.chdir(str(tmp_path))
+    schema = {"type": "object", "properties": {
+        "a": {"type": "integer"},
+        "x": {"type": "integer", "default": 5},
+        "y": {"type": "integer"},
+    }}
+    for data in ({"config-file": "a.hjson", "y": "3"}, {"k": 1}):
+        configs = []
+        for load in (lambda c: c.import_config_files(), lambda c: run(c.aimport_config_files())):
+            config = hjsonconfig.HjsonConfig(schema=schema, provenance=True)
+            config.update(data)
+            load(config)
+            configs.append(config)
+        assert configs[0] == configs[1]
+        assert configs[1]["x"] == 5
+        key = "a" if "config-file" in data else "k"
+        assert configs[1].origin(key) == configs[0].origin(key)
+    assert configs[1].origin("k") is None
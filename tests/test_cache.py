@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from hjsonconfig import cache
+from hjsonconfig import hjsonconfig
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'test_config_files',
+    )
+
+
+@pytest.mark.datafiles(FIXTURE_DIR)
+def test_shared_file_is_parsed_once(datafiles, monkeypatch):
+    monkeypatch.chdir(str(datafiles))
+    parse_cache = cache.ParseCache()
+    config1 = hjsonconfig.HjsonConfig(filename='test2.hjson', cache=parse_cache)
+    config2 = hjsonconfig.HjsonConfig(filename='test2.hjson', cache=parse_cache)
+    assert config1 == config2
+    assert config1["overrideMe2"] == "String set in test2.hjson"
+    assert parse_cache.stats()["misses"] == 2
+    assert parse_cache.stats()["hits"] == 2
+
+
+@pytest.mark.datafiles(FIXTURE_DIR)
+def test_cache_returns_private_copies(datafiles):
+    test_file = os.path.join(str(datafiles), 'test.hjson')
+    parse_cache = cache.ParseCache()
+    config1 = hjsonconfig.HjsonConfig(filename=test_file, cache=parse_cache)
+    config1["dict1"]["dict1key1"] = "changed"
+    config2 = hjsonconfig.HjsonConfig(filename=test_file, cache=parse_cache)
+    assert config2["dict1"]["dict1key1"] == "dictValue"
+    assert parse_cache.hits == 1
+
+
+@pytest.mark.datafiles(FIXTURE_DIR)
+def test_cache_invalidation_and_eviction(datafiles):
+    test_file = os.path.join(str(datafiles), 'test.hjson')
+    test3_file = os.path.join(str(datafiles), 'test3.hjson')
+    parse_cache = cache.ParseCache(max_entries=1)
+    parse_cache.load(test_file)
+    parse_cache.load(test3_file)
+    assert len(parse_cache) == 1
+    assert parse_cache.evictions == 1
+
+    with open(test3_file, 'w') as f:
+        f.write('{"overrideMe2": "Changed string that is longer"}')
+    assert parse_cache.load(test3_file)["overrideMe2"] == "Changed string that is longer"
+    assert parse_cache.misses == 3
+
+    parse_cache.discard(test3_file)
+    parse_cache.discard(test_file)
+    assert len(parse_cache) == 0
+    assert parse_cache.stats()["bytes"] == 0
+
+
+@pytest.mark.datafiles(FIXTURE_DIR)
+def test_cache_opt_out(datafiles):
+    test_file = os.path.join(str(datafiles), 'test.hjson')
+    config = hjsonconfig.HjsonConfig(filename=test_file, cache=False)
+    assert config.cache is None
+    assert config["int1"] == 1
@@ -0,0 +1,79 @@
+import os
+
+from hjsonconfig import diskcache
+from hjsonconfig import hjsonconfig
+
+
+def test_disk_cache_skips_parsing(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {
+        "root.hjson": '{"config-file": "base.hjson", "b": {"y": 2}, "a": 1}',
+        "base.hjson": '{"z": 0, "b": {"x": 1}}',
+    }, 1000)
+    monkeypatch.chdir(str(tmp_path))
+    cache_dir = str(tmp_path / "cache")
+
+    expected = hjsonconfig.HjsonConfig(filename="root.hjson", cache=False)
+    disk_cache = diskcache.DiskCache(cache_dir)
+    first = hjsonconfig.HjsonConfig(filename="root.hjson", cache=False, disk_cache=disk_cache)
+    assert disk_cache.misses == 1
+    assert len(os.listdir(cache_dir)) == 1
+
+    def fail(*args):
+        raise AssertionError("config file parsed")
+
+    monkeypatch.setattr(hjsonconfig, "parse_file", fail)
+    second = hjsonconfig.HjsonConfig(filename="root.hjson", cache=False, disk_cache=cache_dir)
+    assert second.disk_cache.hits == 1
+    assert first == second == expected
+    assert list(second.keys()) == list(expected.keys())
+    assert isinstance(second["b"], hjsonconfig.hjson.OrderedDict)
+
+
+def test_disk_cache_detects_changes(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {
+        "root.hjson": '{"config-file": "base.hjson"}',
+        "base.hjson": '{"x": 1}',
+    }, 1000)
+    monkeypatch.chdir(str(tmp_path))
+    disk_cache = diskcache.DiskCache()
+
+    hjsonconfig.HjsonConfig(filename="root.hjson", disk_cache=disk_cache)
+    # Touching a file without changing it keeps the cache file valid
+    write_files(tmp_path, {"base.hjson": '{"x": 1}'}, 2000)
+    assert hjsonconfig.HjsonConfig(filename="root.hjson", disk_cache=disk_cache)["x"] == 1
+    assert disk_cache.hits == 1
+
+    write_files(tmp_path, {"base.hjson": '{"x": 2}'}, 3000)
+    assert hjsonconfig.HjsonConfig(filename="root.hjson", disk_cache=disk_cache)["x"] == 2
+    assert disk_cache.misses == 2
+
+
+def test_disk_cache_keyed_on_search_path(tmp_path, monkeypatch, write_files):
+    for env in ("A", "B"):
+        write_files(tmp_path / env, {"base.hjson": '{"env": "%s"}' % env}, 1000)
+    write_files(tmp_path / "conf", {"root.hjson": '{"config-file": "base.hjson"}'}, 1000)
+    monkeypatch.chdir(str(tmp_path))
+    root = str(tmp_path / "conf" / "root.hjson")
+    cache_dir = str(tmp_path / "cache")
+
+    for env in ("A", "B", "A"):
+        config = hjsonconfig.HjsonConfig(filename=root, search_path=[str(tmp_path / env)], disk_cache=cache_dir)
+        assert config["env"] == env
+    assert len(os.listdir(cache_dir)) == 2
+
+    # Running from a directory holding another base.hjson changes the include too
+    monkeypatch.chdir(str(tmp_path / "B"))
+    assert hjsonconfig.HjsonConfig(filename=root, search_path=[str(tmp_path / "A")], disk_cache=cache_dir)["env"] == "B"
+
+
+def test_disk_cache_keeps_include_search_path(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path / "conf", {"root.hjson": '{"database": {"config-file": "db.hjson"}, "name": "root"}'})
+    write_files(tmp_path / "sp", {"db.hjson": '{"host": "db"}'})
+    monkeypatch.chdir(str(tmp_path))
+    root = str(tmp_path / "conf" / "root.hjson")
+    options = dict(search_path=[str(tmp_path / "sp")], disk_cache=str(tmp_path / "cache"))
+
+    for hits in (0, 1):
+        config = hjsonconfig.HjsonConfig(filename=root, **options)
+        assert config.disk_cache.hits == hits
+        assert config.get_path("database.host") == "db"
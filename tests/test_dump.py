@@ -0,0 +1,33 @@
+import io
+from collections import OrderedDict
+
+import pytest
+
+from hjsonconfig import hjsonconfig
+
+
+def test_dump_round_trips(tmp_path):
+    (tmp_path / "base.hjson").write_text('{"a": {"x": 1, "y": [1, 2.5, null]}, "s": "caf\\u00e9"}')
+    (tmp_path / "root.hjson").write_text('{"config-file": "base.hjson", "a": {"y": true}}')
+    config = hjsonconfig.HjsonConfig(filename=str(tmp_path / "root.hjson"))
+    for format in ("json", "hjson", "compact"):
+        path = str(tmp_path / ("out." + format))
+        config.dump(path, format=format)
+        assert hjsonconfig.HjsonConfig(filename=path) == config
+    with open(str(tmp_path / "out.compact")) as f:
+        assert f.read().startswith('{"a":{"x":1')
+
+    with pytest.raises(ValueError):
+        config.dump(str(tmp_path / "out.xml"), format="xml")
+
+
+def test_dump_sorted_is_canonical():
+    a = hjsonconfig.HjsonConfig(OrderedDict([("b", OrderedDict([("y", 1), ("x", 2)])), ("a", 3)]))
+    b = hjsonconfig.HjsonConfig(OrderedDict([("a", 3), ("b", OrderedDict([("x", 2), ("y", 1)]))]))
+    for format in ("json", "hjson", "compact"):
+        out_a = io.StringIO()
+        out_b = io.StringIO()
+        a.dump(out_a, format=format, sort_keys=True)
+        b.dump(out_b, format=format, sort_keys=True)
+        assert out_a.getvalue() == out_b.getvalue()
+    assert out_a.getvalue() == '{"a":3,"b":{"x":2,"y":1}}\n'
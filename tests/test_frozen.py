@@ -0,0 +1,43 @@
+import os
+import pickle
+
+import pytest
+
+from hjsonconfig import frozen
+from hjsonconfig import hjsonconfig
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'test_config_files',
+    )
+
+
+@pytest.mark.datafiles(FIXTURE_DIR)
+def test_freeze(datafiles):
+    test_file = os.path.join(str(datafiles), 'test.hjson')
+    config = hjsonconfig.HjsonConfig(filename=test_file)
+    config["list1"] = [1, {"a": 2}]
+    snapshot = config.freeze()
+
+    assert isinstance(snapshot, frozen.FrozenConfig)
+    assert snapshot == config
+    assert list(snapshot.keys()) == list(config.keys())
+    assert snapshot["dict1"]["dict1key1"] == "dictValue"
+    assert isinstance(snapshot["dict1"], frozen.FrozenConfig)
+    assert snapshot["list1"] == (1, frozen.freeze({"a": 2}))
+    assert hash(snapshot) == hash(config.freeze())
+    with pytest.raises(TypeError):
+        snapshot["int1"] = 2
+
+    thawed = snapshot.thaw()
+    assert isinstance(thawed, hjsonconfig.HjsonConfig)
+    assert thawed == config
+    assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+
+
+def test_key_tables_are_shared():
+    a = frozen.freeze({"host": "a", "port": 1, "tls": {"on": True}})
+    b = frozen.freeze({"host": "b", "port": 2, "tls": {"on": False}})
+    assert a._table is b._table
+    assert a["tls"]._table is b["tls"]._table
+    assert a != b
@@ -0,0 +1,92 @@
+import pytest
+
+from hjsonconfig import cache
+from hjsonconfig import graph
+from hjsonconfig import hjsonconfig
+
+
+def test_diamond_include_is_read_once(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {
+        "a.hjson": '{"config-file": ["b.hjson", "c.hjson"], "a": 1}',
+        "b.hjson": '{"config-file": "d.hjson", "b": 1, "shared": "b"}',
+        "c.hjson": '{"config-file": "d.hjson", "c": 1}',
+        "d.hjson": '{"d": 1, "shared": "d", "nested": {"x": 1}}',
+    })
+    monkeypatch.chdir(str(tmp_path))
+    parse_cache = cache.ParseCache()
+    config = hjsonconfig.HjsonConfig(filename="a.hjson", cache=parse_cache)
+    assert parse_cache.misses == 4
+    assert parse_cache.hits == 0
+    # d.hjson is merged in again by c.hjson, so it overrides b.hjson
+    assert config["shared"] == "d"
+    assert config["a"] == config["b"] == config["c"] == config["d"] == 1
+    assert config["imported-config-file"] == [["b.hjson", "c.hjson"]]
+    assert config["config-file"] is None
+    config["nested"]["x"] = 2
+    # d.hjson's dicts are copied, not aliased, so neither the parse cache nor
+    # a config read again from it sees the change
+    again = hjsonconfig.HjsonConfig(filename="a.hjson", cache=parse_cache)
+    assert parse_cache.hits == 4
+    assert again["nested"] == {"x": 1}
+    assert again["nested"] is not config["nested"]
+
+
+def test_include_cycle_reports_chain(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {
+        "a.hjson": '{"config-file": "b.hjson"}',
+        "b.hjson": '{"config-file": ["c.hjson"]}',
+        "c.hjson": '{"config-file": "a.hjson"}',
+    })
+    monkeypatch.chdir(str(tmp_path))
+    with pytest.raises(graph.IncludeCycleError) as excinfo:
+        hjsonconfig.HjsonConfig(filename="a.hjson")
+    assert excinfo.value.chain == ["a.hjson", "b.hjson", "c.hjson", "a.hjson"]
+
+
+def test_import_config_files_in_memory(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {
+        "base.hjson": '{"x": 1, "y": 1}',
+    })
+    monkeypatch.chdir(str(tmp_path))
+    config = hjsonconfig.HjsonConfig()
+    config["config-file"] = "base.hjson"
+    config["y"] = 2
+    config.import_config_files()
+    assert list(config.keys()) == ["x", "y", "config-file", "imported-config-file"]
+    assert config["y"] == 2
+
+
+def test_concurrent_loading_keeps_declared_order(tmp_path, monkeypatch, write_files):
+    files = {"root.hjson": '{"config-file": [%s]}' % ", ".join('"f%d.hjson"' % i for i in range(8))}
+    for i in range(8):
+        files["f%d.hjson" % i] = '{"config-file": "leaf%d.hjson", "value": %d, "f%d": true}' % (i % 3, i, i)
+    for i in range(3):
+        files["leaf%d.hjson" % i] = '{"leaf%d": true, "value": -1}' % i
+    write_files(tmp_path, files)
+    monkeypatch.chdir(str(tmp_path))
+
+    sequential = hjsonconfig.HjsonConfig(filename="root.hjson", cache=False)
+    concurrent = hjsonconfig.HjsonConfig(filename="root.hjson", cache=False, workers=4)
+    assert concurrent == sequential
+    assert list(concurrent.keys()) == list(sequential.keys())
+    assert concurrent["value"] == 7
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_load_many_shares_bases(tmp_path, monkeypatch, processes, write_files):
+    files = {"base.hjson": '{"base": {"x": 1}, "name": "base"}'}
+    for i in range(5):
+        files["root{:d}.hjson".format(i)] = '{{"config-file": ["base.hjson"], "name": "root{:d}"}}'.format(i)
+    write_files(tmp_path, files)
+    monkeypatch.chdir(str(tmp_path))
+    roots = ["root{:d}.hjson".format(i) for i in range(5)]
+    parse_cache = cache.ParseCache()
+    configs = hjsonconfig.HjsonConfig.load_many(roots, workers=2 if processes else None,
+                                                processes=processes, cache=parse_cache)
+    assert list(configs.keys()) == roots
+    for root in roots:
+        assert configs[root] == hjsonconfig.HjsonConfig(filename=root, cache=False)
+        assert configs[root].filename == root
+    configs[roots[0]]["base"]["x"] = 2
+    assert configs[roots[1]]["base"]["x"] == 1
+    assert parse_cache.misses == (0 if processes else 6)
@@ -1,4 +1,6 @@
+import copy
 import os
+import pickle
 
 import pytest
 
@@ -32,3 +34,15 @@ def test_loading_file(datafiles):
     assert config["float1"] == 0.5
     assert isinstance(config["dict1"], hjsonconfig.hjson.OrderedDict)
     assert config["overrideMe"] == 0.1
+
+
+@pytest.mark.datafiles(FIXTURE_DIR)
+def test_pickle_and_copy(datafiles):
+    test_file = os.path.join(str(datafiles), 'test.hjson')
+    config = hjsonconfig.HjsonConfig(filename=test_file)
+    for other in [pickle.loads(pickle.dumps(config)), copy.deepcopy(config)]:
+        assert isinstance(other, hjsonconfig.HjsonConfig)
+        assert other == config
+        assert list(other.keys()) == list(config.keys())
+        assert other.filename == test_file
+        assert other.cache is config.cache
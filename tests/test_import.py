@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must not be imported until they are needed
+HEAVY_MODULES = ["hjson", "jsonmerge", "jsonschema", "pprint"]
+
+# Submodules whose attributes the package imports on first use
+LAZY_SUBMODULES = ["hjsonconfig.hjsonconfig", "hjsonconfig.patch"]
+
+
+def imported_modules(statement):
+    """Runs statement in a fresh interpreter, returning the set of imported
+    modules"""
+    code = "{:s}; import sys; print(' '.join(sys.modules))".format(statement)
+    proc = subprocess.Popen([sys.executable, "-c", code],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    out, err = proc.communicate()
+    assert proc.returncode == 0, err
+    return set(out.split())
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="needs module __getattr__")
+def test_import_is_lightweight():
+    modules = imported_modules("import hjsonconfig.hjsonconfig")
+    for name in HEAVY_MODULES:
+        assert name not in modules
+
+    modules = imported_modules("import hjsonconfig; hjsonconfig.HjsonConfig()")
+    for name in HEAVY_MODULES:
+        assert name not in modules
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="needs module __getattr__")
+def test_import_defers_submodules():
+    modules = imported_modules("import hjsonconfig")
+    for name in LAZY_SUBMODULES + HEAVY_MODULES:
+        assert name not in modules
+
+    modules = imported_modules("import hjsonconfig; hjsonconfig.diff")
+    assert "hjsonconfig.patch" in modules
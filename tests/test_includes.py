@@ -0,0 +1,67 @@
+import pickle
+import threading
+
+from hjsonconfig import graph
+from hjsonconfig import hjsonconfig
+from hjsonconfig import includes
+
+
+def test_nested_include_loads_on_first_access(tmp_path, write_files):
+    write_files(tmp_path, {
+        "root.hjson": '{"app": {"database": {"config-file": "db/db.hjson", "port": 6000}}, "name": "root"}',
+    })
+    write_files(tmp_path / "db", {
+        "db.hjson": '{"config-file": "defaults.hjson", "host": "db", "pool": {"config-file": "pool.hjson"}}',
+        "defaults.hjson": '{"port": 5432, "user": "app"}',
+        "pool.hjson": '{"size": 4}',
+    })
+    config = hjsonconfig.HjsonConfig(filename=str(tmp_path / "root.hjson"), cache=False)
+    database = dict.__getitem__(config["app"], "database")
+    assert isinstance(database, includes.LazyInclude) and database.pending
+
+    assert config.get_path("app.database.port") == 6000
+    assert not database.pending
+    assert list(database.keys()) == ["port", "user", "config-file", "host", "pool", "imported-config-file"]
+    assert database["user"] == "app"
+    assert database["config-file"] is None
+    assert database["imported-config-file"] == ["db/db.hjson"]
+    assert database["pool"] == {"size": 4, "config-file": None, "imported-config-file": ["pool.hjson"]}
+    assert config["name"] == "root"
+
+
+def test_nested_include_in_memory_config(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {"db.hjson": '{"host": "db"}'})
+    monkeypatch.chdir(str(tmp_path))
+    config = hjsonconfig.HjsonConfig()
+    config["database"] = {"config-file": "db.hjson", "port": 1}
+    config.import_config_files()
+    assert isinstance(config["database"], includes.LazyInclude)
+    assert config["database"] == {"host": "db", "port": 1, "config-file": None, "imported-config-file": ["db.hjson"]}
+
+    # Pickling keeps an include that has not been loaded pending
+    config["other"] = {"config-file": "db.hjson"}
+    config.import_config_files()
+    copy = pickle.loads(pickle.dumps(config))
+    assert copy["other"].pending
+    assert copy["other"]["host"] == "db"
+
+
+def test_nested_include_loads_once_across_threads(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {"root.hjson": '{"database": {"config-file": "db.hjson"}}', "db.hjson": '{"host": "db"}'})
+    config = hjsonconfig.HjsonConfig(filename=str(tmp_path / "root.hjson"), cache=False)
+    resolves = []
+    resolve = graph.IncludeGraph.resolve
+
+    def counting_resolve(self, *args, **kwds):
+        resolves.append(args)
+        return resolve(self, *args, **kwds)
+    monkeypatch.setattr(graph.IncludeGraph, "resolve", counting_resolve)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(config["database"]["host"])) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["db"] * 8
+    assert len(resolves) == 1
@@ -0,0 +1,68 @@
+import logging
+
+from hjsonconfig import cache
+from hjsonconfig import hjsonconfig
+from hjsonconfig import instrument
+
+
+FILES = {
+    "a.hjson": '{"config-file": ["b.hjson", "c.hjson"], "a": 1}',
+    "b.hjson": '{"config-file": "d.hjson", "b": {"x": 1}}',
+    "c.hjson": '{"config-file": "d.hjson", "c": 1}',
+    "d.hjson": '{"d": 1}',
+}
+
+
+def test_events_and_report(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, FILES)
+    monkeypatch.chdir(str(tmp_path))
+    events = []
+    parse_cache = cache.ParseCache()
+    hjsonconfig.HjsonConfig(filename="a.hjson", cache=parse_cache, instrument=events.append)
+    files = [e for e in events if e.kind == "file"]
+    # Files are reported once each, after the files they include
+    assert [e.filename for e in files] == ["d.hjson", "b.hjson", "c.hjson", "a.hjson"]
+    assert [e.cache for e in files] == ["miss"] * 4
+    assert files[1].keys == 3
+    assert files[0].bytes == len(FILES["d.hjson"])
+    assert all(e.parse_time is not None and e.merge_time >= 0 for e in files)
+
+    report = events[-1]
+    assert report.kind == "report"
+    assert report.filename == "a.hjson"
+    assert report.events == files
+    assert report.as_dict()["cache_misses"] == 4
+    assert report.bytes == sum(len(text) for text in FILES.values())
+
+    events[:] = []
+    hjsonconfig.HjsonConfig(filename="a.hjson", cache=parse_cache, instrument=events.append)
+    assert events[-1].cache_hits == 4
+    assert all(e.parse_time is None for e in events[:-1])
+
+
+def test_disk_cache_report(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, FILES)
+    monkeypatch.chdir(str(tmp_path))
+    reports = []
+
+    def hook(event):
+        if event.kind == "report":
+            reports.append(event)
+
+    for _ in range(2):
+        hjsonconfig.HjsonConfig(filename="a.hjson", disk_cache=str(tmp_path / "cache"), instrument=hook)
+    assert [r.disk_cache for r in reports] == ["miss", "hit"]
+    assert reports[1].files == 0
+
+
+def test_logging_hook(tmp_path, monkeypatch, caplog, write_files):
+    write_files(tmp_path, FILES)
+    monkeypatch.chdir(str(tmp_path))
+    hook = instrument.LoggingHook()
+    with caplog.at_level(logging.INFO, logger="hjsonconfig"):
+        hjsonconfig.HjsonConfig(filename="a.hjson", instrument=hook)
+    assert caplog.records == []
+    with caplog.at_level(logging.DEBUG, logger="hjsonconfig"):
+        hjsonconfig.HjsonConfig(filename="a.hjson", instrument=hook)
+    assert len(caplog.records) == 5
+    assert caplog.records[-1].getMessage().startswith("Load report a.hjson: 4 files")
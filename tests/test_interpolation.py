@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from hjsonconfig import hjsonconfig
+from hjsonconfig import interpolation
+
+
+def test_references_expanded_after_includes(tmp_path):
+    (tmp_path / "base.hjson").write_text(
+        '{"server": {"host": "db.local", "port": 5432}, "paths": {"base": "/srv", "logs": "${paths.base}/logs"}}')
+    (tmp_path / "root.hjson").write_text(
+        '{"config-file": "base.hjson", "server": {"host": "db.prod"},'
+        ' "url": "postgres://${server.host}:${server.port}/app", "port": "${server.port}",'
+        ' "copy": "${server}", "list": ["${paths.logs}", "$${literal}"]}')
+    config = hjsonconfig.HjsonConfig(filename=str(tmp_path / "root.hjson"), interpolate=True)
+    assert config["url"] == "postgres://db.prod:5432/app"
+    assert config["port"] == 5432
+    assert config["copy"] == {"host": "db.prod", "port": 5432}
+    assert config["copy"] is not config["server"]
+    assert config["list"] == ["/srv/logs", "${literal}"]
+    assert config.get_path("paths.logs") == "/srv/logs"
+
+
+def test_reference_errors():
+    with pytest.raises(interpolation.InterpolationError) as error:
+        interpolation.interpolate({"a": "${b}", "b": {"c": "x${a}"}})
+    assert error.value.chain == ["a", "b.c", "a"]
+    with pytest.raises(interpolation.InterpolationError) as error:
+        interpolation.interpolate({"a": {"b": "${missing.key}"}})
+    assert error.value.chain == ["a.b", "missing.key"]
+
+
+def test_lazy_interpolation_expands_only_used_references():
+    config = hjsonconfig.HjsonConfig({"host": "h", "url": "http://${host}/", "broken": "${missing}"},
+                                     interpolate="lazy")
+    config.import_config_files()
+    assert config["url"] == "http://${host}/"
+    assert config.get_path("url") == "http://h/"
+    assert config.get_path("nothing", None) is None
+    config["host"] = "other"
+    assert config.get_path("url") == "http://other/"
+    with pytest.raises(interpolation.InterpolationError):
+        config.get_path("broken")
+
+
+def test_import_config_files_expands_once(tmp_path):
+    (tmp_path / "base.hjson").write_text('{"x": 1, "ref": "${x}"}')
+    (tmp_path / "root.hjson").write_text('{"config-file": "base.hjson", "lit": "$${x}"}')
+    config = hjsonconfig.HjsonConfig(filename=str(tmp_path / "root.hjson"), interpolate=True)
+    config.import_config_files()
+    config.import_config_files()
+    assert (config["ref"], config["lit"]) == (1, "${x}")
+    config.read_file(str(tmp_path / "root.hjson"))
+    assert (config["ref"], config["lit"]) == (1, "${x}")
+    config = hjsonconfig.HjsonConfig({"lit": "$${x}", "x": 1}, interpolate=True)
+    config.import_config_files()
+    config.import_config_files()
+    assert config["lit"] == "${x}"
+
+
+def test_async_import_expands_references(tmp_path):
+    (tmp_path / "base.hjson").write_text('{"host": "h", "port": 80}')
+    config = hjsonconfig.HjsonConfig({"config-file": str(tmp_path / "base.hjson"), "url": "${host}:${port}",
+                                      "lit": "$${host}"}, interpolate=True)
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(config.aimport_config_files())
+        assert (config["url"], config["lit"]) == ("h:80", "${host}")
+        loop.run_until_complete(config.aimport_config_files())
+    finally:
+        loop.close()
+    assert (config["url"], config["lit"]) == ("h:80", "${host}")
@@ -0,0 +1,90 @@
+import pytest
+
+from hjsonconfig import hjsonconfig
+from hjsonconfig import layered
+from hjsonconfig import merging
+
+
+FILES = {
+    "a.hjson": '{"config-file": ["b.hjson", "c.hjson"], "a": 1, "nested": {"y": 2, "z": {"a": 1}}}',
+    "b.hjson": '{"config-file": "d.hjson", "b": 1, "shared": "b", "nested": {"x": 1, "list": [1]}}',
+    "c.hjson": '{"config-file": "d.hjson", "c": null}',
+    "d.hjson": '{"d": 1, "shared": "d", "nested": {"x": 0, "z": {"b": 2}}}',
+}
+
+
+def test_view_matches_merged_config(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, FILES)
+    monkeypatch.chdir(str(tmp_path))
+    config = hjsonconfig.HjsonConfig(filename="a.hjson")
+    view = layered.LayeredConfig("a.hjson")
+    assert len(view.layers) == 3
+    assert view == config
+    assert list(view.keys()) == list(config.keys())
+    assert list(view["nested"].keys()) == list(config["nested"].keys())
+    assert isinstance(view["nested"], layered.LayeredConfig)
+    assert view.get_path("nested.z.b") == 2
+    assert view["imported-config-file"] == [["b.hjson", "c.hjson"]]
+    flat = view.flatten()
+    assert isinstance(flat, hjsonconfig.HjsonConfig)
+    assert flat == config
+    assert list(flat.keys()) == list(config.keys())
+
+
+def test_writes_materialize_subtree(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, FILES)
+    monkeypatch.chdir(str(tmp_path))
+    view = layered.LayeredConfig("a.hjson")
+    nested = view["nested"]
+    nested["z"]["c"] = 3
+    del nested["x"]
+    assert view["nested"]["z"] == {"a": 1, "b": 2, "c": 3}
+    assert "x" not in view["nested"]
+    assert nested.layers == []
+    assert isinstance(view["nested"], dict)
+
+    del view["shared"]
+    view["new"] = {"k": 1}
+    view["d"] = {"replaced": True}
+    config = hjsonconfig.HjsonConfig(filename="a.hjson")
+    del config["shared"]
+    del config["nested"]["x"]
+    config["nested"]["z"]["c"] = 3
+    config["new"] = {"k": 1}
+    config["d"] = {"replaced": True}
+    assert view.flatten() == config
+    assert list(view) == list(config)
+    with pytest.raises(KeyError):
+        del view["shared"]
+
+
+def test_merge_error_on_lookup(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {
+        "a.hjson": '{"config-file": "b.hjson", "x": {"y": 1}, "ok": 1}',
+        "b.hjson": '{"x": 5}',
+    })
+    monkeypatch.chdir(str(tmp_path))
+    view = layered.LayeredConfig("a.hjson")
+    assert view["ok"] == 1
+    with pytest.raises(merging.MergeError):
+        view["x"]
+    for option in (dict(merge_schema={}), dict(schema={}), dict(interpolate=True), dict(interpolate="lazy"),
+                   dict(provenance=True)):
+        with pytest.raises(ValueError):
+            layered.LayeredConfig("a.hjson", **option)
+
+
+def test_includes_are_merged_as_groups(tmp_path, monkeypatch, write_files):
+    # b.hjson replaces the dict from d.hjson before it is merged on to c.hjson,
+    # and a dict merged on to None replaces it
+    write_files(tmp_path, {
+        "a.hjson": '{"config-file": ["c.hjson", "b.hjson"]}',
+        "b.hjson": '{"config-file": "d.hjson", "x": [1], "y": {"b": 1}}',
+        "c.hjson": '{"x": 5, "y": {"c": 1}}',
+        "d.hjson": '{"x": {"d": 1}, "y": null}',
+    })
+    monkeypatch.chdir(str(tmp_path))
+    view = layered.LayeredConfig("a.hjson")
+    assert view["x"] == [1]
+    assert view["y"] == {"c": 1, "b": 1}
+    assert view == hjsonconfig.HjsonConfig(filename="a.hjson")
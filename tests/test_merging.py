@@ -0,0 +1,68 @@
+import jsonmerge
+import pytest
+
+from hjsonconfig import hjsonconfig
+from hjsonconfig import merging
+
+OrderedDict = hjsonconfig.hjson.OrderedDict
+
+
+def make_base():
+    return OrderedDict([
+        ("a", 1),
+        ("d", OrderedDict([("x", 1), ("y", [1, 2])])),
+        ("l", [1]),
+        ("n", 1),
+    ])
+
+
+def make_head():
+    return OrderedDict([
+        ("z", 2),
+        ("d", OrderedDict([("y", [3]), ("w", OrderedDict([("q", 1)]))])),
+        ("a", None),
+        ("n", [4]),
+    ])
+
+
+def test_merge_matches_jsonmerge():
+    expected = jsonmerge.merge(make_base(), make_head())
+    merged = hjsonconfig.merge(make_base(), make_head())
+    assert isinstance(merged, hjsonconfig.HjsonConfig)
+    assert merged == expected
+    assert list(merged.keys()) == list(expected.keys())
+    assert list(merged["d"].keys()) == list(expected["d"].keys())
+    assert isinstance(merged["d"], OrderedDict)
+    assert isinstance(merged["d"]["w"], OrderedDict)
+
+
+def test_merge_does_not_modify_inputs():
+    base = make_base()
+    head = make_head()
+    merged = hjsonconfig.merge(base, head)
+    merged["d"]["x"] = 10
+    assert base == make_base()
+    assert head == make_head()
+    assert merged["d"] is not base["d"]
+    assert merged["d"]["w"] is not head["d"]["w"]
+
+
+def test_merge_into_matches_merge_values():
+    expected = merging.merge_values(make_base(), make_head())
+    base = make_base()
+    assert merging.merge_into(base, make_head()) is base
+    assert base == expected
+    assert list(base.keys()) == list(expected.keys())
+
+
+def test_merge_dict_onto_scalar_raises():
+    with pytest.raises(merging.MergeError):
+        merging.merge_values({"k": 5}, {"k": {"a": 1}})
+    with pytest.raises(merging.MergeError):
+        merging.merge_into({"k": 5}, {"k": {"a": 1}})
+
+
+def test_merge_with_schema_uses_jsonmerge():
+    schema = {"properties": {"l": {"mergeStrategy": "append"}}}
+    merged = hjsonconfig.merge(OrderedDict([("l", [1])]), OrderedDict([("l", [2])]), schema=schema)
+    assert merged["l"] == [1, 2]
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from hjsonconfig import hjsonconfig
+from hjsonconfig import layered
+from hjsonconfig import merging
+from hjsonconfig import overrides
+
+
+def test_from_environ_and_args():
+    env = {"HJSONCONFIG__server__pool__size": "64", "HJSONCONFIG__name": "web", "HJSONCONFIG__": "x", "PATH": "/bin"}
+    assert overrides.from_environ(env) == [
+        (("name",), "web", "$HJSONCONFIG__name"),
+        (("server", "pool", "size"), 64, "$HJSONCONFIG__server__pool__size"),
+    ]
+    found = overrides.from_args(["prog", "--set", "a.b=true", "-v", "--set=c=[1, 2]", "--set=d=\"64\"", "--set", "e=null"])
+    assert [(o.keys, o.value) for o in found] == [(("a", "b"), True), (("c",), [1, 2]), (("d",), "64"), (("e",), None)]
+    with pytest.raises(ValueError):
+        overrides.parse_assignment("a.b")
+
+
+def test_overrides_applied_after_includes(tmp_path):
+    (tmp_path / "base.hjson").write_text('{"server": {"pool": {"size": 8, "timeout": 1}, "port": 80}, "debug": null}')
+    (tmp_path / "root.hjson").write_text('{"config-file": "base.hjson", "server": {"port": 8080}}')
+    options = dict(overrides=overrides.from_args(["--set", "server.pool.size=64", "--set=debug.level=2",
+                                                  "--set=server.tls={\"on\": true}"]), provenance=True)
+    config = hjsonconfig.HjsonConfig(filename=str(tmp_path / "root.hjson"), **options)
+    assert config.get_path("server.pool") == {"size": 64, "timeout": 1}
+    assert config["server"]["port"] == 8080
+    assert config["debug"] == {"level": 2}
+    assert config.get_path("server.tls.on") is True
+    assert config.origin("server.pool.size") == "--set server.pool.size"
+    assert config.origin("server.pool.timeout") == "base.hjson"
+    assert config.origin("server.tls.on") == "--set server.tls"
+
+    view = layered.LayeredConfig(str(tmp_path / "root.hjson"), overrides=options["overrides"])
+    assert view.flatten() == config
+
+    config = hjsonconfig.HjsonConfig(overrides={"server.port": 1})
+    config["server"] = 5
+    with pytest.raises(merging.MergeError):
+        config.import_config_files()
+
+
+def test_overrides_applied_by_async_import(tmp_path):
+    (tmp_path / "base.hjson").write_text('{"server": {"pool": {"size": 8}, "port": 80}}')
+    configs = []
+    for sync in (True, False):
+        config = hjsonconfig.HjsonConfig(overrides={"server.pool.size": 64, "name": "web"})
+        config["config-file"] = str(tmp_path / "base.hjson")
+        if sync:
+            config.import_config_files()
+        else:
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(config.aimport_config_files())
+            finally:
+                loop.close()
+        configs.append(config)
+    assert configs[1].get_path("server.pool.size") == 64
+    assert configs[1]["name"] == "web"
+    assert configs[0] == configs[1]
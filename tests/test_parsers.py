@@ -0,0 +1,64 @@
+import json
+from collections import OrderedDict
+
+import hjson
+import pytest
+
+from hjsonconfig import hjsonconfig
+from hjsonconfig import parsers
+
+
+def test_json_fast_path_matches_hjson():
+    texts = [
+        '{"a": {"b": [1, 2.0, 2.5, 1e300, -0.0, 12345678901234567890]}, "c": "x\\ny", "d": null, "e": true}',
+        '{\n    "b": 1,\n    "a": {"z": {}, "y": []}\n}',
+        '{"a": 1, "a": 2, "b": "caf\\u00e9"}',
+        '{"a": 1 // comment\n}',
+        '{a: 1\nb: quoteless\n}',
+        '{"a": NaN\n}',
+        'a: 1',
+    ]
+    for text in texts:
+        expected = hjson.loads(text)
+        for filename in ("x.hjson", "x.json", "x.conf"):
+            parsed = parsers.loads(text, filename)
+            assert repr(parsed) == repr(expected)
+            assert type(parsed) is OrderedDict
+
+
+def test_mixed_format_chain(tmp_path):
+    pytest.importorskip("yaml")
+    try:
+        import tomllib  # noqa: F401
+    except ImportError:
+        pytest.importorskip("tomli")
+    (tmp_path / "base.json").write_text(json.dumps({"server": {"port": 80, "hosts": ["a", "b"]}, "name": "base"}))
+    (tmp_path / "pool.toml").write_text('[server.pool]\nsize = 8\ntimeout = 1.5\n')
+    (tmp_path / "log.YML").write_text('logging:\n  level: info\n  handlers: [console]\nname: yaml\n')
+    (tmp_path / "root.hjson").write_text('{\n  config-file: ["base.json", "pool.toml", "log.YML"]\n  # local\n  server: {port: 8080}\n}')
+    config = hjsonconfig.HjsonConfig(filename=str(tmp_path / "root.hjson"))
+    assert config["server"] == {"port": 8080, "hosts": ["a", "b"], "pool": {"size": 8, "timeout": 1.5}}
+    assert config["name"] == "yaml"
+    assert config["logging"] == {"level": "info", "handlers": ["console"]}
+    assert type(config["server"]["pool"]) is OrderedDict
+    assert type(config["logging"]) is OrderedDict
+    assert list(config["server"]) == ["port", "hosts", "pool"]
+
+
+def test_register_parser(tmp_path, monkeypatch):
+    monkeypatch.setattr(parsers, "_PARSERS", dict(parsers._PARSERS))
+    monkeypatch.setattr(parsers, "_EXTENSIONS", dict(parsers._EXTENSIONS))
+
+    def loads_ini(text):
+        return OrderedDict(line.split("=", 1) for line in text.splitlines() if line)
+
+    parsers.register_parser("ini", loads_ini, (".ini",))
+    assert parsers.parser_for("a/b.INI") == "ini"
+    assert parsers.parser_for("a/b.hjson") == "hjson"
+    assert parsers.parser_for("a/b") == "hjson"
+    (tmp_path / "extra.ini").write_text("user=admin\nmode=fast\n")
+    (tmp_path / "root.hjson").write_text('{"config-file": "extra.ini", "mode": "slow"}')
+    events = []
+    config = hjsonconfig.HjsonConfig(filename=str(tmp_path / "root.hjson"), instrument=events.append)
+    assert (config["user"], config["mode"]) == ("admin", "slow")
+    assert sorted(event.path.endswith(".ini") for event in events if event.kind == "file") == [False, True]
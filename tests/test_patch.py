@@ -0,0 +1,69 @@
+import copy
+from collections import OrderedDict
+
+import pytest
+
+import hjsonconfig as package
+from hjsonconfig import hjsonconfig
+from hjsonconfig import patch
+from hjsonconfig import watch
+
+
+def make(pairs):
+    return hjsonconfig.HjsonConfig(OrderedDict(pairs))
+
+
+def test_diff_lists_changed_paths():
+    shared = OrderedDict([("big", list(range(100)))])
+    a = make([("server", OrderedDict([("port", 80), ("pool", OrderedDict([("size", 8)]))])),
+              ("gone", 1), ("shared", shared), ("kind", {"x": 1})])
+    b = make([("server", OrderedDict([("pool", OrderedDict([("size", 64)])), ("port", 80)])),
+              ("shared", shared), ("kind", [1]), ("new", {"y": None})])
+    changes = package.diff(a, b)
+    assert [(c.op, c.path) for c in changes] == [
+        ("set", "server.pool.size"), ("order", "server"), ("delete", "gone"), ("set", "kind"), ("set", "new")]
+    assert changes[1].value == ("pool", "port")
+    assert package.diff(a, copy.deepcopy(a)) == []
+
+    patched = package.apply_patch(copy.deepcopy(a), changes)
+    assert patched == b
+    assert list(patched["server"].keys()) == ["pool", "port"]
+    assert patched.get_path("server.pool.size") == 64
+    patched["new"]["y"] = 1
+    assert b["new"]["y"] is None
+
+    with pytest.raises(ValueError):
+        package.apply_patch(a, [patch.Change("move", ("a",), None)])
+
+
+def test_diff_frozen_configs():
+    a = make([("a", {"x": 1, "y": [1, 2]}), ("b", {"z": 2})])
+    b = copy.deepcopy(a)
+    b["a"]["y"] = [1, 3]
+    changes = patch.diff(a.freeze(), b.freeze())
+    assert [(c.op, c.path) for c in changes] == [("set", "a.y")]
+    assert patch.apply_patch(copy.deepcopy(a), changes) == b
+    assert patch.diff({"a": 1}, 5) == [patch.Change("set", (), 5)]
+
+
+def test_diff_checks_equal_hashes():
+    child = OrderedDict([("x", 1)])
+    digest = hash(tuple(child.items()))
+    a = make([("k", child), ("l", [])])
+    b = make([("k", digest), ("l", [])])
+    assert [(c.op, c.path) for c in patch.diff(a, b)] == [("set", "k")]
+    a = make([("s", OrderedDict([("set", {1}), ("n", 1)]))])
+    b = make([("s", OrderedDict([("set", {1}), ("n", 2)]))])
+    assert [(c.op, c.path) for c in patch.diff(a, b)] == [("set", "s.n")]
+    assert patch.diff(a, copy.deepcopy(a)) == []
+
+
+def test_diff_compares_scalar_types():
+    a = make([("a", 1), ("b", OrderedDict([("c", 1)])), ("d", [1, 2])])
+    b = make([("a", True), ("b", OrderedDict([("c", 1.0)])), ("d", [1, 2.0])])
+    changes = patch.diff(a, b)
+    assert [(c.op, c.path) for c in changes] == [("set", "a"), ("set", "b.c"), ("set", "d")]
+    assert [type(c.value) for c in changes] == [bool, float, list]
+    assert patch.diff(a.freeze(), b.freeze()) == changes[:2] + [patch.Change("set", ("d",), (1, 2.0))]
+    assert patch.diff(1, True) == [patch.Change("set", (), True)]
+    assert watch.changed_keys(a, b) == ["a", "b.c", "d"]
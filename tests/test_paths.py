@@ -0,0 +1,48 @@
+import pytest
+
+from hjsonconfig import hjsonconfig
+from hjsonconfig import paths
+
+
+def make_config():
+    config = hjsonconfig.HjsonConfig()
+    config["server"] = hjsonconfig.hjson.OrderedDict([
+        ("pool", hjsonconfig.hjson.OrderedDict([("size", 8)])),
+        ("hosts", [{"name": "a"}, {"name": "b"}]),
+    ])
+    return config
+
+
+def test_get_path():
+    config = make_config()
+    assert config.get_path("server.pool.size") == 8
+    assert config.get_path(("server", "pool", "size")) == 8
+    assert config.get_path("server.hosts.1.name") == "b"
+    assert config.get_path("server.pool.missing", default=None) is None
+    with pytest.raises(KeyError):
+        config.get_path("server.pool.size.more")
+
+
+def test_get_path_memo_is_invalidated():
+    config = make_config()
+    size = config.compile_path("server.pool.size")
+    assert size(config) == 8
+    assert config._paths[("server", "pool", "size")] == 8
+
+    config.set_path("server.pool.size", 16)
+    assert size(config) == 16
+    config["server"] = {"pool": {"size": 32}}
+    assert size(config) == 32
+    config.update(server={"pool": {"size": 64}})
+    assert size(config) == 64
+
+    config["server"]["pool"]["size"] = 128
+    config.invalidate()
+    assert size(config) == 128
+
+
+def test_compiled_path_on_plain_dicts():
+    size = paths.compile_path("server.pool.size")
+    assert paths.compile_path("server.pool.size") is size
+    assert size({"server": {"pool": {"size": 4}}}) == 4
+    assert size({}, 1) == 1
@@ -0,0 +1,81 @@
+import pytest
+
+from hjsonconfig import hjsonconfig
+
+
+FILES = {
+    "a.hjson": '{"config-file": ["b.hjson", "c.hjson"], "a": 1, "nested": {"y": 2}, "replaced": 5}',
+    "b.hjson": '{"config-file": "d.hjson", "shared": "b", "nested": {"x": 1, "list": [1, 2]}}',
+    "c.hjson": '{"config-file": "d.hjson", "c": null}',
+    "d.hjson": '{"shared": "d", "nested": {"x": 0, "z": {"b": 2}}, "replaced": {"k": 1}}',
+}
+
+
+def test_origin_of_each_key(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, FILES)
+    monkeypatch.chdir(str(tmp_path))
+    for config in [hjsonconfig.HjsonConfig(filename="a.hjson", provenance=True),
+                   hjsonconfig.HjsonConfig(filename="a.hjson", provenance=True, disk_cache=str(tmp_path / "cache")),
+                   hjsonconfig.HjsonConfig(filename="a.hjson", provenance=True, disk_cache=str(tmp_path / "cache"))]:
+        assert config.origin("a") == "a.hjson"
+        # d.hjson is merged in again by c.hjson, so it overrides b.hjson
+        assert config.origin("shared") == "d.hjson"
+        assert config.origin("nested") == "a.hjson"
+        assert config.origin("nested.y") == "a.hjson"
+        assert config.origin("nested.x") == "d.hjson"
+        assert config.origin("nested.list") == "b.hjson"
+        assert config.origin("nested.list.1") == "b.hjson"
+        assert config.origin(("nested", "z", "b")) == "d.hjson"
+        assert config.origin("c") == "c.hjson"
+        assert config.origin("imported-config-file") == "a.hjson"
+        assert config.origin("replaced") == "a.hjson"
+        assert config["replaced"] == 5
+        with pytest.raises(KeyError):
+            config.origin("nested.missing")
+
+
+def test_origin_of_in_memory_config(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, FILES)
+    monkeypatch.chdir(str(tmp_path))
+    config = hjsonconfig.HjsonConfig(provenance=True)
+    config["config-file"] = "b.hjson"
+    config["nested"] = {"x": 3}
+    config.import_config_files()
+    assert config.origin("nested.x") is None
+    assert config.origin("nested.z.b") == "d.hjson"
+    assert config.origin("shared") == "b.hjson"
+
+    with pytest.raises(ValueError):
+        hjsonconfig.HjsonConfig(filename="a.hjson").origin("a")
+
+
+def test_origin_in_nested_includes(tmp_path, monkeypatch, write_files):
+    (tmp_path / "db").mkdir()
+    write_files(tmp_path, {
+        "root.hjson": '{"config-file": "base.hjson", "app": {"database": {"config-file": "db/db.hjson", "port": 6000}},'
+                      ' "over": {"port": 1}, "mixed": {"config-file": "db/db.hjson"}}',
+        "base.hjson": '{"over": {"config-file": "db/db.hjson"}, "mixed": {"a": 1}}',
+        "db/db.hjson": '{"config-file": "defaults.hjson", "host": "db", "pool": {"config-file": "pool.hjson"}}',
+        "db/defaults.hjson": '{"port": 5432, "user": "app"}',
+        "db/pool.hjson": '{"size": 4}',
+    })
+    monkeypatch.chdir(str(tmp_path))
+    options = dict(provenance=True, overrides={"app.database.user": "admin"}, disk_cache=str(tmp_path / "cache"))
+    for config in [hjsonconfig.HjsonConfig(filename="root.hjson", **options),
+                   hjsonconfig.HjsonConfig(filename="root.hjson", **options)]:
+        assert config.origin("app.database") == "root.hjson"
+        assert config.origin("app.database.port") == "root.hjson"
+        assert config.origin("app.database.host") == "db/db.hjson"
+        assert config.origin("app.database.user") == "overrides"
+        assert config.origin("app.database.pool") == "db/db.hjson"
+        assert config.origin("app.database.pool.size") == "pool.hjson"
+        # A dict merged on to an include overrides some of its values
+        assert config.origin("over.port") == "root.hjson"
+        assert config.origin("over.user") == "defaults.hjson"
+        assert config.origin("mixed.a") == "base.hjson"
+        # An include merged on to a dict is copied in to it, losing its origins
+        with pytest.raises(ValueError):
+            config.origin("mixed.host")
+        with pytest.raises(KeyError):
+            config.origin("app.database.missing")
+    assert config.disk_cache.hits == 1
@@ -0,0 +1,50 @@
+import os
+
+from hjsonconfig import hjsonconfig
+from hjsonconfig import resolver
+
+
+def test_includes_are_relative_to_including_file(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path / "conf", {
+        "root.hjson": '{"config-file": "sub/child.hjson", "root": 1}',
+    })
+    write_files(tmp_path / "conf" / "sub", {
+        "child.hjson": '{"config-file": "../base.hjson", "child": 1}',
+    })
+    write_files(tmp_path / "conf", {"base.hjson": '{"base": 1}'})
+    monkeypatch.chdir(str(tmp_path))
+    config = hjsonconfig.HjsonConfig(filename=os.path.join("conf", "root.hjson"))
+    assert config["root"] == config["child"] == config["base"] == 1
+    assert config["imported-config-file"] == ["sub/child.hjson"]
+
+    # The current directory is still searched after the including file's
+    monkeypatch.chdir(str(tmp_path / "conf"))
+    config = hjsonconfig.HjsonConfig()
+    config["config-file"] = "base.hjson"
+    config.import_config_files()
+    assert config["base"] == 1
+
+
+def test_search_path(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path / "shared", {"base.hjson": '{"base": "shared"}'})
+    write_files(tmp_path / "other", {"base.hjson": '{"base": "other"}'})
+    write_files(tmp_path / "app", {"app.hjson": '{"config-file": "base.hjson"}'})
+    monkeypatch.chdir(str(tmp_path))
+    monkeypatch.setenv(resolver.SEARCH_PATH_VARIABLE, os.pathsep.join(
+        [str(tmp_path / "missing"), str(tmp_path / "shared")]))
+    assert hjsonconfig.HjsonConfig(filename="app/app.hjson", cache=False)["base"] == "shared"
+    config = hjsonconfig.HjsonConfig(filename="app.hjson", search_path=[str(tmp_path / "other"), str(tmp_path / "app")])
+    assert config["base"] == "other"
+
+
+def test_resolved_paths_are_memoized(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {"a.hjson": "{}"})
+    write_files(tmp_path / "search", {"a.hjson": "{}"})
+    monkeypatch.chdir(str(tmp_path))
+    paths = resolver.Resolver([str(tmp_path / "search")])
+    found = paths.resolve("a.hjson")
+    assert found == os.path.realpath("a.hjson")
+    os.remove("a.hjson")
+    assert paths.resolve("a.hjson") == found
+    paths.clear()
+    assert paths.resolve("a.hjson") == os.path.realpath(str(tmp_path / "search" / "a.hjson"))
@@ -0,0 +1,55 @@
+import pytest
+
+from hjsonconfig import hjsonconfig
+from hjsonconfig import schema
+
+SCHEMA = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {
+        "name": {"type": "string", "minLength": 1},
+        "server": {
+            "type": "object",
+            "default": {},
+            "additionalProperties": False,
+            "properties": {
+                "port": {"type": "integer", "minimum": 1, "maximum": 65535, "default": 8080},
+                "debug": {"type": "boolean", "default": False},
+                "ratio": {"type": "number"},
+                "hosts": {"type": "array", "items": {"type": "string", "pattern": "^[a-z.]+$"}},
+            },
+        },
+        "mode": {"enum": ["fast", "slow"]},
+        "extra": {"anyOf": [{"type": "integer"}, {"type": "null"}]},
+    },
+}
+
+
+def test_defaults_and_coercion(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {
+        "a.hjson": '{"config-file": "b.hjson", "server": {"port": "9000", "ratio": "0.5"}}',
+        "b.hjson": '{"name": "svc", "server": {"debug": "true", "hosts": ["a.example"]}, "mode": "fast"}',
+    })
+    monkeypatch.chdir(str(tmp_path))
+    config = hjsonconfig.HjsonConfig(filename="a.hjson", schema=SCHEMA)
+    assert config["server"] == {"debug": True, "hosts": ["a.example"], "port": 9000, "ratio": 0.5}
+    assert config.get_path("server.port") == 9000
+
+    config = hjsonconfig.HjsonConfig(schema=SCHEMA)
+    config["name"] = "x"
+    config.import_config_files()
+    assert config["server"] == {"port": 8080, "debug": False}
+    assert schema.compile_schema(SCHEMA) is schema.compile_schema(SCHEMA)
+
+
+def test_errors_report_key_paths(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {
+        "a.hjson": '{"server": {"port": 0, "debug": "maybe", "hosts": ["ok", "Bad!"], "other": 1}, '
+                   '"mode": "medium", "extra": "x"}',
+    })
+    monkeypatch.chdir(str(tmp_path))
+    with pytest.raises(schema.ConfigValidationError) as excinfo:
+        hjsonconfig.HjsonConfig(filename="a.hjson", schema=SCHEMA)
+    paths = sorted(path for path, _ in excinfo.value.errors)
+    assert paths == ["", "extra", "mode", "server.debug", "server.hosts.1", "server.other", "server.port"]
+    assert "server.port: 0 is less than the minimum of 1" in str(excinfo.value)
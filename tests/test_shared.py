@@ -0,0 +1,54 @@
+import multiprocessing
+
+import pytest
+
+from hjsonconfig import hjsonconfig
+from hjsonconfig import shared
+
+
+def test_publish_and_attach(tmp_path):
+    (tmp_path / "base.hjson").write_text('{"server": {"pool": {"size": 8}, "hosts": ["a", "b"]}, "name": "caf\\u00e9"}')
+    (tmp_path / "root.hjson").write_text('{"config-file": "base.hjson", "debug": null}')
+    config = hjsonconfig.HjsonConfig(filename=str(tmp_path / "root.hjson"))
+    path = str(tmp_path / "config.shared")
+    assert shared.publish(config, path) == 1
+
+    reader = shared.SharedConfigReader(path)
+    assert reader.generation == 1
+    view = reader.config
+    assert view._index is None
+    assert list(view.keys()) == list(config.keys())
+    server = view["server"]
+    assert isinstance(server, shared.SharedConfig) and server._index is None
+    assert view.get_path("server.pool.size") == 8
+    assert view.get_path("server.hosts.1") == "b"
+    assert view["name"] == config["name"]
+    assert view["debug"] is None
+    assert view.thaw() == config
+    assert not reader.check()
+
+    config.set_path("server.pool.size", 64)
+    assert shared.publish(config, path) == 2
+    assert reader.check()
+    assert reader.generation == 2
+    assert reader.config.get_path("server.pool.size") == 64
+    # Views of the previous generation are still readable
+    assert view.get_path("server.pool.size") == 8
+
+    (tmp_path / "other").write_text("not a config")
+    with pytest.raises(ValueError):
+        shared.SharedConfigReader(str(tmp_path / "other"))
+
+
+def read_size(path, queue):
+    queue.put(shared.SharedConfigReader(path).config.get_path("server.pool.size"))
+
+
+def test_attach_in_another_process(tmp_path):
+    path = str(tmp_path / "config.shared")
+    shared.publish(hjsonconfig.HjsonConfig({"server": {"pool": {"size": 8}}}), path)
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=read_size, args=(path, queue))
+    process.start()
+    assert queue.get(timeout=10) == 8
+    process.join()
@@ -0,0 +1,80 @@
+import os
+import pickle
+from collections import OrderedDict
+
+import pytest
+
+from hjsonconfig import hjsonconfig
+from hjsonconfig import streaming
+
+FIXTURE_DIR = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)),
+    'test_config_files',
+    )
+
+HJSON_TEXT = u"""
+# A config without root braces
+name: Ünïcode quoteless string with {braces} and [brackets]
+table: {
+  // comments are allowed
+  rows: [1, 2, "three", {four: 4}]
+  text:
+    '''
+    multi-line
+    string }
+    '''
+}
+after: 'single quoted, with a } brace'
+last: [
+  {x: 1}
+  {x: 2}
+]
+"""
+
+
+def test_stream_matches_normal_load(tmp_path):
+    path = tmp_path / "big.hjson"
+    path.write_bytes(HJSON_TEXT.encode("utf-8"))
+    expected = hjsonconfig.HjsonConfig(filename=str(path), cache=False)
+
+    sections = list(streaming.iter_sections(str(path)))
+    assert [k for k, _ in sections] == list(expected.keys())
+
+    config = hjsonconfig.HjsonConfig(filename=str(path), lazy_sections=["table", "last"])
+    assert isinstance(list(config.values())[1], streaming.LazySection)
+    assert config["table"] == expected["table"]
+    assert not isinstance(list(config.values())[1], streaming.LazySection)
+    assert isinstance(list(config.values())[3], streaming.LazySection)
+    config.materialize()
+    assert config == expected
+    assert list(config.keys()) == list(expected.keys())
+
+
+@pytest.mark.datafiles(FIXTURE_DIR)
+def test_stream_with_includes(datafiles, monkeypatch):
+    monkeypatch.chdir(str(datafiles))
+    expected = hjsonconfig.HjsonConfig(filename='test2.hjson')
+    config = hjsonconfig.HjsonConfig(filename='test2.hjson', stream=True)
+    assert config == expected
+
+
+def test_lazy_section_detects_changes(tmp_path):
+    path = tmp_path / "big.hjson"
+    path.write_text(u'{"big": {"a": 1}, "small": 1}')
+    config = hjsonconfig.HjsonConfig(filename=str(path), lazy_sections=["big"])
+    path.write_text(u'{"big": {"a": 2}, "small": 22}')
+    with pytest.raises(streaming.SectionChangedError):
+        config["big"]
+
+
+def test_only_lazy_configs_override_getitem(tmp_path):
+    path = tmp_path / "big.hjson"
+    path.write_text(u'{"big": {"a": 1}, "small": 1}')
+    assert type(hjsonconfig.HjsonConfig(filename=str(path))) is hjsonconfig.HjsonConfig
+    assert hjsonconfig.HjsonConfig.__getitem__ is OrderedDict.__getitem__
+    config = hjsonconfig.HjsonConfig(filename=str(path), lazy_sections=["big"])
+    assert isinstance(config, hjsonconfig.LazySectionConfig)
+    copy = pickle.loads(pickle.dumps(config))
+    assert type(copy) is hjsonconfig.LazySectionConfig
+    assert copy.get("big") == {"a": 1}
+    assert type(config._new_config()) is hjsonconfig.HjsonConfig
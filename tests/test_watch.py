@@ -0,0 +1,107 @@
+import os
+
+import pytest
+
+from hjsonconfig import cache
+from hjsonconfig import graph
+from hjsonconfig import hjsonconfig
+from hjsonconfig import watch
+
+
+def test_watcher_reloads_changed_files(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {
+        "root.hjson": '{"config-file": ["a.hjson", "b.hjson"], "root": 1}',
+        "a.hjson": '{"a": 1, "section": {"x": 1, "y": 1}}',
+        "b.hjson": '{"b": 1}',
+    }, 1000)
+    monkeypatch.chdir(str(tmp_path))
+
+    parse_cache = cache.ParseCache()
+    calls = []
+    config = hjsonconfig.HjsonConfig(filename="root.hjson", cache=parse_cache)
+    watcher = config.watch(callback=lambda c, changed: calls.append(changed))
+    first = watcher.config
+    assert first == config
+    assert watcher.check() == []
+
+    write_files(tmp_path, {
+        "a.hjson": '{"a": 1, "section": {"x": 2, "y": 1}, "config-file": "c.hjson"}',
+        "c.hjson": '{"c": 1}',
+    }, 2000)
+    misses = parse_cache.misses
+    assert watcher.check() == ["section.x", "c"]
+    # Only the changed file and its new include are read again
+    assert parse_cache.misses == misses + 2
+    assert calls == [["section.x", "c"]]
+    assert watcher.generation == 2
+    assert watcher.config["section"]["x"] == 2
+    assert first["section"]["x"] == 1
+
+    write_files(tmp_path, {"c.hjson": '{"c": 2}'}, 3000)
+    assert watcher.check() == ["c"]
+    assert watcher.config["c"] == 2
+
+
+def test_watcher_keeps_config_when_reload_fails(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {
+        "root.hjson": '{"config-file": "a.hjson", "root": 1}',
+        "a.hjson": '{"a": 1}',
+    }, 1000)
+    monkeypatch.chdir(str(tmp_path))
+
+    watcher = watch.ConfigWatcher("root.hjson")
+    write_files(tmp_path, {"a.hjson": '{"a": 2, "config-file": "root.hjson"}'}, 2000)
+    with pytest.raises(graph.IncludeCycleError):
+        watcher.check()
+    assert watcher.config["a"] == 1
+    assert watcher.generation == 1
+
+
+def test_watcher_reloads_nested_includes(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {
+        "root.hjson": '{"database": {"config-file": "db.hjson"}, "name": "root"}',
+        "db.hjson": '{"host": "a", "pool": {"config-file": "pool.hjson"}}',
+        "pool.hjson": '{"size": 4}',
+    }, 1000)
+    monkeypatch.chdir(str(tmp_path))
+
+    watcher = watch.ConfigWatcher("root.hjson")
+    assert watcher.config.get_path("database.pool.size") == 4
+    assert sorted(os.path.basename(k) for k in watcher._stamps) == ["db.hjson", "pool.hjson", "root.hjson"]
+
+    write_files(tmp_path, {"db.hjson": '{"host": "b", "pool": {"config-file": "pool.hjson"}}'}, 2000)
+    assert watcher.check() == ["database.host"]
+    assert watcher.config.get_path("database.host") == "b"
+
+    write_files(tmp_path, {"pool.hjson": '{"size": 8}'}, 3000)
+    assert watcher.check() == ["database.pool.size"]
+    assert watcher.config.get_path("database.pool.size") == 8
+    assert watcher.check() == []
+
+
+def test_watcher_sees_writes_made_while_reading(tmp_path, monkeypatch, write_files):
+    write_files(tmp_path, {
+        "root.hjson": '{"config-file": "a.hjson", "database": {"config-file": "db.hjson"}}',
+        "a.hjson": '{"a": 1}',
+        "db.hjson": '{"host": "a"}',
+    }, 1000)
+    monkeypatch.chdir(str(tmp_path))
+
+    # Each file is written again just after it is first parsed
+    writes = {"a.hjson": '{"a": 22}', "db.hjson": '{"host": "bb"}'}
+    parse_file = cache.parse_file
+
+    def parse_and_write(filename):
+        data = parse_file(filename)
+        name = os.path.basename(filename)
+        if name in writes:
+            write_files(tmp_path, {name: writes.pop(name)}, 2000)
+        return data
+
+    monkeypatch.setattr(hjsonconfig, "parse_file", parse_and_write)
+    watcher = watch.ConfigWatcher("root.hjson", cache=False)
+    assert watcher.config["a"] == 1
+    assert watcher.config.get_path("database.host") == "a"
+    assert sorted(watcher.check()) == ["a", "database.host"]
+    assert watcher.config["a"] == 22
+    assert watcher.config.get_path("database.host") == "bb"